@@ -3,6 +3,7 @@
 """
 import sys
 import os
+import base64
 
 # 절대 경로로 프로젝트 경로 설정
 _current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,14 +14,20 @@ if _src_path not in sys.path:
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from datetime import datetime
 
 # 패키지 import
-from searcher_korean_stock.config import SearchConfig, VolumeCondition, CandleCondition, ClosePositionCondition, TrendCondition, VolatilityCondition, SizeCondition, BacktestConfig
+from searcher_korean_stock.config import SearchConfig, VolumeCondition, CandleCondition, ClosePositionCondition, TrendCondition, VolatilityCondition, SizeCondition, BacktestConfig, unpack_conditions
 from searcher_korean_stock.data_loader import loader
-from searcher_korean_stock.engine import DayTradeSearchEngine, BacktestEngine
+from searcher_korean_stock.symbols import symbols
+from searcher_korean_stock.engine import DayTradeSearchEngine, BacktestEngine, data_version
 from searcher_korean_stock.tracker import tracker
+from searcher_korean_stock.analytics import ConditionHitRates
+from searcher_korean_stock.instrumentation import instruments
+from searcher_korean_stock.rendering import renderer
+from searcher_korean_stock.snapshot import snapshots, config_key
+from searcher_korean_stock.kernels import warmup
+from searcher_korean_stock.robustness import robustness_report
 
 # scheduler는 선택적
 try:
@@ -31,6 +38,41 @@ except (ImportError, ModuleNotFoundError):
     HAS_SCHEDULER = False
 
 
+# 조건 키 → 표시 이름 (비트마스크는 화면에 보일 때만 이름으로 펼친다)
+CONDITION_LABELS = {
+    'volume': '거래대금',
+    'candle': '양봉',
+    'close': '종가위치',
+    'trend': '추세',
+    'volatility': '변동성',
+    'size': '규모',
+}
+
+
+def history_table(limit: int = 100) -> pd.DataFrame:
+    """추적 결과를 화면 표시용 표로 (최근 limit개 검색 날짜, 최신 날짜부터, 한글 열 이름과 달성 표시)"""
+    dates = sorted(tracker.db.keys())[-limit:]
+    if not dates:
+        return pd.DataFrame()
+    history = tracker.query(start=dates[0])
+    if history.empty:
+        return pd.DataFrame()
+
+    history = history.sort_values('date', ascending=False, kind='stable')
+    return pd.DataFrame({
+        "검색날짜": history['date'].dt.strftime('%Y-%m-%d'),
+        "종목명": history['stock_name'],
+        "종목코드": history['ticker'],
+        "매수가": history['buy_price'],
+        "다음고가": history['next_day_high'],
+        "수익률": history['actual_return'],
+        "조건충족": history['conditions_met'],
+        "조건마스크": history['conditions_mask'],
+        "점수": history['score'],
+        "달성": np.where(history['achieved'], "✅", "❌"),
+    }).reset_index(drop=True)
+
+
 # 페이지 설정
 st.set_page_config(
     page_title="다음날 +1% 상승 검색기",
@@ -171,6 +213,33 @@ if 'search_results' not in st.session_state:
 if 'backtest_results' not in st.session_state:
     st.session_state.backtest_results = None
 
+# 조건별 마스크 캐시를 유지하기 위해 엔진은 세션 동안 재사용
+if 'engine' not in st.session_state:
+    st.session_state.engine = DayTradeSearchEngine(st.session_state.config)
+
+if 'candidates_df' not in st.session_state:
+    st.session_state.candidates_df = None
+
+# 계산 커널 JIT 컴파일은 세션 시작 때 한 번 (디스크 캐시가 있으면 바로 끝남)
+if 'kernel_backend' not in st.session_state:
+    st.session_state.kernel_backend = warmup()
+
+
+def use_snapshot(snapshot) -> None:
+    """장 마감 스냅샷을 검색 대상으로 사용 (메모리 맵이라 데이터 로드 없음)"""
+    st.session_state.snapshot_version = snapshot.version
+    st.session_state.candidates_df = snapshot.frame('today')
+    st.session_state.candidates_version = snapshot.version
+    st.session_state.backtest_data = snapshot.price_data()
+    st.session_state.backtest_panel = snapshot.frame('panel')
+    st.session_state.engine.clear_cache()
+
+
+# 최신 스냅샷을 시작할 때, 그리고 새 버전이 나올 때마다 자동으로 사용
+snapshot = snapshots.current()
+if snapshot is not None and st.session_state.get('snapshot_version') != snapshot.version:
+    use_snapshot(snapshot)
+
 # ============ 사이드바: 테마 설정 ============
 col1, col2 = st.sidebar.columns(2)
 with col1:
@@ -184,9 +253,30 @@ with col2:
 
 st.sidebar.markdown("---")
 
+# ============ 사이드바: 종목 찾기 ============
+st.sidebar.markdown("### 🔎 종목 찾기")
+symbol_query = st.sidebar.text_input("종목 코드 / 종목명", key="symbol_query", placeholder="예: 005930, 삼성, hyundai")
+if symbol_query:
+    matches = symbols.search(symbol_query, limit=8)
+    if matches:
+        st.sidebar.dataframe(
+            pd.DataFrame(matches)[['ticker', 'name', 'name_en']].rename(
+                columns={'ticker': '종목코드', 'name': '종목명', 'name_en': '영문명'}
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.sidebar.caption("일치하는 종목이 없습니다.")
+
+st.sidebar.markdown("---")
+
 # ============ 사이드바: 조건 설정 ============
 st.sidebar.markdown("### ⚙️ 검색 조건 설정")
 
+# 슬라이더 옆에 통과 종목 수를 표시할 자리 (조건 설정 후 채움)
+preview_slots = {}
+
 # 1. 거래대금 증가
 st.sidebar.markdown("#### 1️⃣ 거래대금 증가")
 col1, col2 = st.sidebar.columns(2)
@@ -202,6 +292,7 @@ if volume_enabled:
     with col2:
         volume_period = st.number_input("기간(일)", 5, 50, 20, key="volume_period")
     st.sidebar.caption("당일 거래대금 ≥ 최근 평균의 배수")
+    preview_slots['volume_ratio'] = st.sidebar.empty()
 
 st.session_state.config.volume.enabled = volume_enabled
 st.session_state.config.volume.multiplier = volume_multiplier if volume_enabled else 1.0
@@ -225,6 +316,7 @@ close_enabled = st.sidebar.checkbox("활성화", value=True, key="close_enabled"
 if close_enabled:
     close_pct = st.sidebar.slider("고가 대비(%)", 0.80, 1.00, 0.95, 0.01, key="close_pct")
     st.sidebar.caption("종가 ≥ 당일 고가의 %")
+    preview_slots['close_ratio'] = st.sidebar.empty()
 else:
     close_pct = 0.95
 
@@ -254,6 +346,7 @@ volatility_enabled = st.sidebar.checkbox("활성화", value=True, key="volatilit
 if volatility_enabled:
     vol_threshold = st.sidebar.slider("최소 변동률(%)", 0.0, 0.05, 0.02, 0.001, key="vol_threshold")
     st.sidebar.caption("최근 10일 평균 일변동률 ≥ %")
+    preview_slots['volatility'] = st.sidebar.empty()
 else:
     vol_threshold = 0.02
 
@@ -274,6 +367,8 @@ if size_enabled:
         price_min = st.number_input("최소", 0, 100_000, 3_000, 1000, key="price_min")
         price_max = st.number_input("최대", 1_000, 1_000_000, 50_000, 10000, key="price_max")
     st.sidebar.caption("유동성 및 리스크 관리")
+    preview_slots['market_cap'] = st.sidebar.empty()
+    preview_slots['price'] = st.sidebar.empty()
 else:
     market_cap_min, market_cap_max = 1_000, 10_000
     price_min, price_max = 3_000, 50_000
@@ -284,6 +379,24 @@ st.session_state.config.size.market_cap_max = market_cap_max * 100_000_000
 st.session_state.config.size.price_min = price_min
 st.session_state.config.size.price_max = price_max
 
+# 검색한 스냅샷이 있으면 임계값별 통과 종목 수 미리보기 (검색 실행 없이 이진 탐색)
+if st.session_state.candidates_df is not None:
+    preview_counts = st.session_state.engine.pass_counts(
+        st.session_state.candidates_df,
+        st.session_state.config,
+        version=st.session_state.candidates_version
+    )
+    preview_labels = {
+        'volume_ratio': '거래대금',
+        'close_ratio': '종가 위치',
+        'volatility': '변동성',
+        'market_cap': '시가총액',
+        'price': '주가',
+    }
+    for feature, slot in preview_slots.items():
+        counts = preview_counts[feature]
+        slot.caption(f"📊 {preview_labels[feature]} 통과 {counts['pass']}개 · 전체 조건 동시 충족 {counts['joint']}개")
+
 # 백테스트 설정
 st.sidebar.markdown("### 💰 백테스트 설정")
 initial_capital = st.sidebar.number_input("초기자산(원)", 1_000_000, 1_000_000_000, 10_000_000, 1_000_000, key="initial_capital")
@@ -299,31 +412,45 @@ main_col1, main_col2 = st.columns([3, 1])
 
 with main_col2:
     st.markdown("### 🚀 검색 실행")
+    if snapshot is not None:
+        st.caption(f"스냅샷 {snapshot.created_at} 기준")
     if st.button("검색 시작", use_container_width=True):
-        with st.spinner("데이터 로드 중..."):
-            try:
-                # 데이터 로드
-                data = loader.prepare_data(days=60)
+        if snapshot is not None:
+            use_snapshot(snapshot)
+        else:
+            with st.spinner("데이터 로드 중..."):
+                try:
+                    # 데이터 로드 (조건을 바꿔 가며 재사용하므로 사전 필터 없이 전체 종목)
+                    data = loader.prepare_data(days=60)
                 
-                # 오늘 데이터 추출
-                candidates_df = loader.get_today_candidates()
+                    # 오늘 데이터 추출
+                    candidates_df = loader.get_today_candidates()
                 
-                if candidates_df.empty:
-                    st.error("데이터를 불러올 수 없습니다.")
-                else:
-                    # 검색 실행
-                    engine = DayTradeSearchEngine(st.session_state.config)
-                    results = engine.search(candidates_df, st.session_state.config)
-                    
-                    # 조건 충족 종목만 필터링 (최소 3개 조건)
-                    filtered_results = [r for r in results if r.conditions_met >= 3]
-                    
-                    st.session_state.search_results = filtered_results
-                    st.session_state.backtest_data = data
-                    
-                    st.success(f"✅ 검색 완료: {len(filtered_results)}개 종목 발견")
-            except Exception as e:
-                st.error(f"❌ 오류: {str(e)}")
+                    if candidates_df.empty:
+                        st.error("데이터를 불러올 수 없습니다.")
+                    else:
+                        # 검색 대상 스냅샷 저장 (이후 조건 변경 시 재사용)
+                        st.session_state.candidates_df = candidates_df
+                        st.session_state.candidates_version = data_version(candidates_df)
+                        st.session_state.backtest_data = data
+                        st.session_state.backtest_panel = None
+                        st.session_state.engine.clear_cache()
+                except Exception as e:
+                    st.error(f"❌ 오류: {str(e)}")
+
+    # 조건이 바뀌면 바뀐 조건만 다시 평가 (나머지는 캐시된 마스크 재사용)
+    if st.session_state.candidates_df is not None:
+        results = st.session_state.engine.search(
+            st.session_state.candidates_df,
+            st.session_state.config,
+            version=st.session_state.candidates_version
+        )
+        
+        # 조건 충족 종목만 필터링 (최소 3개 조건)
+        filtered_results = [r for r in results if r.conditions_met >= 3]
+        st.session_state.search_results = filtered_results
+        
+        st.success(f"✅ 검색 완료: {len(filtered_results)}개 종목 발견")
 
 # ============ 검색 결과 ============
 if st.session_state.search_results:
@@ -369,11 +496,12 @@ if st.session_state.search_results:
         }
         
         condition_keys = ['volume', 'candle', 'close', 'trend', 'volatility', 'size']
+        conditions_detail = unpack_conditions(selected_result.conditions_mask)
         
         for i, key in enumerate(condition_keys):
             col = [col1, col2, col3][i % 3]
             with col:
-                result = selected_result.conditions_detail.get(key, False)
+                result = conditions_detail.get(key, False)
                 name, desc = condition_info[key]
                 
                 # 조건 충족 여부에 따른 색상
@@ -415,6 +543,30 @@ if st.session_state.search_results and st.session_state.backtest_data:
                 except Exception as e:
                     st.error(f"❌ 오류: {str(e)}")
     
+    with col2:
+        if st.button("히스토리 재현", use_container_width=True):
+            with st.spinner("전체 기간 재현 중..."):
+                try:
+                    # 로드한 전체 기간의 모든 날짜에 현재 조건을 적용 → 날짜별 상위 5개로 백테스트
+                    # (스냅샷과 조건이 같으면 장 마감 후 미리 계산한 결과를 그대로 사용)
+                    precomputed = None
+                    if snapshot is not None and st.session_state.get('snapshot_version') == snapshot.version \
+                            and snapshot.meta.get('config_key') == config_key(st.session_state.config):
+                        precomputed = snapshot.replay_backtest()
+                    if precomputed is not None:
+                        st.session_state.backtest_results = precomputed
+                        st.success(f"✅ 재현 완료: {snapshot.frame('replay_picks')['date'].nunique()}일 (스냅샷)")
+                    else:
+                        panel = st.session_state.get('backtest_panel')
+                        if panel is None:
+                            panel = loader.to_panel(st.session_state.backtest_data)
+                        picks = st.session_state.engine.replay(panel, st.session_state.config, top_n=5, min_conditions=3)
+                        backtest_engine = BacktestEngine(st.session_state.config)
+                        st.session_state.backtest_results = backtest_engine.simulate_replay(picks)
+                        st.success(f"✅ 재현 완료: {picks['date'].nunique()}일")
+                except Exception as e:
+                    st.error(f"❌ 오류: {str(e)}")
+    
     if st.session_state.backtest_results:
         bt = st.session_state.backtest_results
         
@@ -431,15 +583,11 @@ if st.session_state.search_results and st.session_state.backtest_data:
         
         # 자산 곡선 그래프
         st.markdown("#### 누적 자산 변화")
-        fig, ax = plt.subplots(figsize=(12, 4))
-        ax.plot(bt['daily_equity'], linewidth=2, color='#1f77b4', label='자산')
-        ax.fill_between(range(len(bt['daily_equity'])), bt['daily_equity'], alpha=0.3, color='#1f77b4')
-        ax.set_ylabel('자산(원)', fontsize=10)
-        ax.set_xlabel('거래', fontsize=10)
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-        plt.tight_layout()
-        st.pyplot(fig)
+        # 화면 폭만큼 다운샘플링한 이미지를 (결과, 크기, 테마)별로 캐시 - 재실행 시 다시 그리지 않음
+        equity = np.asarray(bt['daily_equity'], dtype=float)
+        result_id = renderer.register(np.arange(len(equity)), equity)
+        image = renderer.render_png(result_id, size=(1200, 400), theme=st.session_state.theme, time_axis=False)
+        st.image(base64.b64decode(image), use_container_width=True)
         
         # 거래 상세
         if bt['trades']:
@@ -456,12 +604,26 @@ if st.session_state.search_results and st.session_state.backtest_data:
                 })
             trades_df = pd.DataFrame(trades_data)
             st.dataframe(trades_df, use_container_width=True)
+        
+        # 강건성 분석 (여러 날짜 거래가 있는 히스토리 재현 결과만)
+        trade_log = pd.DataFrame(bt['trades'])
+        if 'date' in trade_log.columns and trade_log['date'].nunique() >= 2:
+            with st.expander("🎲 강건성 분석 (부트스트랩 신뢰구간)"):
+                st.caption("일별 수익률을 블록 단위로 재표본하거나 거래일 순서를 섞어 지표의 95% 구간을 계산합니다.")
+                report = robustness_report(trade_log.rename(columns={'pnl_pct': 'return_pct'}), n_resamples=2000,
+                                           initial_capital=st.session_state.config.backtest.initial_capital, seed=0)
+                labels = {'final_equity': '최종 자산', 'mdd': '최대낙폭', 'win_rate': '승률', 'sharpe': '샤프'}
+                for method, title in [('block', '블록 부트스트랩 (5일)'), ('shuffle', '거래일 순서 섞기')]:
+                    table = report[method].rename(index=labels)
+                    table.columns = ['실제', '하한', '중앙값', '상한']
+                    st.markdown(f"**{title}**")
+                    st.dataframe(table.style.format("{:,.4f}"), use_container_width=True)
 
 # ============ 추적 결과 탭 ============
 st.markdown("---")
 st.markdown("### 📊 검색 결과 추적")
 
-tab1, tab2, tab3 = st.tabs(["📈 통계", "📋 히스토리", "📅 일별 요약"])
+tab1, tab2, tab3, tab4 = st.tabs(["📈 통계", "📋 히스토리", "📅 일별 요약", "🧩 조건 조합"])
 
 with tab1:
     stats = tracker.get_statistics()
@@ -515,7 +677,7 @@ with tab1:
 
 with tab2:
     st.markdown("#### 검색 결과 상세")
-    history_df = tracker.get_history_dataframe(limit=100)
+    history_df = history_table(limit=100)
     
     if not history_df.empty:
         col1, col2 = st.columns(2)
@@ -537,6 +699,10 @@ with tab2:
             filtered_df['다음고가'] = filtered_df['다음고가'].apply(lambda x: f"{x:,.0f}원")
             filtered_df['수익률'] = filtered_df['수익률'].apply(lambda x: f"{x:.2%}")
             filtered_df['점수'] = filtered_df['점수'].apply(lambda x: f"{x:.1%}")
+            filtered_df['조건마스크'] = filtered_df['조건마스크'].apply(
+                lambda m: ', '.join(CONDITION_LABELS[k] for k, v in unpack_conditions(m).items() if v)
+            )
+            filtered_df = filtered_df.rename(columns={'조건마스크': '충족조건'})
             
             st.dataframe(filtered_df, use_container_width=True, hide_index=True)
     else:
@@ -549,6 +715,52 @@ with tab3:
     if not summary_df.empty:
         st.dataframe(summary_df, use_container_width=True, hide_index=True)
 
+with tab4:
+    st.markdown("#### 조건 조합별 적중률")
+    # 세션 동안 집계를 유지하고 새로 추적된 날짜만 더한다
+    if 'hit_rates' not in st.session_state:
+        st.session_state.hit_rates = ConditionHitRates(tracker)
+    st.session_state.hit_rates.refresh()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        group_by = st.selectbox(
+            "묶음 기준",
+            ["조건 조합", "점수 구간", "순위", "조건 조합 × 순위"],
+            key="hit_rate_group"
+        )
+    with col2:
+        min_count = st.number_input("최소 표본 수", min_value=1, value=5, step=1, key="hit_rate_min_count")
+    
+    dims = {
+        "조건 조합": ('conditions_mask',),
+        "점수 구간": ('score_bucket',),
+        "순위": ('rank',),
+        "조건 조합 × 순위": ('conditions_mask', 'rank'),
+    }[group_by]
+    hit_table = st.session_state.hit_rates.table(by=dims, min_count=int(min_count)).reset_index()
+    
+    if not hit_table.empty:
+        if 'conditions_mask' in hit_table:
+            hit_table['conditions_mask'] = hit_table['conditions_mask'].apply(
+                lambda m: ', '.join(CONDITION_LABELS[k] for k, v in unpack_conditions(m).items() if v) or '없음'
+            )
+        hit_table['적중률 (95% 구간)'] = hit_table.apply(
+            lambda r: f"{r['hit_rate']:.1%} ({r['hit_rate_lower']:.1%}~{r['hit_rate_upper']:.1%})", axis=1
+        )
+        hit_table['평균수익률 (95% 구간)'] = hit_table.apply(
+            lambda r: f"{r['mean_return']:.2%} ({r['return_lower']:.2%}~{r['return_upper']:.2%})"
+            if r['count'] > 1 else f"{r['mean_return']:.2%}", axis=1
+        )
+        hit_table = hit_table.rename(columns={
+            'conditions_mask': '충족조건', 'score_bucket': '점수구간', 'rank': '순위', 'count': '표본수'
+        })
+        display_columns = [c for c in ['충족조건', '점수구간', '순위'] if c in hit_table]
+        display_columns += ['표본수', '적중률 (95% 구간)', '평균수익률 (95% 구간)']
+        st.dataframe(hit_table[display_columns], use_container_width=True, hide_index=True)
+    else:
+        st.info("표본이 충분한 추적 결과가 없습니다.")
+
 # ============ 스케줄러 관리 ============
 st.markdown("---")
 st.markdown("### ⏰ 자동 추적 스케줄러")
@@ -578,6 +790,38 @@ else:
     st.warning("⚠️ **schedule 패키지가 설치되지 않았습니다.**\n\n자동 스케줄러를 사용하려면:\n```\npip install schedule\n```")
 
 
+# ============ 단계별 성능 계측 ============
+with st.expander("⏱️ 단계별 성능 계측"):
+    metrics_enabled = st.checkbox("계측 활성화", value=instruments.enabled, key="metrics_enabled")
+    if metrics_enabled != instruments.enabled:
+        if metrics_enabled:
+            instruments.enable(trace_memory=True)
+        else:
+            instruments.disable()
+    
+    metrics_snapshot = instruments.snapshot()
+    if metrics_snapshot['stages']:
+        stage_rows = []
+        for stage, values in metrics_snapshot['stages'].items():
+            stage_rows.append({
+                '단계': stage,
+                '호출': int(values['calls']),
+                '누적(초)': f"{values['seconds']:.3f}",
+                '최대(초)': f"{values['max_seconds']:.3f}",
+                '입력 행': int(values['rows_in']),
+                '출력 행': int(values['rows_out']),
+                '최대 메모리(MB)': f"{values['peak_bytes'] / 1_048_576:.1f}",
+            })
+        st.dataframe(pd.DataFrame(stage_rows), use_container_width=True, hide_index=True)
+        if metrics_snapshot['counters']:
+            st.caption(" · ".join(f"{k}: {v:,.0f}" for k, v in metrics_snapshot['counters'].items()))
+        if st.button("계측 초기화"):
+            instruments.reset()
+            st.rerun()
+    else:
+        st.info("기록된 계측이 없습니다. 계측을 켠 뒤 검색을 실행하세요.")
+
+
 # 푸터
 st.markdown("---")
 st.markdown("""
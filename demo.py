@@ -11,7 +11,7 @@ if sys.stdout.encoding != 'utf-8':
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from searcher_korean_stock.config import SearchConfig
+from searcher_korean_stock.config import SearchConfig, unpack_conditions
 from searcher_korean_stock.data_loader import loader
 from searcher_korean_stock.engine import DayTradeSearchEngine, BacktestEngine
 
@@ -76,9 +76,10 @@ def main():
             'volatility': '변동성 필터',
             'size': '종목 규모'
         }
+        conditions_detail = unpack_conditions(top_result.conditions_mask)
         
         for key, name in condition_names.items():
-            result = top_result.conditions_detail.get(key, False)
+            result = conditions_detail.get(key, False)
             status = "✅ 충족" if result else "❌ 불충족"
             print(f"   · {name:<15} {status}")
     
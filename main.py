@@ -6,7 +6,7 @@ import pandas as pd
 from src.searcher_korean_stock.data_loader import KoreanStockLoader
 from src.searcher_korean_stock.backtester import simulate
 from src.searcher_korean_stock.strategy import select_candidates
-from src.searcher_korean_stock.visualizer import equity_curve, performance_summary
+from src.searcher_korean_stock.visualizer import equity_curve
 
 
 def run():
@@ -26,9 +26,14 @@ def run():
     print('\n📈 거래 로그 (최근 5건)')
     print(trade_log.tail())
 
-    summary = performance_summary(trade_log)
+    summary = result.metrics
     print('\n📊 성과 요약')
     print(f"승률: {summary['win_rate']:.2%}, 평균 수익률: {summary['avg_return']:.2%}, MDD: {summary['mdd']:.2%}")
+    print(f"누적 수익률: {summary['total_return']:.2%}, 샤프: {summary['sharpe']:.2f}, 소르티노: {summary['sortino']:.2f}")
+    print('\n월별 수익률')
+    print(summary['monthly_returns'])
+    print('\n주별 수익률')
+    print(summary['weekly_returns'])
     
     # 자산 곡선 시각화 파일 저장
     fig = equity_curve(result.portfolio)
@@ -5,6 +5,8 @@ from .config import SearchConfig, BacktestConfig
 from .data_loader import KoreanStockDataLoader, loader
 from .engine import DayTradeSearchEngine, BacktestEngine
 from .tracker import SearchTracker, tracker
+from .universe import UniverseMaster, universe
+from .symbols import SymbolMaster, symbols
 
 # scheduler는 선택적 (schedule 패키지가 필요)
 try:
@@ -23,6 +25,10 @@ __all__ = [
     "BacktestEngine",
     "SearchTracker",
     "tracker",
+    "UniverseMaster",
+    "universe",
+    "SymbolMaster",
+    "symbols",
     "AutoTracker",
     "auto_tracker"
 ]
@@ -0,0 +1,174 @@
+"""
+수정주가 - 종목별 기업 이벤트(분할, 병합, 유상증자 등)의 누적 조정 계수
+
+원시 OHLCV는 그대로 두고, 종목별로 (권리락일, 누적 계수) 배열만 저장한다.
+읽을 때 날짜별 계수를 searchsorted로 찾아 가격 열에 한 번 곱한다.
+새 이벤트가 생기면 그 종목의 계수만 다시 계산하고, 과거 데이터는 다시 받지 않는다.
+"""
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+# (날짜, 종목) 패널에서 같은 날 가격 기준인 열 (거래대금, 시가총액은 분할 전후로 변하지 않음)
+PANEL_PRICE_COLUMNS = PRICE_COLUMNS + ['after_13_low', 'after_13_high']
+
+
+def split_ratio(old_shares: float, new_shares: float) -> float:
+    """분할/병합 가격 계수 (예: 1주 → 50주 분할이면 1/50)"""
+    return old_shares / new_shares
+
+
+def rights_ratio(close_before: float, issue_price: float, new_per_share: float) -> float:
+    """
+    유상증자 가격 계수 (권리락 이론가격 / 권리락 전일 종가)
+
+    Args:
+        close_before: 권리락 전일 종가
+        issue_price: 신주 발행가
+        new_per_share: 구주 1주당 배정 신주 수
+    """
+    theoretical = (close_before + issue_price * new_per_share) / (1 + new_per_share)
+    return theoretical / close_before
+
+
+class AdjustmentStore:
+    """
+    종목별 기업 이벤트와 누적 조정 계수 저장소
+
+    파일 형식: {ticker: {"ex_dates": [...], "ratios": [...], "factors": [...]}}
+    factors[i]는 ex_dates[i] 이전 날짜에 곱할 누적 계수 (그 이후 모든 이벤트 계수의 곱)
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "adjustments.json")):
+        """초기화 (파일은 처음 사용할 때 로드)"""
+        self.path = path
+        self._actions: Optional[Dict[str, Dict[str, list]]] = None
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, list]]:
+        if self._actions is None:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._actions = json.load(f)
+            else:
+                self._actions = {}
+        return self._actions
+
+    def _save(self) -> None:
+        """임시 파일에 쓴 뒤 교체 (쓰는 도중 읽어도 깨진 파일을 보지 않음)"""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._actions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _ticker_arrays(self, ticker: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(권리락일 배열, 누적 계수 배열 + 마지막 1.0)"""
+        arrays = self._arrays.get(ticker)
+        if arrays is None:
+            entry = self._load().get(ticker)
+            if entry is None:
+                arrays = (np.array([], dtype='datetime64[D]'), np.ones(1))
+            else:
+                arrays = (np.array(entry["ex_dates"], dtype='datetime64[D]'),
+                          np.r_[np.asarray(entry["factors"], dtype=float), 1.0])
+            self._arrays[ticker] = arrays
+        return arrays
+
+    def add_action(self, ticker: str, ex_date, ratio: float) -> None:
+        """
+        기업 이벤트 추가 (해당 종목의 누적 계수만 다시 계산)
+
+        Args:
+            ticker: 종목 코드
+            ex_date: 권리락일 (이 날짜부터 새 가격 기준)
+            ratio: 가격 계수 (split_ratio, rights_ratio 참고)
+        """
+        day = str(pd.Timestamp(ex_date).date())
+        with self._lock:
+            actions = self._load()
+            entry = actions.get(ticker, {"ex_dates": [], "ratios": []})
+            events = dict(zip(entry["ex_dates"], entry["ratios"]))
+            events[day] = float(ratio)
+
+            ex_dates = sorted(events)
+            ratios = np.array([events[d] for d in ex_dates], dtype=float)
+            # 뒤에서부터 누적곱: 각 권리락일 이전 구간에 곱할 계수
+            factors = np.cumprod(ratios[::-1])[::-1]
+            actions[ticker] = {"ex_dates": ex_dates, "ratios": ratios.tolist(), "factors": factors.tolist()}
+            self._arrays.pop(ticker, None)
+            self._save()
+
+    def ex_dates(self, ticker: str) -> list:
+        """종목의 권리락일 목록 (datetime.date)"""
+        return [d.item() for d in self._ticker_arrays(ticker)[0]]
+
+    def has_actions(self, ticker: str) -> bool:
+        return len(self._ticker_arrays(ticker)[0]) > 0
+
+    def factors(self, ticker: str, dates) -> np.ndarray:
+        """날짜별 누적 조정 계수 (이벤트가 없으면 1.0)"""
+        ex_dates, factors = self._ticker_arrays(ticker)
+        days = pd.DatetimeIndex(dates).tz_localize(None).values.astype('datetime64[D]')
+        return factors[np.searchsorted(ex_dates, days, side='right')]
+
+    def adjust(self, df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+        """
+        수정주가 뷰 (원본은 그대로, 가격 열 × 계수, 거래량 ÷ 계수)
+
+        Args:
+            df: 날짜 인덱스의 원시 OHLCV
+            ticker: 종목 코드
+
+        Returns:
+            조정된 복사본 (이벤트가 없으면 원본 그대로)
+        """
+        if df.empty or not self.has_actions(ticker):
+            return df
+
+        factor = self.factors(ticker, df.index)
+        adjusted = df.copy()
+        columns = [c for c in PRICE_COLUMNS if c in df.columns]
+        adjusted[columns] = df[columns].to_numpy(dtype=float) * factor[:, None]
+        if 'volume' in df.columns:
+            adjusted['volume'] = df['volume'].to_numpy(dtype=float) / factor
+        return adjusted
+
+    def adjust_panel(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        (날짜, 종목) 행 패널의 수정주가 뷰 (CSV 패널로 filter_candidates / simulate를 돌릴 때)
+
+        이벤트가 있는 종목의 행만 가격 열(오후 고가/저가 포함) × 계수, 거래량 ÷ 계수.
+        prepare_data 결과로 만든 패널은 이미 조정되어 있으므로 다시 적용하지 않는다.
+
+        Returns:
+            조정된 복사본 (이벤트가 있는 종목이 없으면 원본 그대로)
+        """
+        if panel.empty:
+            return panel
+        tickers = [t for t in pd.unique(panel['ticker']) if self.has_actions(t)]
+        if not tickers:
+            return panel
+
+        factor = np.ones(len(panel))
+        ticker_values = panel['ticker'].to_numpy()
+        dates = panel['date'].to_numpy()
+        for ticker in tickers:
+            rows = ticker_values == ticker
+            factor[rows] = self.factors(ticker, dates[rows])
+
+        adjusted = panel.copy()
+        columns = [c for c in PANEL_PRICE_COLUMNS if c in panel.columns]
+        adjusted[columns] = panel[columns].to_numpy(dtype=float) * factor[:, None]
+        if 'volume' in panel.columns:
+            adjusted['volume'] = panel['volume'].to_numpy(dtype=float) / factor
+        return adjusted
@@ -0,0 +1,156 @@
+"""
+조건 조합별 적중률 분석 - 추적 이력을 (조건 조합 64가지 × 점수 구간 × 순위) 격자로 집계
+
+격자 칸마다 표본 수, 적중 수, 수익률 합, 수익률 제곱합만 누적한다. 새로 추적된 날짜만
+bincount로 더하므로 갱신 비용은 새 데이터 크기에 비례하고, 어떤 축으로 묶어 보든 격자를 합산하면 된다.
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import CONDITION_BITS
+
+
+# 점수 구간 경계 (점수는 0~1)
+SCORE_EDGES = np.array([0.5, 0.6, 0.7, 0.8, 0.9])
+
+# 순위 칸 (1 ~ MAX_RANK, 0은 순위 없음)
+MAX_RANK = 5
+
+N_MASKS = 1 << len(CONDITION_BITS)
+N_BUCKETS = len(SCORE_EDGES) + 1
+N_RANKS = MAX_RANK + 1
+
+DIMENSIONS = ('conditions_mask', 'score_bucket', 'rank')
+
+Z_SCORES = {0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+
+def score_bucket_labels() -> list:
+    """점수 구간 이름 (예: '<0.5', '0.5-0.6', ..., '>=0.9')"""
+    edges = SCORE_EDGES
+    labels = [f"<{edges[0]:g}"]
+    labels += [f"{lo:g}-{hi:g}" for lo, hi in zip(edges[:-1], edges[1:])]
+    labels.append(f">={edges[-1]:g}")
+    return labels
+
+
+def wilson_interval(hits: np.ndarray, counts: np.ndarray, z: float = 1.96):
+    """적중률의 윌슨 신뢰구간 (표본이 적어도 0~1 범위를 벗어나지 않음)"""
+    hits = np.asarray(hits, dtype=float)
+    counts = np.asarray(counts, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = hits / counts
+        denom = 1 + z * z / counts
+        center = (p + z * z / (2 * counts)) / denom
+        half = z * np.sqrt(p * (1 - p) / counts + z * z / (4 * counts * counts)) / denom
+    return np.clip(center - half, 0, 1), np.clip(center + half, 0, 1)
+
+
+class ConditionHitRates:
+    """조건 조합별 적중률 (추적 이력에서 점진적으로 갱신)"""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        shape = (N_MASKS, N_BUCKETS, N_RANKS)
+        self.counts = np.zeros(shape)
+        self.hits = np.zeros(shape)
+        self.return_sum = np.zeros(shape)
+        self.return_sq_sum = np.zeros(shape)
+        self._seen: Dict[str, str] = {}
+
+    def reset(self) -> None:
+        for grid in (self.counts, self.hits, self.return_sum, self.return_sq_sum):
+            grid[:] = 0
+        self._seen = {}
+
+    def _add(self, columns: Dict[str, np.ndarray]) -> None:
+        if len(columns['conditions_mask']) == 0:
+            return
+        masks = columns['conditions_mask'] & (N_MASKS - 1)
+        buckets = np.searchsorted(SCORE_EDGES, columns['score'], side='right')
+        ranks = np.where((columns['rank'] >= 1) & (columns['rank'] <= MAX_RANK), columns['rank'], 0)
+        cells = (masks * N_BUCKETS + buckets) * N_RANKS + ranks
+
+        size = self.counts.size
+        returns = columns['actual_return']
+        self.counts += np.bincount(cells, minlength=size).reshape(self.counts.shape)
+        self.hits += np.bincount(cells, weights=columns['achieved'].astype(float), minlength=size).reshape(self.counts.shape)
+        self.return_sum += np.bincount(cells, weights=returns, minlength=size).reshape(self.counts.shape)
+        self.return_sq_sum += np.bincount(cells, weights=returns * returns, minlength=size).reshape(self.counts.shape)
+
+    def refresh(self) -> int:
+        """
+        새로 추적된 날짜만 반영
+
+        이미 반영한 날짜가 다시 추적되었으면 (추적 시각 변경) 전체를 다시 집계한다.
+
+        Returns:
+            새로 반영한 날짜 수
+        """
+        tracked = self.tracker.tracked_dates()
+        if any(tracked.get(date) != stamp for date, stamp in self._seen.items()):
+            self.reset()
+        new_dates = sorted(date for date in tracked if date not in self._seen)
+        if new_dates:
+            self._add(self.tracker.tracking_columns(new_dates))
+            self._seen.update({date: tracked[date] for date in new_dates})
+        return len(new_dates)
+
+    def table(self, by: Sequence[str] = ('conditions_mask',), confidence: float = 0.95,
+              min_count: int = 1) -> pd.DataFrame:
+        """
+        지정한 축별 적중률 표
+
+        Args:
+            by: DIMENSIONS 중 묶을 축 ('conditions_mask', 'score_bucket', 'rank')
+            confidence: 신뢰수준 (0.90, 0.95, 0.99)
+            min_count: 이보다 표본이 적은 칸은 제외
+
+        Returns:
+            축별 count, hits, hit_rate, hit_rate_lower/upper (윌슨), mean_return, return_lower/upper
+        """
+        if not by:
+            raise ValueError("묶을 축을 하나 이상 지정하세요")
+        unknown = [dim for dim in by if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"알 수 없는 축: {unknown}")
+        z = Z_SCORES.get(confidence)
+        if z is None:
+            raise ValueError(f"지원하지 않는 신뢰수준: {confidence}")
+
+        drop = tuple(i for i, dim in enumerate(DIMENSIONS) if dim not in by)
+        counts = self.counts.sum(axis=drop).ravel()
+        hits = self.hits.sum(axis=drop).ravel()
+        return_sum = self.return_sum.sum(axis=drop).ravel()
+        return_sq_sum = self.return_sq_sum.sum(axis=drop).ravel()
+
+        kept = [dim for dim in DIMENSIONS if dim in by]
+        levels = {
+            'conditions_mask': np.arange(N_MASKS),
+            'score_bucket': np.array(score_bucket_labels(), dtype=object),
+            'rank': np.arange(N_RANKS),
+        }
+        index = pd.MultiIndex.from_product([levels[dim] for dim in kept], names=kept)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = return_sum / counts
+            var = (return_sq_sum - counts * mean * mean) / (counts - 1)
+            half = z * np.sqrt(np.maximum(var, 0) / counts)
+        lower, upper = wilson_interval(hits, counts, z)
+
+        table = pd.DataFrame({
+            'count': counts.astype(np.int64),
+            'hits': hits.astype(np.int64),
+            'hit_rate': hits / np.where(counts > 0, counts, np.nan),
+            'hit_rate_lower': lower,
+            'hit_rate_upper': upper,
+            'mean_return': mean,
+            'return_lower': mean - half,
+            'return_upper': mean + half,
+        }, index=index)
+        table = table[table['count'] >= max(min_count, 1)]
+        if len(kept) == 1:
+            table.index = table.index.get_level_values(0)
+        return table.sort_values(['count', 'hit_rate'], ascending=False)
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from functools import cached_property
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from .adjustments import AdjustmentStore
+from .instrumentation import instruments
+from .intraday import MinuteBarStore
+from .kernels import EXIT_RESULTS, resolve_exits
+from .performance import compute_metrics, daily_equity, equity_points_daily
 from .portfolio import Portfolio, TradeRecord
+from .result_store import ResultSink, ResultStore
 from .strategy import select_candidates
 
+TARGET = 1.02
+STOP = 0.985
+
 
 @dataclass
 class BacktestResult:
@@ -15,13 +26,78 @@ class BacktestResult:
     trade_log: pd.DataFrame
     selection_log: pd.DataFrame
 
-
-def simulate(df: pd.DataFrame, initial_capital: float = 10_000_000) -> BacktestResult:
-    """Run day-by-day backtest based on the next-day +2% target and -1.5% stop."""
+    @cached_property
+    def metrics(self) -> Dict[str, Any]:
+        """Compounded-equity performance metrics, computed once per result."""
+        return compute_metrics(self.equity(), self.trade_log, self.selection_log)
+
+    def equity(self) -> pd.Series:
+        """End-of-day equity, starting with the initial capital."""
+        return daily_equity(self.portfolio)
+
+
+class StoredBacktestResult(BacktestResult):
+    """BacktestResult whose logs live in a ResultStore and are read on first access.
+
+    `portfolio` only carries the running metrics (portfolio.metrics()); its equity curve is not kept.
+    """
+
+    def __init__(self, portfolio: Portfolio, store: ResultStore):
+        self.portfolio = portfolio
+        self.store = store
+
+    @cached_property
+    def trade_log(self) -> pd.DataFrame:
+        return self.store.read('trades')
+
+    @cached_property
+    def selection_log(self) -> pd.DataFrame:
+        return self.store.read('selections')
+
+    def equity(self) -> pd.Series:
+        points = self.store.read('equity')
+        if points.empty:
+            return equity_points_daily([], [], self.portfolio.initial_capital)
+        return equity_points_daily(points['date'].to_numpy(), points['equity'].to_numpy(),
+                                   self.portfolio.initial_capital)
+
+
+def _first_touch(store: MinuteBarStore, next_day, picks: pd.DataFrame, next_data: pd.DataFrame) -> Dict[str, str]:
+    """Minute-bar outcome for picks whose next-day range contains both the target and the stop."""
+    picks = picks[picks['ticker'].isin(next_data.index)]
+    if picks.empty:
+        return {}
+    buy = picks['close'].to_numpy(dtype=float)
+    target = buy * TARGET
+    stop = buy * STOP
+    bars = next_data.loc[picks['ticker'], ['high', 'low']].to_numpy(dtype=float)
+    ambiguous = (bars[:, 0] >= target) & (bars[:, 1] <= stop)
+    if not ambiguous.any():
+        return {}
+    tickers = picks['ticker'].to_numpy()[ambiguous]
+    outcome = store.first_touch(next_day, tickers, target[ambiguous], stop[ambiguous])
+    return {ticker: result for ticker, result in zip(tickers, outcome) if result}
+
+
+@instruments.traced('simulate')
+def simulate(df: pd.DataFrame, initial_capital: float = 10_000_000,
+             minute_store: Optional[MinuteBarStore] = None,
+             sink: Optional[ResultSink] = None,
+             adjustments: Optional[AdjustmentStore] = None) -> BacktestResult:
+    """Run day-by-day backtest based on the next-day +2% target and -1.5% stop.
+
+    Without minute bars a day that spans both levels is booked as a win; with `minute_store`
+    those days (and only those) are resolved by whichever level the minute bars touch first.
+    With `sink`, trades, selections and equity points go to disk in batches and the result is a
+    StoredBacktestResult that reads them back on demand.
+    With `adjustments` a raw panel is split-adjusted first, so trades are booked in adjusted prices.
+    """
     df = df.sort_values(['date', 'ticker']).copy()
+    if adjustments is not None:
+        df = adjustments.adjust_panel(df)
 
     candidates = select_candidates(df)
-    portfolio = Portfolio(initial_capital=initial_capital)
+    portfolio = Portfolio(initial_capital=initial_capital, sink=sink)
 
     trade_records: List[TradeRecord] = []
     selection_rows: List[Dict] = []
@@ -39,30 +115,19 @@ def simulate(df: pd.DataFrame, initial_capital: float = 10_000_000) -> BacktestR
         next_data = df_by_date[next_day].set_index('ticker')
         n = min(len(day_candidates), 4)
         allocation = portfolio.allocate(n)
-
-        for _, row in day_candidates.head(4).iterrows():
-            ticker = row['ticker']
-            buy_price = row['close']
-            target = buy_price * 1.02
-            stop = buy_price * 0.985
-
-            if ticker not in next_data.index:
-                continue
-
-            nhigh = next_data.loc[ticker, 'high']
-            nlow = next_data.loc[ticker, 'low']
-            nclose = next_data.loc[ticker, 'close']
-
-            if nhigh >= target:
-                sell_price = target
-                result = 'win'
-            elif nlow <= stop:
-                sell_price = stop
-                result = 'loss'
-            else:
-                sell_price = nclose
-                result = 'hold_exit'
-
+        picks = day_candidates.head(4)
+        first_touch = _first_touch(minute_store, next_day, picks, next_data) if minute_store is not None else {}
+
+        picks = picks[picks['ticker'].isin(next_data.index)]
+        tickers = picks['ticker'].to_numpy()
+        buy = picks['close'].to_numpy(dtype=float)
+        bars = next_data.loc[tickers, ['high', 'low', 'close']].to_numpy(dtype=float)
+        stopped_first = np.array([first_touch.get(t) == 'loss' for t in tickers], dtype=bool)
+        sells, codes = resolve_exits(buy, bars[:, 0], bars[:, 1], bars[:, 2], stopped_first, TARGET, STOP)
+
+        for ticker, buy_price, sell_price, code, score in zip(tickers, buy, sells, codes, picks['total_score'].to_numpy()):
+            target = buy_price * TARGET
+            stop = buy_price * STOP
             ret = (sell_price - buy_price) / buy_price
             pnl = allocation * ret
             portfolio.update_equity(next_day, pnl)
@@ -73,17 +138,25 @@ def simulate(df: pd.DataFrame, initial_capital: float = 10_000_000) -> BacktestR
                 buy_price=buy_price,
                 sell_price=sell_price,
                 return_pct=ret,
-                result=result,
+                result=EXIT_RESULTS[code],
             )
             portfolio.log_trade(record)
-            selection_rows.append({
+            selection = {
                 'date': date,
                 'ticker': ticker,
-                'score': row['total_score'],
+                'score': score,
                 'allocation': allocation,
                 'target': target,
                 'stop': stop,
-            })
+            }
+            if sink is not None:
+                sink.write('selections', selection)
+            else:
+                selection_rows.append(selection)
+
+    if sink is not None:
+        store = sink.close(meta={'initial_capital': initial_capital, **portfolio.metrics()})
+        return StoredBacktestResult(portfolio=portfolio, store=store)
 
     trade_log = portfolio.to_frame()
     selection_log = pd.DataFrame(selection_rows)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .adjustments import AdjustmentStore
+from .cross_section import CROSS_SECTIONAL_FEATURES, CrossSectionalFeature, add_cross_sectional
+from .instrumentation import instruments
+from .stock_filter import _compute_indicators, filter_candidates
+
+# rows of history every block carries from the previous one (longest lookback: 20-day windows)
+WARMUP_ROWS = 20
+
+
+class PartitionedPanel:
+    """Long-format price panel on disk, one CSV per ticker with rows in date order.
+
+    Layout: <root>/<ticker>.csv with the sample_prices.csv columns. Each ticker file is read in blocks,
+    so only a batch of tickers x a block of days is ever in memory.
+    """
+
+    def __init__(self, root: str = 'data/panel'):
+        self.root = Path(root)
+
+    def path(self, ticker: str) -> Path:
+        return self.root / f'{ticker}.csv'
+
+    def tickers(self) -> List[str]:
+        return sorted(p.stem for p in self.root.glob('*.csv'))
+
+    def blocks(self, ticker: str, rows: int) -> Iterator[pd.DataFrame]:
+        return pd.read_csv(self.path(ticker), parse_dates=['date'], chunksize=rows)
+
+    @classmethod
+    def from_csv(cls, src: str, root: str = 'data/panel', chunksize: int = 200_000) -> 'PartitionedPanel':
+        """Split a long-format CSV (sorted by date) into per-ticker files, streaming `chunksize` rows at a time."""
+        store = cls(root)
+        store.root.mkdir(parents=True, exist_ok=True)
+        written = set()
+        for chunk in pd.read_csv(src, chunksize=chunksize):
+            for ticker, rows in chunk.groupby('ticker', sort=False):
+                path = store.path(ticker)
+                header = ticker not in written
+                rows.to_csv(path, mode='w' if header else 'a', header=header, index=False)
+                written.add(ticker)
+        return store
+
+
+def _blocks(store: PartitionedPanel, tickers: Sequence[str], tickers_per_chunk: int,
+            days_per_chunk: int, adjustments: Optional[AdjustmentStore] = None) -> Iterator[tuple]:
+    """(block, new-row mask): `days_per_chunk` rows per ticker plus WARMUP_ROWS carried from the previous block.
+
+    Blocks are sorted by (ticker, date) and come out in the same order on every call.
+    """
+    for lo in range(0, len(tickers), tickers_per_chunk):
+        batch = tickers[lo:lo + tickers_per_chunk]
+        readers = {ticker: store.blocks(ticker, days_per_chunk) for ticker in batch}
+        carry: Dict[str, pd.DataFrame] = {}
+        while readers:
+            parts, new = [], []
+            for ticker in list(readers):
+                block = next(readers[ticker], None)
+                if block is None:
+                    del readers[ticker]
+                    continue
+                block = block.assign(ticker=ticker)
+                if adjustments is not None:
+                    block = adjustments.adjust_panel(block)
+                warmup = carry.get(ticker)
+                if warmup is not None:
+                    parts.append(warmup)
+                    new.append(np.zeros(len(warmup), dtype=bool))
+                parts.append(block)
+                new.append(np.ones(len(block), dtype=bool))
+                carry[ticker] = (block if warmup is None else pd.concat([warmup, block])).tail(WARMUP_ROWS)
+            if not parts:
+                break
+            frame = pd.concat(parts, ignore_index=True)
+            is_new = np.concatenate(new)
+            order = np.lexsort((frame['date'].to_numpy(), frame['ticker'].to_numpy()))
+            yield frame.iloc[order].reset_index(drop=True), is_new[order]
+
+
+@instruments.traced('filter_candidates_chunked')
+def filter_candidates_chunked(store: PartitionedPanel, out_path: str, tickers_per_chunk: int = 200,
+                              days_per_chunk: int = 250,
+                              features: Sequence[CrossSectionalFeature] = CROSS_SECTIONAL_FEATURES,
+                              tickers: Optional[Sequence[str]] = None,
+                              adjustments: Optional[AdjustmentStore] = None) -> int:
+    """Out-of-core filter_candidates: same rows, written to `out_path` (CSV) block by block.
+
+    Pass 1 computes per-ticker indicators block by block and keeps only the source columns of the
+    cross-sectional features (a few floats per row). The per-date ranks / z-scores are computed from those.
+    Pass 2 re-reads the blocks, attaches the precomputed features and runs the filter. Each block carries
+    WARMUP_ROWS earlier rows per ticker so the rolling windows match the in-memory result. Peak memory is
+    bounded by tickers_per_chunk x (days_per_chunk + WARMUP_ROWS) rows plus the compact pass-1 columns.
+
+    With `adjustments` every block is split-adjusted as it is read (as filter_candidates(adjustments=...)).
+    Output rows are ordered by ticker batch, then date block, then (ticker, date). Returns the row count.
+    """
+    tickers = sorted(tickers) if tickers is not None else store.tickers()
+    sources = sorted({feature.column for feature in features})
+
+    # pass 1: per-row date and cross-sectional source values, in block order
+    dates: List[np.ndarray] = []
+    values: Dict[str, List[np.ndarray]] = {column: [] for column in sources}
+    for block, is_new in _blocks(store, tickers, tickers_per_chunk, days_per_chunk, adjustments):
+        indicators = _compute_indicators(block, features=())
+        dates.append(indicators['date'].to_numpy()[is_new])
+        for column in sources:
+            values[column].append(indicators[column].to_numpy(dtype=float)[is_new])
+
+    compact = pd.DataFrame({'date': np.concatenate(dates) if dates else np.array([], dtype='datetime64[ns]')})
+    for column in sources:
+        compact[column] = np.concatenate(values[column]) if dates else np.array([], dtype=float)
+    del dates, values
+    add_cross_sectional(compact, features)
+    feature_values = {feature.name: compact[feature.name].to_numpy() for feature in features}
+    del compact
+
+    # pass 2: filter each block with its slice of the precomputed features
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + '.tmp')
+    offset = 0
+    written = 0
+    header = True
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        for block, is_new in _blocks(store, tickers, tickers_per_chunk, days_per_chunk, adjustments):
+            n_new = int(is_new.sum())
+            for name, column in feature_values.items():
+                block[name] = np.nan
+                block.loc[is_new, name] = column[offset:offset + n_new]
+            offset += n_new
+
+            block['_new'] = is_new
+            candidates = filter_candidates(block, features=())
+            candidates = candidates[candidates.pop('_new')]
+            candidates.to_csv(f, header=header, index=False)
+            header = False
+            written += len(candidates)
+    os.replace(tmp, out)
+    return written
@@ -0,0 +1,87 @@
+"""
+열 버퍼 파일 - DataFrame의 열들을 파일 하나에 연속 배치하고, 작은 레이아웃(dict)으로 위치를 기록
+
+여러 프로세스(gunicorn 워커, Streamlit, 스케줄러)가 같은 파일을 읽기 전용 메모리 맵으로 열면
+운영체제 페이지 캐시 한 벌을 공유하므로, 워커 수가 늘어도 패널 메모리는 늘지 않는다.
+
+숫자/불리언/날짜 열은 그대로, 문자열 열은 범주 코드(int8/16/32) + 범주 목록으로 저장한다.
+"""
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+
+# 열 시작 위치 정렬 (캐시 라인 단위)
+ALIGN = 64
+
+
+def _column_buffer(series: pd.Series):
+    """(저장할 배열, 범주 목록 또는 None)"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_localize(None)
+    values = series.to_numpy()
+    if values.dtype != object and values.dtype.kind in 'biufM':
+        return np.ascontiguousarray(values), None
+    # 문자열 등: 범주 코드로 (결측은 -1)
+    categorical = pd.Categorical(values)
+    return np.ascontiguousarray(categorical.codes), categorical.categories.tolist()
+
+
+def write_column_file(path: str, df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    DataFrame을 열 버퍼 파일 하나로 저장 (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        path: 저장할 파일 경로
+        df: 저장할 DataFrame (인덱스는 저장하지 않음)
+
+    Returns:
+        레이아웃 {"rows", "columns": [{"name", "dtype", "offset", "categories"?}, ...]}
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    columns = []
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            offset = 0
+            for column in df.columns:
+                values, categories = _column_buffer(df[column])
+                padding = -offset % ALIGN
+                f.write(b"\0" * padding)
+                offset += padding
+                entry = {"name": str(column), "dtype": values.dtype.str, "offset": offset}
+                if categories is not None:
+                    entry["categories"] = json.loads(json.dumps(categories, default=str))
+                columns.append(entry)
+                f.write(values.tobytes())
+                offset += values.nbytes
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return {"rows": len(df), "columns": columns}
+
+
+def open_column_file(path: str, layout: Dict[str, Any]) -> pd.DataFrame:
+    """
+    열 버퍼 파일을 읽기 전용 메모리 맵으로 열어 DataFrame으로 (숫자/날짜 열은 복사 없음)
+
+    문자열 열만 프로세스마다 행당 참조 하나씩 만든다 (문자열 자체는 범주 목록을 공유).
+    """
+    rows = layout["rows"]
+    buffer = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else np.empty(0, dtype=np.uint8)
+    data = {}
+    for entry in layout["columns"]:
+        values = np.frombuffer(buffer, dtype=np.dtype(entry["dtype"]), count=rows, offset=entry["offset"])
+        categories = entry.get("categories")
+        if categories is not None:
+            decoded = np.array(categories + [np.nan], dtype=object)
+            values = decoded[values]  # 코드 -1 → 마지막 원소(NaN)
+        data[entry["name"]] = values
+    return pd.DataFrame(data, copy=False)
@@ -4,6 +4,25 @@
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Any
 from enum import Enum
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def column_values(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """validate()의 row.get(name, default)와 같은 규칙으로 열을 배열로 반환"""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=float, na_value=np.nan)
+    return np.full(len(df), default, dtype=float)
+
+
+def fingerprint(condition: Any) -> str:
+    """조건 파라미터의 안정적인 지문 (표시용 name/description 제외)"""
+    params = {k: v for k, v in asdict(condition).items() if k not in ("name", "description")}
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
 
 
 class ConditionType(Enum):
@@ -16,6 +35,35 @@ class ConditionType(Enum):
     SIZE = "size"               # 종목 규모
 
 
+# 조건별 비트 (조건 충족 여부를 정수 하나로 저장: 충족한 조건의 비트 OR)
+CONDITION_BITS = {
+    ConditionType.VOLUME.value: 1,
+    ConditionType.CANDLE.value: 2,
+    ConditionType.CLOSE_POSITION.value: 4,
+    ConditionType.TREND.value: 8,
+    ConditionType.VOLATILITY.value: 16,
+    ConditionType.SIZE.value: 32,
+}
+
+
+def condition_mask(*keys: str) -> int:
+    """조건 키들 → 비트마스크 (예: condition_mask('volume', 'trend') == 9)"""
+    mask = 0
+    for key in keys:
+        mask |= CONDITION_BITS[key]
+    return mask
+
+
+def pack_conditions(detail: Dict[str, bool]) -> int:
+    """{조건 키: 충족 여부} → 비트마스크"""
+    return condition_mask(*(key for key, passed in detail.items() if passed))
+
+
+def unpack_conditions(mask: int) -> Dict[str, bool]:
+    """비트마스크 → {조건 키: 충족 여부} (화면 표시용)"""
+    return {key: bool(mask & bit) for key, bit in CONDITION_BITS.items()}
+
+
 @dataclass
 class VolumeCondition:
     """거래대금 증가 조건"""
@@ -32,6 +80,13 @@ class VolumeCondition:
             return True
         return row.get('volume_ratio', 1.0) >= config.multiplier
 
+    @staticmethod
+    def mask(df: pd.DataFrame, config: 'VolumeCondition') -> np.ndarray:
+        """거래대금 조건 (전체 행 벡터화)"""
+        if not config.enabled:
+            return np.ones(len(df), dtype=bool)
+        return column_values(df, 'volume_ratio', 1.0) >= config.multiplier
+
 
 @dataclass
 class CandleCondition:
@@ -58,6 +113,21 @@ class CandleCondition:
         body_ratio = (close - open_price) / (high - open_price) if high > open_price else 0
         return body_ratio >= config.body_ratio_min
 
+    @staticmethod
+    def mask(df: pd.DataFrame, config: 'CandleCondition') -> np.ndarray:
+        """양봉 조건 (전체 행 벡터화)"""
+        if not config.enabled:
+            return np.ones(len(df), dtype=bool)
+
+        close = column_values(df, 'close', 0)
+        open_price = column_values(df, 'open', 0)
+        high = column_values(df, 'high', 0)
+
+        rising = high > open_price
+        body_ratio = np.zeros(len(df), dtype=float)
+        np.divide(close - open_price, high - open_price, out=body_ratio, where=rising)
+        return ~(close <= open_price) & (body_ratio >= config.body_ratio_min)
+
 
 @dataclass
 class ClosePositionCondition:
@@ -78,6 +148,16 @@ class ClosePositionCondition:
         
         return (close / high) >= config.close_pct
 
+    @staticmethod
+    def mask(df: pd.DataFrame, config: 'ClosePositionCondition') -> np.ndarray:
+        """종가 위치 조건 (전체 행 벡터화)"""
+        if not config.enabled:
+            return np.ones(len(df), dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = column_values(df, 'close', 0) / column_values(df, 'high', 1)
+        return ratio >= config.close_pct
+
 
 @dataclass
 class TrendCondition:
@@ -113,6 +193,19 @@ class TrendCondition:
         # 활성화된 조건 중 하나라도 만족하면 True
         return any(results) if results else True
 
+    @staticmethod
+    def mask(df: pd.DataFrame, config: 'TrendCondition') -> np.ndarray:
+        """추세 조건 (전체 행 벡터화, OR 조건)"""
+        if not config.enabled or not (config.ma_enabled or config.breakout_enabled):
+            return np.ones(len(df), dtype=bool)
+
+        result = np.zeros(len(df), dtype=bool)
+        if config.ma_enabled:
+            result |= column_values(df, 'close', 0) >= column_values(df, f'ma{config.ma_period}', 0)
+        if config.breakout_enabled:
+            result |= column_values(df, 'high', 0) >= column_values(df, f'high_max_{config.breakout_period}', 0)
+        return result
+
 
 @dataclass
 class VolatilityCondition:
@@ -132,6 +225,13 @@ class VolatilityCondition:
         volatility = row.get('volatility', 0)
         return volatility >= config.min_volatility
 
+    @staticmethod
+    def mask(df: pd.DataFrame, config: 'VolatilityCondition') -> np.ndarray:
+        """변동성 조건 (전체 행 벡터화)"""
+        if not config.enabled:
+            return np.ones(len(df), dtype=bool)
+        return column_values(df, 'volatility', 0) >= config.min_volatility
+
 
 @dataclass
 class SizeCondition:
@@ -142,6 +242,7 @@ class SizeCondition:
     market_cap_max: int = 1_000_000_000_000  # 1조
     price_min: int = 3_000
     price_max: int = 50_000
+    required: bool = False  # True면 규모 조건은 필수 (불통과 종목은 결과에서 제외, 로드 전 사전 필터 허용)
     description: str = "유동성 및 리스크 관리 (시가총액 1000억~1조, 주가 3000~50000원)"
 
     @staticmethod
@@ -158,6 +259,19 @@ class SizeCondition:
         
         return cap_ok and price_ok
 
+    @staticmethod
+    def mask(df: pd.DataFrame, config: 'SizeCondition') -> np.ndarray:
+        """종목 규모 조건 (전체 행 벡터화)"""
+        if not config.enabled:
+            return np.ones(len(df), dtype=bool)
+
+        market_cap = column_values(df, 'market_cap', 0)
+        price = column_values(df, 'close', 0)
+
+        cap_ok = (config.market_cap_min <= market_cap) & (market_cap <= config.market_cap_max)
+        price_ok = (config.price_min <= price) & (price <= config.price_max)
+        return cap_ok & price_ok
+
 
 @dataclass
 class BacktestConfig:
@@ -206,6 +320,10 @@ class SearchConfig:
         """활성화된 조건만 반환"""
         return {k: v for k, v in self.get_conditions_dict().items() if v.enabled}
 
+    def condition_fingerprints(self) -> Dict[str, str]:
+        """조건별 파라미터 지문 (파라미터가 같으면 항상 같은 값)"""
+        return {k: fingerprint(v) for k, v in self.get_conditions_dict().items()}
+
 
 # 기본 설정 인스턴스
 DEFAULT_CONFIG = SearchConfig()
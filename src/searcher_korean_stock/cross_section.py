@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instruments
+
+
+@dataclass(frozen=True)
+class CrossSectionalFeature:
+    name: str               # output column
+    column: str             # source column
+    kind: str = 'pct'       # 'rank', 'pct', 'zscore' or 'rel_median'
+    method: str = 'average' # tie handling for rank / pct: 'average', 'min' or 'max' (as in pandas rank)
+
+
+# per-date features added by _compute_indicators
+CROSS_SECTIONAL_FEATURES: List[CrossSectionalFeature] = [
+    CrossSectionalFeature('amount_rank_pct', 'amount', 'pct', method='max'),
+    CrossSectionalFeature('prev_change_rank_pct', 'prev_change', 'pct'),
+    CrossSectionalFeature('range_avg10_z', 'range_avg10', 'zscore'),
+    CrossSectionalFeature('rel_volume', 'volume', 'rel_median'),
+]
+
+KINDS = ('rank', 'pct', 'zscore', 'rel_median')
+
+
+class _SortedGroups:
+    """One column sorted within date groups (NaN dropped); every statistic reads from this one sort."""
+
+    def __init__(self, values: np.ndarray, codes: np.ndarray, n_groups: int):
+        valid = np.flatnonzero(~np.isnan(values) & (codes >= 0))
+        order = valid[np.lexsort((values[valid], codes[valid]))]
+        self.rows = order
+        self.values = values[order]
+        self.codes = codes[order]
+        self.counts = np.bincount(self.codes, minlength=n_groups)
+        self.starts = np.r_[0, np.cumsum(self.counts)[:-1]]
+
+    def ranks(self, method: str) -> np.ndarray:
+        n = len(self.values)
+        new_run = np.r_[True, (self.codes[1:] != self.codes[:-1]) | (self.values[1:] != self.values[:-1])]
+        run_id = np.cumsum(new_run) - 1
+        run_first = np.flatnonzero(new_run)
+        run_last = np.r_[run_first[1:], n] - 1
+        base = self.starts[self.codes]
+        low = run_first[run_id] - base + 1
+        high = run_last[run_id] - base + 1
+        if method == 'min':
+            return low.astype(float)
+        if method == 'max':
+            return high.astype(float)
+        return (low + high) / 2
+
+    def group_mean_std(self):
+        counts = self.counts.astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(self.codes, weights=self.values, minlength=len(counts)) / counts
+            sq = np.bincount(self.codes, weights=(self.values - mean[self.codes]) ** 2, minlength=len(counts))
+            std = np.sqrt(sq / (counts - 1))
+        return mean, std
+
+    def group_median(self) -> np.ndarray:
+        median = np.full(len(self.counts), np.nan)
+        has = self.counts > 0
+        lo = self.starts[has] + (self.counts[has] - 1) // 2
+        hi = self.starts[has] + self.counts[has] // 2
+        median[has] = (self.values[lo] + self.values[hi]) / 2
+        return median
+
+
+@instruments.traced('cross_sectional_features')
+def add_cross_sectional(df: pd.DataFrame, features: Sequence[CrossSectionalFeature] = CROSS_SECTIONAL_FEATURES,
+                        by: str = 'date') -> pd.DataFrame:
+    """Add per-date ranks / percentiles / z-scores / relative-to-median columns to df (in place).
+
+    Groups are factorized once and each source column is sorted once; all features of that column
+    are read from the sorted values, so extra features cost only O(n) arithmetic.
+    Matches groupby(by)[column].rank(pct=..., method=...), (x - mean) / std (ddof=1) and x / median.
+    """
+    codes, groups = pd.factorize(df[by], sort=True)
+    codes = codes.astype(np.int64)
+    n = len(df)
+
+    by_column: Dict[str, List[CrossSectionalFeature]] = {}
+    for feature in features:
+        if feature.kind not in KINDS:
+            raise ValueError(f"unknown cross-sectional feature kind: {feature.kind}")
+        by_column.setdefault(feature.column, []).append(feature)
+
+    for column, column_features in by_column.items():
+        values = df[column].to_numpy(dtype=float)
+        sorted_groups = _SortedGroups(values, codes, len(groups))
+        ranks_by_method = {}
+        stats = {}
+        for feature in column_features:
+            out = np.full(n, np.nan)
+            if feature.kind in ('rank', 'pct'):
+                if feature.method not in ranks_by_method:
+                    ranks_by_method[feature.method] = sorted_groups.ranks(feature.method)
+                ranks = ranks_by_method[feature.method]
+                if feature.kind == 'pct':
+                    ranks = ranks / sorted_groups.counts[sorted_groups.codes]
+                out[sorted_groups.rows] = ranks
+            elif feature.kind == 'zscore':
+                if 'mean_std' not in stats:
+                    stats['mean_std'] = sorted_groups.group_mean_std()
+                mean, std = stats['mean_std']
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out[sorted_groups.rows] = (sorted_groups.values - mean[sorted_groups.codes]) / std[sorted_groups.codes]
+            else:
+                if 'median' not in stats:
+                    stats['median'] = sorted_groups.group_median()
+                median = stats['median']
+                valid = codes >= 0
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out[valid] = values[valid] / median[codes[valid]]
+            df[feature.name] = out
+    return df
@@ -8,6 +8,16 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import pickle
 import os
+import tempfile
+
+from .adjustments import AdjustmentStore, split_ratio
+from .config import SizeCondition
+from .http_session import CachedSession
+from .instrumentation import instruments
+from .kernels import rolling_max, rolling_min
+from .locking import FileLock, SingleFlight
+from .symbols import SymbolMaster, symbols as default_symbols
+from .universe import UniverseMaster, universe as default_universe
 
 
 class KoreanStockDataLoader:
@@ -18,32 +28,31 @@ class KoreanStockDataLoader:
         '005930.KS',  # Samsung Electronics
         '000660.KS',  # SK Hynix
         '051910.KS',  # LG Chem
-        '207940.KS',  # SM C&C
+        '207940.KS',  # Samsung Biologics
         '006400.KS',  # Samsung SDI
         '035720.KS',  # Kakao
-        '012330.KS',  # Hyundai Motor
-        '005380.KS',  # Hyundai Motor Finance
+        '012330.KS',  # Hyundai Mobis
+        '005380.KS',  # Hyundai Motor
         '055550.KS',  # Shinhan Financial
         '032830.KS',  # Samsung Life Insurance
     ]
     
-    # 종목명 매핑
-    STOCK_NAMES = {
-        '005930.KS': 'Samsung Electronics',
-        '000660.KS': 'SK Hynix',
-        '051910.KS': 'LG Chem',
-        '207940.KS': 'SM C&C',
-        '006400.KS': 'Samsung SDI',
-        '035720.KS': 'Kakao',
-        '012330.KS': 'Hyundai Motor',
-        '005380.KS': 'Hyundai Motor Finance',
-        '055550.KS': 'Shinhan Financial',
-        '032830.KS': 'Samsung Life Insurance',
-    }
-    
-    def __init__(self, cache_dir: str = ".cache"):
+    # 유니버스 마스터에 없는 종목의 시가총액 기본값
+    DEFAULT_MARKET_CAP = 1_000_000_000_000
+    
+    def __init__(self, cache_dir: str = ".cache", universe: UniverseMaster = None,
+                 symbols: SymbolMaster = None, adjustments: AdjustmentStore = None,
+                 http: CachedSession = None):
         """초기화"""
         self.cache_dir = cache_dir
+        self.universe = universe or default_universe
+        self.symbols = symbols or default_symbols
+        # 원시 OHLCV 캐시 옆에 종목별 누적 조정 계수 저장
+        self.adjustments = adjustments or AdjustmentStore(os.path.join(cache_dir, "adjustments.json"))
+        # 같은 종목을 동시에 요청하면 한 번만 받음 (프로세스 안)
+        self._flights = SingleFlight()
+        # 모든 yfinance 요청이 공유하는 연결 풀 + 조건부 응답 캐시
+        self.http = http or CachedSession(os.path.join(cache_dir, "http"))
         os.makedirs(cache_dir, exist_ok=True)
     
     def get_cache_path(self, ticker: str, days: int) -> str:
@@ -51,6 +60,7 @@ class KoreanStockDataLoader:
         filename = f"{ticker.replace('.', '_')}_{days}d.pkl"
         return os.path.join(self.cache_dir, filename)
     
+    @instruments.traced('load_stock_data')
     def load_stock_data(self, ticker: str, days: int = 60, use_cache: bool = True) -> Optional[pd.DataFrame]:
         """
         단일 종목 데이터 로드
@@ -65,22 +75,73 @@ class KoreanStockDataLoader:
         """
         cache_path = self.get_cache_path(ticker, days)
         
-        # 캐시 확인
-        if use_cache and os.path.exists(cache_path):
-            try:
-                df = pd.read_pickle(cache_path)
-                # 캐시가 오늘 생성된 경우만 사용
-                if (datetime.now() - datetime.fromtimestamp(os.path.getmtime(cache_path))).days == 0:
-                    return df
-            except Exception as e:
-                print(f"캐시 로드 실패 {ticker}: {e}")
+        # 캐시 확인 (캐시 파일은 항상 통째로 교체되므로 잠금 없이 읽어도 깨진 파일을 보지 않음)
+        if use_cache:
+            df = self._read_cache(ticker, cache_path)
+            if df is not None:
+                instruments.count('loader_cache_hit')
+                return df
         
+        # 같은 캐시 파일을 향한 동시 요청은 하나만 실제로 받고 나머지는 그 결과를 공유
+        df, shared = self._flights.do(cache_path, lambda: self._fetch_locked(ticker, days, cache_path, use_cache))
+        if shared:
+            instruments.count('loader_singleflight_shared')
+        return df
+    
+    def _read_cache(self, ticker: str, cache_path: str) -> Optional[pd.DataFrame]:
+        """오늘 생성된 캐시만 반환 (없거나 오래되었거나 읽기 실패면 None)"""
+        try:
+            mtime = os.path.getmtime(cache_path)
+        except OSError:
+            return None
+        # 캐시가 오늘 생성된 경우만 사용
+        if (datetime.now() - datetime.fromtimestamp(mtime)).days != 0:
+            return None
+        try:
+            return pd.read_pickle(cache_path)
+        except Exception as e:
+            print(f"캐시 로드 실패 {ticker}: {e}")
+            return None
+    
+    def _write_cache(self, ticker: str, df: pd.DataFrame, cache_path: str) -> None:
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽은 이전 파일 또는 완성된 새 파일만 봄)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"캐시 저장 실패 {ticker}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _fetch_locked(self, ticker: str, days: int, cache_path: str, use_cache: bool) -> Optional[pd.DataFrame]:
+        """
+        프로세스 간 잠금을 잡고 로드 (다른 프로세스가 먼저 받았으면 그 캐시를 사용)
+        """
+        # 잠금 파일은 캐시 파일 옆이 아닌 별도 디렉터리에 (.gitignore 대상)
+        lock_path = os.path.join(self.cache_dir, "locks", os.path.basename(cache_path) + ".lock")
+        with FileLock(lock_path):
+            if use_cache:
+                df = self._read_cache(ticker, cache_path)
+                if df is not None:
+                    instruments.count('loader_cache_hit')
+                    return df
+            
+            instruments.count('loader_cache_miss')
+            df = self._download(ticker, days)
+            if df is not None:
+                self._write_cache(ticker, df, cache_path)
+            return df
+    
+    def _download(self, ticker: str, days: int) -> Optional[pd.DataFrame]:
+        """yfinance에서 OHLCV 로드 (실패하거나 비어 있으면 None)"""
         try:
             # yfinance에서 데이터 로드
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            df = yf.download(ticker, start=start_date, end=end_date, progress=False)
+            df = yf.download(ticker, start=start_date, end=end_date, progress=False, session=self.http)
             
             if df.empty:
                 return None
@@ -105,25 +166,21 @@ class KoreanStockDataLoader:
             if df.empty:
                 return None
             
-            # 캐시 저장
-            try:
-                df.to_pickle(cache_path)
-            except:
-                pass
-            
             return df
             
         except Exception as e:
             print(f"데이터 로드 실패 {ticker}: {e}")
             return None
     
-    def load_multiple_stocks(self, tickers: List[str] = None, days: int = 60) -> Dict[str, pd.DataFrame]:
+    def load_multiple_stocks(self, tickers: List[str] = None, days: int = 60,
+                             size: SizeCondition = None) -> Dict[str, pd.DataFrame]:
         """
         여러 종목 데이터 로드
         
         Args:
             tickers: 종목 코드 리스트 (None이면 기본 종목 사용)
             days: 로드할 데이터 기간
+            size: 종목 규모 조건 (required인 규모 조건이면 유니버스 마스터로 통과 불가 종목을 로드 전에 제외)
         
         Returns:
             {ticker: DataFrame} 딕셔너리
@@ -131,6 +188,9 @@ class KoreanStockDataLoader:
         if tickers is None:
             tickers = self.SAMPLE_TICKERS
         
+        if size is not None:
+            tickers = self.universe.prefilter(size, tickers)
+        
         data = {}
         for ticker in tickers:
             df = self.load_stock_data(ticker, days)
@@ -139,6 +199,7 @@ class KoreanStockDataLoader:
         
         return data
     
+    @instruments.traced('add_technical_indicators')
     def add_technical_indicators(self, df: pd.DataFrame, ticker: str = None) -> pd.DataFrame:
         """
         기술적 지표 추가
@@ -166,12 +227,14 @@ class KoreanStockDataLoader:
             df[f'ma{period}'] = df['close'].rolling(window=period).mean()
         
         # 고점 롤링 (20일)
-        df['high_max_20'] = df['high'].rolling(window=20).max()
-        df['high_max_10'] = df['high'].rolling(window=10).max()
+        high = df['high'].to_numpy(dtype=float)
+        df['high_max_20'] = rolling_max(high, 20)
+        df['high_max_10'] = rolling_max(high, 10)
         
         # 저점 롤링 (20일)
-        df['low_min_20'] = df['low'].rolling(window=20).min()
-        df['low_min_10'] = df['low'].rolling(window=10).min()
+        low = df['low'].to_numpy(dtype=float)
+        df['low_min_20'] = rolling_min(low, 20)
+        df['low_min_10'] = rolling_min(low, 10)
         
         # 일변동률
         df['daily_change'] = (df['high'] - df['low']) / df['close']
@@ -180,60 +243,144 @@ class KoreanStockDataLoader:
         df['volatility'] = df['daily_change'].rolling(window=10).mean()
         df['volatility'] = df['volatility'].fillna(0)
         
-        # 다음날 고가 (백테스트용)
+        # 다음날 고가/저가 (백테스트용)
         df['next_high'] = df['high'].shift(-1)
+        df['next_low'] = df['low'].shift(-1)
         
-        # 시가총액 추정 (실제는 외부 데이터가 필요하지만 근사값 사용)
-        df['market_cap'] = 1_000_000_000_000  # 기본값 1조 (실제는 API에서 조회 필요)
+        # 시가총액 = 종가 × 상장주식수 (유니버스 마스터에 없으면 기본값)
+        shares = self.universe.shares_outstanding(ticker) if ticker else None
+        if shares is not None:
+            df['market_cap'] = df['close'] * shares
+        else:
+            df['market_cap'] = self.DEFAULT_MARKET_CAP
         
         return df
     
-    def prepare_data(self, days: int = 60, tickers: List[str] = None) -> Dict[str, pd.DataFrame]:
+    def update_splits(self, ticker: str) -> int:
+        """
+        yfinance의 액면분할/병합 이력을 조정 계수에 반영 (새 이벤트만 추가)
+        
+        Returns:
+            추가한 이벤트 수
+        """
+        try:
+            splits = yf.Ticker(ticker, session=self.http).splits
+        except Exception as e:
+            print(f"분할 이력 조회 실패 {ticker}: {e}")
+            return 0
+        
+        known = set(self.adjustments.ex_dates(ticker))
+        added = 0
+        for ex_date, shares_ratio in splits.items():
+            day = pd.Timestamp(ex_date).tz_localize(None).normalize()
+            if day.date() in known or not shares_ratio:
+                continue
+            self.adjustments.add_action(ticker, day, split_ratio(1.0, float(shares_ratio)))
+            added += 1
+        return added
+    
+    def update_all_splits(self, tickers: List[str] = None) -> int:
+        """
+        여러 종목의 분할/병합 이력 갱신 (장 마감 후 스냅샷 빌드 전에 호출)
+        
+        Args:
+            tickers: 종목 코드 리스트 (None이면 기본 종목 사용)
+        
+        Returns:
+            추가한 이벤트 수 합계
+        """
+        if tickers is None:
+            tickers = self.SAMPLE_TICKERS
+        return sum(self.update_splits(ticker) for ticker in tickers)
+    
+    def prepare_data(self, days: int = 60, tickers: List[str] = None,
+                     size: SizeCondition = None, adjusted: bool = True) -> Dict[str, pd.DataFrame]:
         """
         검색기용 데이터 준비
         
         Args:
             days: 조회 기간
             tickers: 종목 코드 리스트
+            size: 종목 규모 조건 (required일 때만 로드 전 사전 필터에 사용)
+            adjusted: 수정주가 사용 여부 (분할/증자 전후 가격을 같은 기준으로 맞춤)
         
         Returns:
             {ticker: prepared_dataframe} 딕셔너리
         """
         # 데이터 로드
-        data = self.load_multiple_stocks(tickers, days)
+        data = self.load_multiple_stocks(tickers, days, size)
         
         # 기술적 지표 추가
         prepared_data = {}
         for ticker, df in data.items():
+            if adjusted:
+                df = self.adjustments.adjust(df, ticker)
             prepared_df = self.add_technical_indicators(df, ticker)
             prepared_data[ticker] = prepared_df
         
         return prepared_data
     
-    def get_today_candidates(self, tickers: List[str] = None) -> pd.DataFrame:
+    def stock_names(self, tickers: List[str]) -> List[str]:
+        """종목 코드 → 종목명 일괄 변환 (종목 마스터 → 유니버스 스냅샷 → 코드 순으로 대체)"""
+        tickers = list(tickers)
+        names = self.symbols.names_for(tickers)
+        fallback = self.universe.names()
+        return [fallback.get(t, t) if name == t else name for t, name in zip(tickers, names)]
+    
+    def to_panel(self, data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        종목별 데이터를 (날짜, 종목) 행의 패널 하나로 합치기 (히스토리 재현용)
+        
+        Args:
+            data: prepare_data 결과 {ticker: DataFrame}
+        
+        Returns:
+            date, ticker, stock_name 열이 추가된 DataFrame
+        """
+        names = dict(zip(data.keys(), self.stock_names(list(data.keys()))))
+        frames = []
+        for ticker, df in data.items():
+            if len(df) == 0:
+                continue
+            dates = df.index
+            if isinstance(dates, pd.DatetimeIndex):
+                dates = dates.tz_localize(None).normalize()
+            frame = df.reset_index(drop=True)
+            frame['date'] = dates
+            frame['ticker'] = ticker
+            frame['stock_name'] = names[ticker]
+            frames.append(frame)
+        
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+    
+    def get_today_candidates(self, tickers: List[str] = None,
+                             size: SizeCondition = None) -> pd.DataFrame:
         """
         오늘 데이터 기반 전체 종목 반환 (검색용)
         
         Args:
             tickers: 종목 코드 리스트
+            size: 종목 규모 조건 (로드 전 사전 필터용)
         
         Returns:
             모든 종목의 최신 데이터를 행으로 하는 DataFrame
         """
-        data = self.prepare_data(days=60, tickers=tickers)
+        data = self.prepare_data(days=60, tickers=tickers, size=size)
         
         records = []
         for ticker, df in data.items():
             if len(df) > 0:
                 latest = df.iloc[-1].to_dict()
                 latest['ticker'] = ticker
-                latest['stock_name'] = self.STOCK_NAMES.get(ticker, ticker)
                 records.append(latest)
         
         if not records:
             return pd.DataFrame()
         
         result_df = pd.DataFrame(records)
+        result_df['stock_name'] = self.stock_names(result_df['ticker'])
         return result_df
 
 
@@ -3,11 +3,16 @@
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Any, Optional
 from dataclasses import dataclass
 
 from .config import SearchConfig, VolumeCondition, CandleCondition, ClosePositionCondition, \
-    TrendCondition, VolatilityCondition, SizeCondition
+    TrendCondition, VolatilityCondition, SizeCondition, CONDITION_BITS, column_values
+from .instrumentation import instruments
+from .funnel import FunnelReport, funnel_report
+from .intraday import MinuteBarStore
+from .kernels import compound
 
 
 @dataclass
@@ -18,16 +23,235 @@ class SearchResult:
     close: float
     next_high: float
     conditions_met: int  # 충족한 조건 개수
-    conditions_detail: Dict[str, bool]  # 각 조건별 충족 여부
+    conditions_mask: int  # 충족한 조건의 비트마스크 (config.CONDITION_BITS)
     score: float = 0.0  # 가중 점수
+    next_low: float = np.nan  # 다음날 저가 (분봉 판정용)
+
+
+# 조건 키 → 조건 클래스 (SearchConfig.get_conditions_dict 순서와 동일)
+CONDITION_CLASSES = {
+    'volume': VolumeCondition,
+    'candle': CandleCondition,
+    'close': ClosePositionCondition,
+    'trend': TrendCondition,
+    'volatility': VolatilityCondition,
+    'size': SizeCondition,
+}
+
+
+def data_version(df: pd.DataFrame) -> str:
+    """데이터프레임 내용 기반 버전 문자열"""
+    if df.empty:
+        return "empty"
+    hashed = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return f"{len(df)}:{int(hashed.sum(dtype=np.uint64))}"
+
+
+class ThresholdIndex:
+    """
+    조건 특징값 정렬 배열 (임계값별 통과 종목 수를 이진 탐색으로 계산)
+    
+    같은 스냅샷에서는 한 번만 만들고, 슬라이더 값마다 검색 없이 개수만 조회한다.
+    """
+
+    # 특징 이름 → 해당 특징을 쓰는 조건 키
+    FEATURES = {
+        'volume_ratio': 'volume',
+        'close_ratio': 'close',
+        'volatility': 'volatility',
+        'price': 'size',
+        'market_cap': 'size',
+    }
+
+    # 보관할 최대 결합 정렬 배열 개수 (다른 조건 슬라이더 위치별로 하나씩 쌓임)
+    JOINT_CACHE_SIZE = 64
+
+    def __init__(self, df: pd.DataFrame):
+        """특징값 계산 및 정렬"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            close_ratio = column_values(df, 'close', 0) / column_values(df, 'high', 1)
+
+        self.size = len(df)
+        self.values = {
+            'volume_ratio': column_values(df, 'volume_ratio', 1.0),
+            'close_ratio': close_ratio,
+            'volatility': column_values(df, 'volatility', 0),
+            'price': column_values(df, 'close', 0),
+            'market_cap': column_values(df, 'market_cap', 0),
+        }
+        self.sorted = {k: self._sorted(v) for k, v in self.values.items()}
+        # (특징, 다른 조건 지문) → 다른 조건을 모두 통과한 행의 정렬 배열
+        self._joint_sorted: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def _sorted(values: np.ndarray) -> np.ndarray:
+        # NaN은 어떤 비교도 통과하지 못하므로 제외
+        return np.sort(values[~np.isnan(values)])
+
+    @staticmethod
+    def _count(sorted_values: np.ndarray, low: float, high: float) -> int:
+        """low <= 값 <= high 인 개수"""
+        return int(np.searchsorted(sorted_values, high, side='right')
+                   - np.searchsorted(sorted_values, low, side='left'))
+
+    def count(self, feature: str, low: float = -np.inf, high: float = np.inf) -> int:
+        """단일 특징 기준 통과 개수"""
+        return self._count(self.sorted[feature], low, high)
+
+    def joint_count(self, feature: str, low: float, high: float,
+                    others: np.ndarray, key: Tuple) -> int:
+        """
+        다른 조건을 모두 통과한 행 중 특징 기준 통과 개수
+        
+        Args:
+            feature: 특징 이름
+            low, high: 통과 범위 (양 끝 포함)
+            others: 다른 조건을 모두 통과한 행 마스크
+            key: others를 식별하는 키 (같은 키면 정렬 배열 재사용)
+        """
+        cache_key = (feature, key)
+        sorted_values = self._joint_sorted.get(cache_key)
+        if sorted_values is None:
+            sorted_values = self._sorted(self.values[feature][others])
+            self._joint_sorted[cache_key] = sorted_values
+            if len(self._joint_sorted) > self.JOINT_CACHE_SIZE:
+                self._joint_sorted.popitem(last=False)
+        else:
+            self._joint_sorted.move_to_end(cache_key)
+        return self._count(sorted_values, low, high)
 
 
 class DayTradeSearchEngine:
     """다음날 +1% 상승 가능성 검색 엔진"""
+
+    # 캐시할 최대 마스크 개수 (슬라이더 위치별로 하나씩 쌓임)
+    MASK_CACHE_SIZE = 256
     
     def __init__(self, config: SearchConfig = None):
         """초기화"""
         self.config = config or SearchConfig()
+        # (데이터 버전, 조건 키, 조건 지문) → 불리언 마스크
+        self._mask_cache: "OrderedDict[Tuple[str, str, str], np.ndarray]" = OrderedDict()
+        self._cached_version: Optional[str] = None
+        self._threshold_index: Optional[ThresholdIndex] = None
+
+    def condition_masks(self, df: pd.DataFrame, config: SearchConfig = None,
+                        version: str = None) -> Dict[str, np.ndarray]:
+        """
+        조건별 불리언 마스크 계산 (파라미터가 바뀐 조건만 다시 계산)
+        
+        Args:
+            df: 종목 데이터
+            config: 검색 설정 (None이면 self.config 사용)
+            version: 데이터 버전 (None이면 내용으로 계산)
+        
+        Returns:
+            {조건 키: 행별 충족 여부 배열}
+        """
+        config = config or self.config
+        version = version or data_version(df)
+
+        # 데이터가 바뀌면 이전 버전의 마스크는 버림
+        if version != self._cached_version:
+            self._mask_cache.clear()
+            self._threshold_index = None
+            self._cached_version = version
+
+        conditions = config.get_conditions_dict()
+        fingerprints = config.condition_fingerprints()
+
+        masks = {}
+        for key, condition in conditions.items():
+            cache_key = (version, key, fingerprints[key])
+            mask = self._mask_cache.get(cache_key)
+            if mask is None:
+                instruments.count('mask_cache_miss')
+                mask = CONDITION_CLASSES[key].mask(df, condition)
+                self._mask_cache[cache_key] = mask
+                if len(self._mask_cache) > self.MASK_CACHE_SIZE:
+                    self._mask_cache.popitem(last=False)
+            else:
+                instruments.count('mask_cache_hit')
+                self._mask_cache.move_to_end(cache_key)
+            masks[key] = mask
+
+        return masks
+
+    def clear_cache(self) -> None:
+        """마스크 캐시 비우기"""
+        self._mask_cache.clear()
+        self._threshold_index = None
+        self._cached_version = None
+
+    def funnel_report(self, df: pd.DataFrame, config: SearchConfig = None,
+                      version: str = None) -> FunnelReport:
+        """
+        6가지 조건의 퍼널 리포트 (캐시된 조건 마스크로 계산)
+        
+        Args:
+            df: 종목 데이터 ('date' 열이 있으면 날짜별로 집계)
+            config: 검색 설정 (None이면 self.config 사용)
+            version: 데이터 버전
+        
+        Returns:
+            FunnelReport (단독 탈락 = 나머지 5개 조건은 충족하고 이 조건만 불충족)
+        """
+        masks = self.condition_masks(df, config, version)
+        dates = df['date'] if 'date' in df.columns else None
+        return funnel_report(masks, dates)
+
+    def pass_counts(self, df: pd.DataFrame, config: SearchConfig = None,
+                    version: str = None) -> Dict[str, Dict[str, int]]:
+        """
+        현재 임계값 기준 특징별 통과 종목 수 (검색 없이 이진 탐색으로 계산)
+        
+        Args:
+            df: 종목 데이터
+            config: 검색 설정 (None이면 self.config 사용)
+            version: 데이터 버전
+        
+        Returns:
+            {특징 이름: {'pass': 단독 통과 수, 'joint': 다른 활성 조건과 동시 통과 수}}
+        """
+        config = config or self.config
+        masks = self.condition_masks(df, config, version)
+        if self._threshold_index is None:
+            self._threshold_index = ThresholdIndex(df)
+        index = self._threshold_index
+
+        fingerprints = config.condition_fingerprints()
+        size = config.size
+        bounds = {
+            'volume_ratio': (config.volume.multiplier, np.inf),
+            'close_ratio': (config.close.close_pct, np.inf),
+            'volatility': (config.volatility.min_volatility, np.inf),
+            'price': (size.price_min, size.price_max),
+            'market_cap': (size.market_cap_min, size.market_cap_max),
+        }
+
+        counts = {}
+        for feature, owner in ThresholdIndex.FEATURES.items():
+            low, high = bounds[feature]
+            others = np.ones(index.size, dtype=bool)
+            key = tuple(fp for k, fp in fingerprints.items() if k != owner)
+            for k, mask in masks.items():
+                if k != owner:
+                    others &= mask
+
+            # 규모 조건은 가격/시가총액 두 축이므로 다른 축의 현재 범위를 함께 적용
+            if owner == 'size' and size.enabled:
+                other_feature = 'market_cap' if feature == 'price' else 'price'
+                other_low, other_high = bounds[other_feature]
+                other_values = index.values[other_feature]
+                others &= (other_low <= other_values) & (other_values <= other_high)
+                key += (other_low, other_high)
+
+            counts[feature] = {
+                'pass': index.count(feature, low, high),
+                'joint': index.joint_count(feature, low, high, others, key),
+            }
+
+        return counts
     
     def evaluate_single_row(self, row: Dict[str, Any], config: SearchConfig) -> Tuple[int, Dict[str, bool], float]:
         """
@@ -85,39 +309,141 @@ class DayTradeSearchEngine:
         
         return conditions_met, conditions_detail, score
     
-    def search(self, df: pd.DataFrame, config: SearchConfig = None) -> List[SearchResult]:
+    def search(self, df: pd.DataFrame, config: SearchConfig = None,
+               version: str = None) -> List[SearchResult]:
         """
         종목 리스트에서 조건을 만족하는 종목 검색
         
         Args:
             df: 종목 데이터 (열: ticker, stock_name, close, next_high, 기술적 지표 등)
             config: 검색 설정 (None이면 self.config 사용)
+            version: 데이터 버전 (같은 데이터로 반복 검색 시 지정하면 해시 계산 생략)
         
         Returns:
             SearchResult 리스트 (점수 순 정렬)
         """
         config = config or self.config
+        if df.empty:
+            return []
+
+        masks = self.condition_masks(df, config, version)
+        keys = list(masks.keys())
+        matrix = np.column_stack([masks[k] for k in keys])
+
+        # 충족 조건 개수 / 비트마스크
+        conditions_met = matrix.sum(axis=1)
+        bits = np.array([CONDITION_BITS[k] for k in keys], dtype=np.int64)
+        condition_masks = matrix.astype(np.int64) @ bits
+
+        # 점수 계산
+        if config.scoring_enabled:
+            weights = np.array([config.weights.get(k, 0) for k in keys], dtype=float)
+            scores = matrix.astype(float) @ weights
+        else:
+            scores = conditions_met / len(keys)
+
+        # 점수 순 정렬 (동점이면 조건 개수, 그 다음 원래 순서)
+        order = np.lexsort((-conditions_met, -scores))
+        if config.size.enabled and config.size.required:
+            # 필수 규모 조건: 다른 조건 충족 개수와 관계없이 불통과 종목 제외
+            order = order[masks['size'][order]]
+
+        def column(name: str, default: Any) -> list:
+            if name in df.columns:
+                return df[name].tolist()
+            return [default] * len(df)
+
+        tickers = column('ticker', '')
+        names = column('stock_name', '')
+        closes = column('close', 0)
+        next_highs = column('next_high', 0)
+        next_lows = column('next_low', np.nan)
+
         results = []
-        
-        for _, row in df.iterrows():
-            conditions_met, conditions_detail, score = self.evaluate_single_row(row.to_dict(), config)
-            
-            result = SearchResult(
-                ticker=row.get('ticker', ''),
-                stock_name=row.get('stock_name', ''),
-                close=row.get('close', 0),
-                next_high=row.get('next_high', 0),
-                conditions_met=conditions_met,
-                conditions_detail=conditions_detail,
-                score=score
-            )
-            results.append(result)
-        
-        # 점수 순 정렬
-        results.sort(key=lambda x: (-x.score, -x.conditions_met))
+        for i in order:
+            results.append(SearchResult(
+                ticker=tickers[i],
+                stock_name=names[i],
+                close=closes[i],
+                next_high=next_highs[i],
+                conditions_met=int(conditions_met[i]),
+                conditions_mask=int(condition_masks[i]),
+                score=float(scores[i]),
+                next_low=next_lows[i]
+            ))
         
         return results
     
+    def replay(self, panel: pd.DataFrame, config: SearchConfig = None, top_n: int = 5,
+               min_conditions: int = 0, version: str = None) -> pd.DataFrame:
+        """
+        히스토리 재현: 패널의 모든 (날짜, 종목) 행에 검색을 한 번에 적용하고 날짜별 상위 N개 선택
+        
+        날짜별 순서는 그날 데이터로 search()를 돌린 것과 같다 (점수, 조건 개수, 원래 순서).
+        
+        Args:
+            panel: date 열이 있는 종목 데이터 (loader.to_panel 결과)
+            config: 검색 설정 (None이면 self.config 사용)
+            top_n: 날짜별 선택 종목 수
+            min_conditions: 최소 충족 조건 개수
+            version: 데이터 버전 (같은 패널로 반복 재현 시 지정하면 해시 계산 생략)
+        
+        Returns:
+            날짜별 상위 종목 DataFrame
+            (date, rank, ticker, stock_name, close, next_high, next_low, conditions_met, conditions_mask, score)
+        """
+        config = config or self.config
+        columns = ['date', 'rank', 'ticker', 'stock_name', 'close', 'next_high', 'next_low',
+                   'conditions_met', 'conditions_mask', 'score']
+        if panel.empty:
+            return pd.DataFrame(columns=columns)
+
+        masks = self.condition_masks(panel, config, version)
+        keys = list(masks.keys())
+        matrix = np.column_stack([masks[k] for k in keys])
+        conditions_met = matrix.sum(axis=1)
+        bits = np.array([CONDITION_BITS[k] for k in keys], dtype=np.int64)
+        condition_masks = matrix.astype(np.int64) @ bits
+        if config.scoring_enabled:
+            weights = np.array([config.weights.get(k, 0) for k in keys], dtype=float)
+            scores = matrix.astype(float) @ weights
+        else:
+            scores = conditions_met / len(keys)
+
+        # 날짜 → 점수 → 조건 개수 → 원래 순서로 한 번에 정렬
+        date_codes, dates = pd.factorize(panel['date'], sort=True)
+        selected = (conditions_met >= min_conditions) & (date_codes >= 0)
+        if config.size.enabled and config.size.required:
+            selected &= masks['size']
+        rows = np.flatnonzero(selected)
+        order = rows[np.lexsort((rows, -conditions_met[rows], -scores[rows], date_codes[rows]))]
+
+        # 날짜 안에서의 순위
+        sorted_codes = date_codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        group_sizes = np.diff(np.r_[starts, len(order)])
+        rank = np.arange(len(order)) - np.repeat(starts, group_sizes) + 1
+        keep = rank <= top_n
+        order, rank = order[keep], rank[keep]
+
+        def column(name: str, default: Any) -> np.ndarray:
+            if name in panel.columns:
+                return panel[name].to_numpy()[order]
+            return np.full(len(order), default)
+
+        return pd.DataFrame({
+            'date': dates[date_codes[order]],
+            'rank': rank,
+            'ticker': column('ticker', ''),
+            'stock_name': column('stock_name', ''),
+            'close': column('close', 0.0),
+            'next_high': column('next_high', np.nan),
+            'next_low': column('next_low', np.nan),
+            'conditions_met': conditions_met[order],
+            'conditions_mask': condition_masks[order],
+            'score': scores[order],
+        }, columns=columns)
+
     def search_by_min_conditions(self, df: pd.DataFrame, min_conditions: int = 4, 
                                  config: SearchConfig = None) -> List[SearchResult]:
         """
@@ -142,14 +468,36 @@ class BacktestEngine:
         """초기화"""
         self.config = config or SearchConfig()
     
+    def _first_touch_losses(self, candidates: List[SearchResult], minute_store: MinuteBarStore,
+                            trade_date) -> set:
+        """다음날 범위에 익절가/손절가가 모두 들어간 후보 중 분봉상 손절가를 먼저 건드린 종목"""
+        take_profit = self.config.backtest.take_profit
+        stop_loss = self.config.backtest.stop_loss
+        closes = np.array([c.close for c in candidates], dtype=float)
+        highs = np.array([c.next_high for c in candidates], dtype=float)
+        lows = np.array([c.next_low for c in candidates], dtype=float)
+        targets = closes * (1 + take_profit)
+        stops = closes * (1 + stop_loss)
+
+        # 애매한 날만 분봉을 읽는다
+        ambiguous = (highs >= targets) & (lows <= stops)
+        if not ambiguous.any():
+            return set()
+        tickers = [c.ticker for c, amb in zip(candidates, ambiguous) if amb]
+        outcome = minute_store.first_touch(trade_date, tickers, targets[ambiguous], stops[ambiguous])
+        return {ticker for ticker, result in zip(tickers, outcome) if result == 'loss'}
+
     def simulate_trade(self, candidates: List[SearchResult], 
-                      price_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+                      price_data: Dict[str, pd.DataFrame],
+                      minute_store: MinuteBarStore = None, trade_date=None) -> Dict[str, Any]:
         """
         후보 종목들에 대해 백테스트 실행
         
         Args:
             candidates: 검색된 후보 종목 리스트
             price_data: {ticker: DataFrame} 형태의 가격 데이터
+            minute_store: 분봉 저장소 (지정하면 익절가/손절가를 모두 지난 날은 먼저 닿은 쪽으로 판정)
+            trade_date: 매도일 (분봉 조회용, minute_store와 함께 지정)
         
         Returns:
             {
@@ -164,58 +512,46 @@ class BacktestEngine:
         """
         capital = self.config.backtest.initial_capital
         trades = []
-        daily_equity = [capital]
+        stopped_first = set()
+        if minute_store is not None and trade_date is not None and candidates:
+            stopped_first = self._first_touch_losses(candidates, minute_store, trade_date)
         
-        for candidate in candidates:
-            ticker = candidate.ticker
-            
-            if ticker not in price_data:
-                continue
-            
-            df = price_data[ticker]
-            if len(df) < 2:
-                continue
-            
-            # 당일 종가로 매수
-            buy_price = candidate.close
-            position_size = capital / len(candidates) if self.config.backtest.equal_weight else capital
-            shares = int(position_size / buy_price)
-            
-            if shares == 0:
-                continue
-            
-            # 다음날 고가로 매도 (또는 손절)
-            next_high = candidate.next_high
-            
-            if pd.isna(next_high) or next_high == 0:
-                continue
-            
-            # 손익 계산
-            sell_price = next_high
-            pnl_pct = (sell_price - buy_price) / buy_price
-            
-            # 익절/손절 적용
-            if pnl_pct >= self.config.backtest.take_profit:
-                sell_price = buy_price * (1 + self.config.backtest.take_profit)
-                pnl_pct = self.config.backtest.take_profit
-            elif pnl_pct <= self.config.backtest.stop_loss:
-                sell_price = buy_price * (1 + self.config.backtest.stop_loss)
-                pnl_pct = self.config.backtest.stop_loss
-            
-            pnl_amount = shares * (sell_price - buy_price)
-            capital += pnl_amount
-            
+        # 매매 가능한 후보 (가격 데이터가 있고 다음날 고가가 있는 종목)
+        tradable = [
+            c for c in candidates
+            if c.ticker in price_data and len(price_data[c.ticker]) >= 2
+            and not pd.isna(c.next_high) and c.next_high != 0
+        ]
+        buy = np.array([c.close for c in tradable], dtype=float)
+        next_high = np.array([c.next_high for c in tradable], dtype=float)
+        stop_first = np.array([c.ticker in stopped_first for c in tradable], dtype=bool)
+        
+        # 다음날 고가로 매도, 익절/손절 적용 (분봉상 손절이 먼저면 손절)
+        take_profit = self.config.backtest.take_profit
+        stop_loss = self.config.backtest.stop_loss
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pnl_pct = (next_high - buy) / buy
+        capped_stop = stop_first | (~(pnl_pct >= take_profit) & (pnl_pct <= stop_loss))
+        capped_take = ~stop_first & (pnl_pct >= take_profit)
+        pnl_pct = np.where(capped_stop, stop_loss, np.where(capped_take, take_profit, pnl_pct))
+        sell = np.where(capped_stop, buy * (1 + stop_loss), np.where(capped_take, buy * (1 + take_profit), next_high))
+        
+        # 당일 종가로 매수, 자산을 순서대로 복리 반영 (한 주도 못 사는 종목은 건너뜀)
+        shares, pnl_amount, equity = compound(buy, sell, capital, len(candidates),
+                                              self.config.backtest.equal_weight)
+        daily_equity = [capital] + equity[1:].tolist()
+        capital = daily_equity[-1]
+        
+        for i in np.flatnonzero(shares > 0):
             trades.append({
-                'ticker': ticker,
-                'buy_price': buy_price,
-                'sell_price': sell_price,
-                'shares': shares,
-                'pnl_amount': pnl_amount,
-                'pnl_pct': pnl_pct,
-                'win': pnl_pct > 0
+                'ticker': tradable[i].ticker,
+                'buy_price': tradable[i].close,
+                'sell_price': float(sell[i]),
+                'shares': int(shares[i]),
+                'pnl_amount': float(pnl_amount[i]),
+                'pnl_pct': float(pnl_pct[i]),
+                'win': bool(pnl_pct[i] > 0)
             })
-            
-            daily_equity.append(capital)
         
         # 성과 지표 계산
         if len(trades) == 0:
@@ -256,3 +592,66 @@ class BacktestEngine:
             'mdd': mdd,
             'final_capital': capital
         }
+
+    def simulate_replay(self, picks: pd.DataFrame) -> Dict[str, Any]:
+        """
+        히스토리 재현 결과로 여러 날짜 백테스트 (simulate_trade와 같은 익절/손절 규칙, 그날 시작 자산을 균등 배분)
+        
+        Args:
+            picks: DayTradeSearchEngine.replay 결과
+        
+        Returns:
+            simulate_trade와 같은 형식 (+ 'dates': daily_equity 각 값의 날짜, 거래마다 'date')
+        """
+        take_profit = self.config.backtest.take_profit
+        stop_loss = self.config.backtest.stop_loss
+        capital = self.config.backtest.initial_capital
+        picks = picks[picks['next_high'].notna() & (picks['next_high'] != 0) & (picks['close'] > 0)]
+
+        trades = []
+        daily_equity = [capital]
+        dates = [None]
+        for date, day in picks.groupby('date', sort=True):
+            buy = day['close'].to_numpy(dtype=float)
+            position_size = capital / len(day) if self.config.backtest.equal_weight else capital
+            shares = (position_size / buy).astype(np.int64)
+            pnl_pct = (day['next_high'].to_numpy(dtype=float) - buy) / buy
+            pnl_pct = np.where(pnl_pct >= take_profit, take_profit, np.where(pnl_pct <= stop_loss, stop_loss, pnl_pct))
+            sell = buy * (1 + pnl_pct)
+            pnl_amount = shares * (sell - buy)
+
+            traded = shares > 0
+            if not traded.any():
+                continue
+            capital += float(pnl_amount[traded].sum())
+            daily_equity.append(capital)
+            dates.append(date)
+            for ticker, b, s, n, amount, pct in zip(day['ticker'].to_numpy()[traded], buy[traded], sell[traded],
+                                                    shares[traded], pnl_amount[traded], pnl_pct[traded]):
+                trades.append({
+                    'date': date,
+                    'ticker': ticker,
+                    'buy_price': b,
+                    'sell_price': s,
+                    'shares': int(n),
+                    'pnl_amount': float(amount),
+                    'pnl_pct': float(pct),
+                    'win': pct > 0
+                })
+
+        initial = self.config.backtest.initial_capital
+        equity = np.array(daily_equity, dtype=float)
+        cummax = np.maximum.accumulate(equity)
+        win_count = sum(1 for t in trades if t['win'])
+        return {
+            'trades': trades,
+            'daily_equity': daily_equity,
+            'dates': dates,
+            'total_trades': len(trades),
+            'win_count': win_count,
+            'win_rate': win_count / len(trades) if trades else 0.0,
+            'avg_return': float(np.mean([t['pnl_pct'] for t in trades])) if trades else 0.0,
+            'total_return': (capital - initial) / initial,
+            'mdd': float(np.min((equity - cummax) / cummax)),
+            'final_capital': capital
+        }
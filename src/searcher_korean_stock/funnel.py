@@ -0,0 +1,108 @@
+"""
+조건 퍼널 리포트 - 규칙별 통과 수, 규칙 쌍 중복 수, 규칙별 단독 탈락 수
+
+이미 계산된 규칙 마스크만 사용한다. 행마다 규칙 통과 여부를 비트로 묶어 (날짜, 비트 패턴)별
+개수를 한 번 세고, 모든 집계는 이 작은 표에서 비트 연산으로 구한다.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class FunnelReport:
+    """조건 퍼널 리포트 (모든 표는 날짜별)"""
+    rows: pd.Series                  # 평가 행 수
+    passed: pd.Series                # 모든 관문 통과 행 수
+    pass_counts: pd.DataFrame        # 날짜 × 규칙: 규칙 통과 행 수
+    overlaps: pd.DataFrame           # (날짜, 규칙) × 규칙: 두 규칙 동시 통과 행 수
+    marginal_rejects: pd.DataFrame   # 날짜 × 관문: 이 관문 하나 때문에 탈락한 행 수
+
+    def summary(self) -> pd.DataFrame:
+        """전체 기간 합계 (규칙별 통과 수, 관문별 단독 탈락 수)"""
+        passes = self.pass_counts.sum().rename('pass')
+        rejects = self.marginal_rejects.sum().rename('marginal_reject')
+        return pd.concat([passes, rejects], axis=1).fillna(0).astype(int)
+
+
+def funnel_report(rules: Dict[str, np.ndarray], dates: Optional[Sequence] = None,
+                  gates: Dict[str, Sequence[str]] = None) -> FunnelReport:
+    """
+    규칙 마스크로 퍼널 리포트 계산
+
+    Args:
+        rules: {규칙 이름: 행별 통과 여부}
+        dates: 행별 날짜 (None이면 전체를 한 그룹으로 집계)
+        gates: {관문 이름: OR로 묶인 규칙 이름들} - 모든 관문을 AND로 통과해야 최종 통과
+               (None이면 규칙 하나가 관문 하나)
+
+    Returns:
+        FunnelReport
+    """
+    names = list(rules.keys())
+    if gates is None:
+        gates = {name: (name,) for name in names}
+    n = len(next(iter(rules.values()))) if rules else 0
+
+    if dates is None:
+        codes = np.zeros(n, dtype=np.int64)
+        labels = pd.Index(['all'], name='date')
+    else:
+        codes, labels = pd.factorize(pd.Series(dates), sort=True)
+        codes = codes.astype(np.int64)
+        labels = pd.Index(labels, name='date')
+
+    # 행별 규칙 비트 패턴 → (날짜, 패턴)별 개수
+    width = len(names)
+    pattern = np.zeros(n, dtype=np.int64)
+    for j, name in enumerate(names):
+        pattern |= np.asarray(rules[name], dtype=bool).astype(np.int64) << j
+    keys, counts = np.unique((codes << width) | pattern, return_counts=True)
+    key_dates = keys >> width
+    key_bits = keys & ((1 << width) - 1)
+    n_dates = len(labels)
+
+    def per_date(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(key_dates, weights=counts * weights, minlength=n_dates).astype(np.int64)
+
+    rule_bits = {name: ((key_bits >> j) & 1).astype(bool) for j, name in enumerate(names)}
+
+    pass_counts = pd.DataFrame({name: per_date(bits) for name, bits in rule_bits.items()}, index=labels)
+
+    overlap_blocks = np.zeros((n_dates, width, width), dtype=np.int64)
+    for i, a in enumerate(names):
+        for j in range(i, width):
+            both = per_date(rule_bits[a] & rule_bits[names[j]])
+            overlap_blocks[:, i, j] = both
+            overlap_blocks[:, j, i] = both
+    overlaps = pd.DataFrame(
+        overlap_blocks.reshape(n_dates * width, width),
+        index=pd.MultiIndex.from_product([labels, names], names=['date', 'rule']),
+        columns=names,
+    )
+
+    gate_bits = {}
+    for gate, members in gates.items():
+        bits = np.zeros(len(keys), dtype=bool)
+        for member in members:
+            bits |= rule_bits[member]
+        gate_bits[gate] = bits
+    all_gates = np.logical_and.reduce(list(gate_bits.values())) if gate_bits else np.ones(len(keys), dtype=bool)
+
+    marginal = {}
+    for gate, bits in gate_bits.items():
+        others = np.ones(len(keys), dtype=bool)
+        for other, other_bits in gate_bits.items():
+            if other != gate:
+                others &= other_bits
+        marginal[gate] = per_date(~bits & others)
+
+    return FunnelReport(
+        rows=pd.Series(per_date(np.ones(len(keys))), index=labels, name='rows'),
+        passed=pd.Series(per_date(all_gates), index=labels, name='passed'),
+        pass_counts=pass_counts,
+        overlaps=overlaps,
+        marginal_rejects=pd.DataFrame(marginal, index=labels),
+    )
@@ -0,0 +1,232 @@
+"""
+HTTP 세션 - 연결 풀(keep-alive)과 디스크 조건부 응답 캐시를 갖춘 requests.Session
+
+로더가 세션 하나를 들고 모든 yfinance 요청에 넘기므로 종목마다 연결을 새로 맺지 않는다.
+GET 응답은 디스크에 저장하고, 유효 기간(Cache-Control max-age, 없으면 기본 TTL) 안이면 네트워크 없이 돌려준다.
+기간이 지났으면 ETag / Last-Modified로 조건부 요청을 보내 304면 저장된 본문을 재사용한다.
+쿠키를 주고받는 응답(Set-Cookie, yfinance의 쿠키/crumb 교환)은 세션 상태이므로 저장하지 않고,
+Vary 헤더가 있으면 해당 요청 헤더(예: Cookie)가 같을 때만 저장된 응답을 쓴다.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .instrumentation import instruments
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+# 본문을 풀어서 저장하므로 캐시된 응답에서는 빼는 헤더
+_DROP_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+# 쿠키/crumb 교환 주소 (세션 쿠키와 짝이라 다른 세션에 재사용하면 안 됨)
+UNCACHEABLE_URL_PARTS = ('getcrumb', 'fc.yahoo.com', 'consent.yahoo.com', 'guce.yahoo.com')
+
+
+def _cache_control(headers) -> Dict[str, Optional[str]]:
+    """Cache-Control 헤더 파싱 ('max-age=60, no-cache' → {'max-age': '60', 'no-cache': None})"""
+    directives = {}
+    for part in headers.get('Cache-Control', '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+class CachedSession(requests.Session):
+    """
+    연결 풀 + 디스크 조건부 캐시 세션
+
+    캐시 항목: {'url', 'status', 'headers', 'content', 'stored_at', 'max_age', 'vary'}
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(".cache", "http"), ttl: float = 300,
+                 pool_size: int = 16, memory_items: int = 256):
+        """
+        초기화
+
+        Args:
+            cache_dir: 응답 캐시 디렉터리
+            ttl: 서버가 max-age를 주지 않았을 때의 유효 기간 (초)
+            pool_size: 호스트별로 유지할 연결 수
+            memory_items: 메모리에 함께 들고 있을 최근 응답 수
+        """
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ---- 캐시 저장소 ----
+
+    def _key(self, request: requests.PreparedRequest) -> str:
+        return hashlib.sha256(f"{request.method} {request.url}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _put(self, key: str, entry: Dict[str, Any]) -> None:
+        """메모리와 디스크에 저장 (임시 파일에 쓴 뒤 교체)"""
+        self._remember(key, entry)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"HTTP 캐시 저장 실패: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear_cache(self) -> None:
+        """저장된 응답 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    # ---- 요청 처리 ----
+
+    def _entry(self, response: requests.Response, max_age: float) -> Dict[str, Any]:
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+        return {
+            'url': response.url,
+            'status': response.status_code,
+            'headers': headers,
+            'content': response.content,
+            'stored_at': time.time(),
+            'max_age': max_age,
+            'vary': self._vary_values(response.headers, response.request),
+        }
+
+    def _response(self, entry: Dict[str, Any], request: requests.PreparedRequest) -> requests.Response:
+        """캐시 항목으로 응답 객체 생성"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['content']
+        response.url = entry['url']
+        response.request = request
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+    @staticmethod
+    def _vary_values(response_headers, request: requests.PreparedRequest) -> Dict[str, Optional[str]]:
+        """응답의 Vary에 적힌 요청 헤더 → 이번 요청의 값"""
+        names = [name.strip().lower() for name in response_headers.get('Vary', '').split(',') if name.strip()]
+        return {name: request.headers.get(name) for name in names}
+
+    @staticmethod
+    def _cacheable_request(request: requests.PreparedRequest) -> bool:
+        if request.method != 'GET' or 'no-store' in _cache_control(request.headers):
+            return False
+        url = request.url.lower()
+        return not any(part in url for part in UNCACHEABLE_URL_PARTS)
+
+    def _max_age(self, response: requests.Response) -> Optional[float]:
+        """저장할 유효 기간 (저장하면 안 되는 응답이면 None)"""
+        directives = _cache_control(response.headers)
+        if response.status_code != 200 or 'no-store' in directives:
+            return None
+        # 쿠키를 심는 응답은 재생해도 쿠키가 세션에 들어가지 않으므로 저장하지 않음
+        if 'Set-Cookie' in response.headers or response.headers.get('Vary', '').strip() == '*':
+            return None
+        if 'no-cache' in directives:
+            return 0.0
+        try:
+            return float(directives['max-age'])
+        except (KeyError, TypeError, ValueError):
+            return float(self.ttl)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """GET은 캐시 확인 → (유효하면) 캐시 응답, (만료면) 조건부 요청, 그 외 메서드는 그대로 전송"""
+        if not self._cacheable_request(request):
+            return super().send(request, **kwargs)
+
+        key = self._key(request)
+        entry = self._get(key)
+        if entry is not None and any(request.headers.get(name) != value
+                                     for name, value in entry.get('vary', {}).items()):
+            # Vary 헤더(예: Cookie)가 다른 요청이 저장한 응답은 쓰지 않음
+            entry = None
+        if entry is not None and time.time() - entry['stored_at'] < entry['max_age']:
+            instruments.count('http_cache_hit')
+            return self._response(entry, request)
+
+        if entry is not None:
+            headers = entry['headers']
+            etag = next((v for k, v in headers.items() if k.lower() == 'etag'), None)
+            modified = next((v for k, v in headers.items() if k.lower() == 'last-modified'), None)
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if modified:
+                request.headers['If-Modified-Since'] = modified
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            # 변경 없음: 저장된 본문 재사용, 유효 기간만 갱신
+            instruments.count('http_cache_revalidated')
+            directives = _cache_control(response.headers)
+            refreshed = dict(entry, stored_at=time.time())
+            if 'max-age' in directives:
+                try:
+                    refreshed['max_age'] = float(directives['max-age'])
+                except (TypeError, ValueError):
+                    pass
+            self._put(key, refreshed)
+            response.close()
+            return self._response(refreshed, request)
+
+        instruments.count('http_cache_miss')
+        if not kwargs.get('stream'):
+            max_age = self._max_age(response)
+            if max_age is not None:
+                self._put(key, self._entry(response, max_age))
+        response.from_cache = False
+        return response
@@ -0,0 +1,256 @@
+"""
+단계별 계측 - 실행 시간, 입출력 행 수, 캐시 적중, 최대 메모리
+
+기본은 비활성화 상태이며, 비활성화 시 계측 지점은 속성 하나만 확인하고 바로 원래 함수를 호출한다.
+환경 변수 SEARCHER_METRICS=1 또는 instruments.enable()로 켠다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    """DataFrame/dict/list 등의 행 수 (셀 수 없으면 None)"""
+    if value is None or isinstance(value, (str, bytes)):
+        return None
+    # (결과, 부가 정보) 튜플은 결과의 행 수 (filter_candidates(funnel=True) → (candidates, FunnelReport))
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    # BacktestResult처럼 거래 로그를 가진 결과는 거래 수를 행 수로 사용 (디스크 결과는 읽지 않고 누적 거래 수)
+    portfolio = getattr(value, 'portfolio', None)
+    if portfolio is not None and getattr(portfolio, 'sink', None) is not None:
+        return portfolio.trade_count
+    trade_log = getattr(value, 'trade_log', None)
+    if trade_log is not None:
+        return len(trade_log)
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class Span:
+    """계측 구간 하나의 기록"""
+
+    __slots__ = ('name', 'rows_in', 'rows_out', 'started', 'seconds', 'peak_bytes')
+
+    def __init__(self, name: str, rows_in: Optional[int] = None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out: Optional[int] = None
+        self.started = time.time()
+        self.seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'started_at': datetime.fromtimestamp(self.started).isoformat(),
+            'seconds': self.seconds,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'peak_bytes': self.peak_bytes,
+        }
+
+
+class _NullSpan:
+    """비활성화 상태에서 쓰는 빈 구간 (속성 설정을 무시)"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Instrumentation:
+    """단계별 계측 기록기"""
+
+    # JSON lines로 내보내기 전까지 보관할 최근 구간 수
+    MAX_EVENTS = 10_000
+
+    def __init__(self, enabled: bool = None, trace_memory: bool = False):
+        """초기화"""
+        if enabled is None:
+            enabled = os.environ.get('SEARCHER_METRICS', '') not in ('', '0', 'false')
+        self.enabled = False
+        self.trace_memory = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+        if enabled:
+            self.enable(trace_memory)
+
+    def enable(self, trace_memory: bool = False) -> None:
+        """계측 켜기 (trace_memory=True면 tracemalloc으로 최대 메모리 측정)"""
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        """계측 끄기"""
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self) -> None:
+        """누적 기록 초기화"""
+        with self._lock:
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, float] = {}
+            self.events: deque = deque(maxlen=self.MAX_EVENTS)
+
+    @contextmanager
+    def span(self, name: str, rows_in: Optional[int] = None) -> Iterator[Any]:
+        """
+        계측 구간
+
+        with instruments.span('filter_candidates', rows_in=len(df)) as span:
+            ...
+            span.rows_out = len(result)
+        """
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        span = Span(name, rows_in)
+        stack = self._memory_stack()
+        if self.trace_memory:
+            # 바깥 구간의 지금까지 최대값을 넘겨 두고 이 구간 기준으로 다시 측정
+            if stack:
+                stack[-1][0] = max(stack[-1][0], tracemalloc.get_traced_memory()[1])
+            stack.append([0])
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.seconds = time.perf_counter() - start
+            if self.trace_memory and stack:
+                carried = stack.pop()[0]
+                span.peak_bytes = max(carried, tracemalloc.get_traced_memory()[1])
+            self._record(span)
+
+    def _memory_stack(self) -> List[List[int]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(span.name, {
+                'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                'rows_in': 0, 'rows_out': 0, 'peak_bytes': 0,
+            })
+            stage['calls'] += 1
+            stage['seconds'] += span.seconds
+            stage['max_seconds'] = max(stage['max_seconds'], span.seconds)
+            stage['rows_in'] += span.rows_in or 0
+            stage['rows_out'] += span.rows_out or 0
+            if span.peak_bytes is not None:
+                stage['peak_bytes'] = max(stage['peak_bytes'], span.peak_bytes)
+            self.events.append(span)
+
+    def count(self, name: str, value: float = 1) -> None:
+        """카운터 증가 (캐시 적중/미스 등)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def traced(self, name: str) -> Callable:
+        """
+        함수 전체를 계측 구간으로 감싸는 데코레이터
+
+        첫 번째 DataFrame/dict 인자의 길이를 입력 행 수, 반환값의 길이를 출력 행 수로 기록한다.
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                rows_in = None
+                for arg in list(args) + list(kwargs.values()):
+                    if hasattr(arg, 'columns') or isinstance(arg, dict):
+                        rows_in = _count_rows(arg)
+                        break
+                with self.span(name, rows_in) as span:
+                    result = func(*args, **kwargs)
+                    span.rows_out = _count_rows(result)
+                return result
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """누적 기록 사본"""
+        with self._lock:
+            return {
+                'stages': {k: dict(v) for k, v in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def render_prometheus(self, prefix: str = 'searcher') -> str:
+        """Prometheus 텍스트 형식으로 출력"""
+        snapshot = self.snapshot()
+        metrics = [
+            ('stage_calls_total', 'counter', 'calls', '단계 호출 횟수'),
+            ('stage_seconds_total', 'counter', 'seconds', '단계 누적 실행 시간(초)'),
+            ('stage_max_seconds', 'gauge', 'max_seconds', '단계 최대 실행 시간(초)'),
+            ('stage_rows_in_total', 'counter', 'rows_in', '단계 입력 행 수'),
+            ('stage_rows_out_total', 'counter', 'rows_out', '단계 출력 행 수'),
+            ('stage_peak_memory_bytes', 'gauge', 'peak_bytes', '단계 최대 메모리(바이트)'),
+        ]
+
+        lines = []
+        for metric, kind, key, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for stage, values in sorted(snapshot['stages'].items()):
+                lines.append(f'{prefix}_{metric}{{stage="{stage}"}} {values[key]}')
+
+        lines.append(f"# HELP {prefix}_events_total 이벤트 카운터 (캐시 적중/미스 등)")
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_jsonl(self, path: str, **extra: Any) -> int:
+        """
+        쌓인 구간 기록을 JSON lines로 추가 저장하고 비움
+
+        Returns:
+            저장한 줄 수
+        """
+        with self._lock:
+            events = list(self.events)
+            self.events.clear()
+            counters = dict(self.counters)
+
+        if not events and not counters:
+            return 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for span in events:
+                f.write(json.dumps({**span.to_dict(), **extra}, ensure_ascii=False) + "\n")
+            f.write(json.dumps({'counters': counters, 'written_at': datetime.now().isoformat(), **extra},
+                               ensure_ascii=False) + "\n")
+        return len(events) + 1
+
+
+# 전역 인스턴스
+instruments = Instrumentation()
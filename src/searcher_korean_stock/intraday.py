@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import instruments
+
+
+class MinuteBarStore:
+    """Local minute bars, one (n_minutes, 2) [high, low] .npy file per date and ticker, read memory-mapped.
+
+    Layout: <root>/<YYYYMMDD>/<ticker>.npy, rows in time order.
+    """
+
+    def __init__(self, root: str = 'data/minute'):
+        self.root = Path(root)
+
+    def path(self, date, ticker: str) -> Path:
+        return self.root / pd.Timestamp(date).strftime('%Y%m%d') / f'{ticker}.npy'
+
+    def write(self, date, ticker: str, high: Sequence[float], low: Sequence[float]) -> Path:
+        path = self.path(date, ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, np.column_stack([high, low]).astype(np.float32))
+        return path
+
+    def load(self, date, ticker: str) -> Optional[np.ndarray]:
+        path = self.path(date, ticker)
+        if not path.exists():
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def first_touch(self, date, tickers: Sequence[str], targets: np.ndarray, stops: np.ndarray) -> np.ndarray:
+        """Which level each ticker touched first on `date`: 'win' (target), 'loss' (stop) or '' (no data).
+
+        Both levels inside the same minute count as 'loss', since the order within a bar is unknown.
+        """
+        targets = np.asarray(targets, dtype=float)
+        stops = np.asarray(stops, dtype=float)
+        outcome = np.full(len(tickers), '', dtype=object)
+
+        bars = [self.load(date, ticker) for ticker in tickers]
+        rows = [i for i, b in enumerate(bars) if b is not None and len(b)]
+        instruments.count('intraday_lookups', len(tickers))
+        if not rows:
+            return outcome
+
+        # pad the day's bars into one (candidates x minutes) matrix; NaN never crosses a level
+        length = max(len(bars[i]) for i in rows)
+        high = np.full((len(rows), length), np.nan)
+        low = np.full((len(rows), length), np.nan)
+        for r, i in enumerate(rows):
+            high[r, :len(bars[i])] = bars[i][:, 0]
+            low[r, :len(bars[i])] = bars[i][:, 1]
+
+        hit_target = high >= targets[rows, None]
+        hit_stop = low <= stops[rows, None]
+        first_target = np.where(hit_target.any(axis=1), hit_target.argmax(axis=1), length)
+        first_stop = np.where(hit_stop.any(axis=1), hit_stop.argmax(axis=1), length)
+
+        resolved = np.where(first_target < first_stop, 'win', np.where(first_stop < length, 'loss', ''))
+        outcome[rows] = resolved
+        return outcome
@@ -0,0 +1,198 @@
+"""
+계산 커널 - 롤링 최대/최소, 익일 청산 판정, 순차 복리 계산의 배열 구현
+
+Numba가 설치되어 있으면 루프를 JIT 컴파일하고(디스크 캐시), 없으면 같은 결과의 NumPy 구현을 쓴다.
+입력은 종목별로 묶여 정렬된 1차원 배열과 그룹 시작 위치(starts)이다.
+"""
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# SEARCHER_KERNELS=numpy 이면 Numba가 있어도 NumPy 구현 사용 (결과 동일)
+BACKEND = 'numba' if numba is not None and os.environ.get('SEARCHER_KERNELS', '').lower() != 'numpy' else 'numpy'
+
+# resolve_exits가 돌려주는 청산 코드
+WIN, LOSS, HOLD_EXIT = 0, 1, 2
+EXIT_RESULTS = np.array(['win', 'loss', 'hold_exit'], dtype=object)
+
+
+def _jit(func):
+    """Numba 백엔드면 컴파일(디스크 캐시), 아니면 그대로 반환"""
+    if BACKEND == 'numba':
+        return numba.njit(cache=True, nogil=True)(func)
+    return func
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """같은 키가 이어지는 구간의 시작 위치 (행이 종목 순으로 묶여 있어야 함)"""
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]).astype(np.int64)
+
+
+# ---- 롤링 최대 / 최소 -------------------------------------------------------------------------
+
+@_jit
+def _rolling_extreme_loop(values, starts, window, is_max):
+    # 그룹별 단조 덱; 창 안에 NaN이 있으면 NaN (pandas min_periods=window와 동일)
+    n = len(values)
+    out = np.full(n, np.nan)
+    queue = np.empty(n, dtype=np.int64)
+    for g in range(len(starts)):
+        start = starts[g]
+        end = starts[g + 1] if g + 1 < len(starts) else n
+        head = 0
+        tail = 0
+        last_nan = start - 1
+        for i in range(start, end):
+            v = values[i]
+            if v != v:
+                last_nan = i
+            else:
+                while tail > head and ((values[queue[tail - 1]] <= v) if is_max else (values[queue[tail - 1]] >= v)):
+                    tail -= 1
+                queue[tail] = i
+                tail += 1
+            while tail > head and queue[head] <= i - window:
+                head += 1
+            if i - start >= window - 1 and last_nan <= i - window and tail > head:
+                out[i] = values[queue[head]]
+    return out
+
+
+def _rolling_extreme_numpy(values: np.ndarray, starts: np.ndarray, window: int, is_max: bool) -> np.ndarray:
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    extreme = windows.max(axis=1) if is_max else windows.min(axis=1)  # 창 안에 NaN → NaN
+    out[window - 1:] = extreme
+    # 이전 그룹에 걸친 창은 제외
+    position = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+    out[position < window - 1] = np.nan
+    return out
+
+
+def _rolling_extreme(values, window: int, starts, is_max: bool) -> np.ndarray:
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    starts = np.zeros(1, dtype=np.int64) if starts is None else np.asarray(starts, dtype=np.int64)
+    if len(values) == 0:
+        return np.empty(0)
+    if BACKEND == 'numba':
+        return _rolling_extreme_loop(values, starts, window, is_max)
+    return _rolling_extreme_numpy(values, starts, window, is_max)
+
+
+def rolling_max(values, window: int, starts=None) -> np.ndarray:
+    """starts로 나뉜 그룹 안에서 rolling(window).max() (None이면 전체가 한 그룹)"""
+    return _rolling_extreme(values, window, starts, True)
+
+
+def rolling_min(values, window: int, starts=None) -> np.ndarray:
+    """starts로 나뉜 그룹 안에서 rolling(window).min() (None이면 전체가 한 그룹)"""
+    return _rolling_extreme(values, window, starts, False)
+
+
+# ---- 익일 청산 판정 (backtester.simulate) ----------------------------------------------------
+
+@_jit
+def _resolve_exits_loop(buy, high, low, close, stopped_first, target_mult, stop_mult):
+    n = len(buy)
+    sell = np.empty(n)
+    code = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        target = buy[i] * target_mult
+        stop = buy[i] * stop_mult
+        if stopped_first[i]:
+            sell[i] = stop
+            code[i] = LOSS
+        elif high[i] >= target:
+            sell[i] = target
+            code[i] = WIN
+        elif low[i] <= stop:
+            sell[i] = stop
+            code[i] = LOSS
+        else:
+            sell[i] = close[i]
+            code[i] = HOLD_EXIT
+    return sell, code
+
+
+def resolve_exits(buy, high, low, close, stopped_first, target_mult: float,
+                  stop_mult: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    종목별 익일 청산: (매도가, WIN / LOSS / HOLD_EXIT)
+
+    분봉 기준 손절 선행 플래그가 최우선, 다음은 목표가(손절보다 먼저 확인), 손절가 순이며
+    둘 다 닿지 않으면 익일 종가로 청산한다.
+    """
+    buy = np.asarray(buy, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    stopped_first = np.asarray(stopped_first, dtype=np.bool_)
+    if BACKEND == 'numba':
+        return _resolve_exits_loop(buy, high, low, close, stopped_first, target_mult, stop_mult)
+    target = buy * target_mult
+    stop = buy * stop_mult
+    win = ~stopped_first & (high >= target)
+    loss = stopped_first | (~win & (low <= stop))
+    sell = np.where(win, target, np.where(loss, stop, close))
+    code = np.where(win, WIN, np.where(loss, LOSS, HOLD_EXIT)).astype(np.int64)
+    return sell, code
+
+
+# ---- 순차 복리 (BacktestEngine.simulate_trade) ------------------------------------
+
+@_jit
+def _compound_loop(buy, sell, initial_capital, n_slots, equal_weight):
+    n = len(buy)
+    shares = np.zeros(n, dtype=np.int64)
+    pnl = np.zeros(n)
+    equity = np.empty(n + 1)
+    equity[0] = initial_capital
+    capital = initial_capital
+    k = 1
+    for i in range(n):
+        position_size = capital / n_slots if equal_weight else capital
+        count = int(position_size / buy[i])
+        if count == 0:
+            continue
+        shares[i] = count
+        pnl[i] = count * (sell[i] - buy[i])
+        capital += pnl[i]
+        equity[k] = capital
+        k += 1
+    return shares, pnl, equity[:k]
+
+
+def compound(buy, sell, initial_capital: float, n_slots: int,
+             equal_weight: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    거래를 순서대로, 직전까지의 자본으로 수량을 정해 체결: (수량, 손익 금액, 자산 곡선)
+
+    한 주도 살 수 없는 거래는 수량 0이고 자산 곡선에 점을 추가하지 않는다.
+    수량이 직전 체결에 의존하므로 NumPy 백엔드도 같은 루프를 배열 위에서 돌린다.
+    """
+    buy = np.asarray(buy, dtype=np.float64)
+    sell = np.asarray(sell, dtype=np.float64)
+    return _compound_loop(buy, sell, float(initial_capital), int(n_slots), bool(equal_weight))
+
+
+def warmup() -> str:
+    """작은 입력으로 모든 커널을 미리 컴파일 (JIT 비용을 사용자 요청이 아닌 시작 시점에 지불)"""
+    values = np.array([1.0, 3.0, np.nan, 2.0, 5.0, 4.0])
+    starts = np.array([0, 3], dtype=np.int64)
+    rolling_max(values, 2, starts)
+    rolling_min(values, 2, starts)
+    resolve_exits(values[:2], values[:2], values[:2], values[:2], np.zeros(2, dtype=bool), 1.02, 0.985)
+    compound(np.array([1.0, 2.0]), np.array([1.1, 1.9]), 100.0, 2)
+    return BACKEND
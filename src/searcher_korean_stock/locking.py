@@ -0,0 +1,120 @@
+"""
+동시 실행 제어 - 프로세스 안 중복 요청 합치기(single-flight)와 프로세스 간 파일 잠금
+
+Streamlit 앱과 스케줄러가 같은 시각에 같은 종목을 요청해도 네트워크 요청은 한 번만 나가도록,
+프로세스 안에서는 SingleFlight로, 프로세스 사이에서는 FileLock으로 막는다.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+class FileLock:
+    """
+    프로세스 간 배타 잠금 (POSIX는 fcntl.flock, Windows는 msvcrt.locking)
+
+    with FileLock(path + '.lock'):
+        ...
+    """
+
+    def __init__(self, path: str):
+        """초기화 (잠금 파일은 처음 잠글 때 생성)"""
+        self.path = path
+        self._fd = None
+
+    def acquire(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK은 약 10초 후 포기하므로 잠길 때까지 다시 시도
+                        continue
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class _Call:
+    """진행 중인 요청 하나 (먼저 온 스레드가 실행하고 나머지는 결과를 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """같은 키의 동시 요청을 하나로 합침 (진행 중일 때만, 끝난 결과는 보관하지 않음)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any]):
+        """
+        key에 대해 func를 한 번만 실행하고, 그동안 같은 key로 들어온 호출은 같은 결과를 받음
+
+        Returns:
+            (결과, 다른 호출의 결과를 받았는지 여부)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
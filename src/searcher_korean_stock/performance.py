@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def daily_equity(portfolio) -> pd.Series:
+    """End-of-day equity from a Portfolio, starting with the initial capital."""
+    return equity_points_daily(portfolio.dates, np.asarray(portfolio.equity_curve, dtype=float)[1:],
+                               portfolio.initial_capital)
+
+
+def equity_points_daily(dates, equity, initial_capital: float) -> pd.Series:
+    """End-of-day equity from (date, equity) points in time order, starting with the initial capital."""
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    equity = np.asarray(equity, dtype=float)
+    if len(dates) == 0:
+        return pd.Series([float(initial_capital)], index=pd.DatetimeIndex([pd.NaT]), name='equity')
+
+    # several updates per day (one per trade): keep the last one of each date
+    last = np.r_[dates[1:] != dates[:-1], True]
+    days = dates[last].astype('datetime64[D]')
+    start = days[0] - np.timedelta64(1, 'D')
+    index = pd.DatetimeIndex(np.r_[start, days])
+    return pd.Series(np.r_[initial_capital, equity[last]], index=index, name='equity')
+
+
+def trade_log_equity(trade_log: pd.DataFrame, initial_capital: float = 10_000_000) -> pd.Series:
+    """End-of-day equity rebuilt from a trade log, assuming equal weight across each day's trades."""
+    dates = pd.to_datetime(trade_log['date']).values.astype('datetime64[D]')
+    days, codes = np.unique(dates, return_inverse=True)
+    returns = trade_log['return_pct'].to_numpy(dtype=float)
+    daily = np.bincount(codes, weights=returns) / np.bincount(codes)
+    index = pd.DatetimeIndex(np.r_[days[0] - np.timedelta64(1, 'D'), days])
+    return pd.Series(initial_capital * np.r_[1.0, np.cumprod(1 + daily)], index=index, name='equity')
+
+
+def _period_returns(returns: np.ndarray, codes: np.ndarray, make_index) -> pd.Series:
+    """Compounded return per integer-encoded period."""
+    uniq, inverse = np.unique(codes, return_inverse=True)
+    growth = np.exp(np.bincount(inverse, weights=np.log1p(returns))) - 1
+    return pd.Series(growth, index=make_index(uniq))
+
+
+def compute_metrics(equity: pd.Series, trade_log: Optional[pd.DataFrame] = None,
+                    selection_log: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Performance metrics from a compounded daily equity series (inputs are not modified).
+
+    `equity` starts with the initial capital, as returned by daily_equity / trade_log_equity.
+    """
+    values = equity.to_numpy()
+    days = equity.index.values[1:].astype('datetime64[D]')
+    returns = values[1:] / values[:-1] - 1
+
+    peaks = np.maximum.accumulate(values)
+    drawdown = values / peaks - 1
+    trough = int(drawdown.argmin())
+    peak = int(values[:trough + 1].argmax())
+    mdd = float(drawdown[trough])
+
+    n_days = len(returns)
+    total_return = float(values[-1] / values[0] - 1)
+    years = n_days / TRADING_DAYS
+    cagr = float((1 + total_return) ** (1 / years) - 1) if years > 0 and total_return > -1 else 0.0
+
+    std = returns.std(ddof=1) if n_days > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2)) if n_days else 0.0
+    mean = returns.mean() if n_days else 0.0
+    sharpe = float(mean / std * np.sqrt(TRADING_DAYS)) if std > 0 else 0.0
+    sortino = float(mean / downside * np.sqrt(TRADING_DAYS)) if downside > 0 else 0.0
+    calmar = float(cagr / -mdd) if mdd < 0 else 0.0
+
+    trades = trade_log if trade_log is not None and not trade_log.empty else None
+    if trades is not None:
+        trade_returns = trades['return_pct'].to_numpy(dtype=float)
+        win_rate = float((trade_returns > 0).mean())
+        avg_return = float(trade_returns.mean())
+        trade_days = np.unique(np.asarray(pd.to_datetime(trades['date']).values, dtype='datetime64[D]'))
+        exposure = len(trade_days) / n_days if n_days else 0.0
+    else:
+        win_rate = avg_return = exposure = 0.0
+
+    turnover = 0.0
+    if selection_log is not None and not selection_log.empty and n_days:
+        turnover = float(selection_log['allocation'].sum() / values.mean() / n_days)
+
+    if n_days:
+        day_numbers = days.astype(np.int64)
+        months = days.astype('datetime64[M]').astype(np.int64)
+        years_code = days.astype('datetime64[Y]').astype(np.int64)
+        # 1970-01-01 is a Thursday: shift by 3 days so weeks start on Monday
+        weeks = (day_numbers + 3) // 7
+
+        monthly = _period_returns(returns, months, lambda u: pd.PeriodIndex.from_ordinals(u, freq='M'))
+        yearly = _period_returns(returns, years_code, lambda u: pd.PeriodIndex.from_ordinals(u, freq='Y'))
+        weekly = _period_returns(returns, weeks,
+                                 lambda u: pd.DatetimeIndex(pd.to_datetime(u * 7 - 3, unit='D')).to_period('W'))
+    else:
+        monthly = weekly = yearly = pd.Series(dtype=float)
+
+    return {
+        'win_rate': win_rate,
+        'avg_return': avg_return,
+        'total_return': total_return,
+        'cagr': cagr,
+        'mdd': mdd,
+        'mdd_peak_date': equity.index[peak],
+        'mdd_trough_date': equity.index[trough],
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'calmar': calmar,
+        'exposure': exposure,
+        'turnover': turnover,
+        'daily_equity': equity,
+        'weekly_returns': weekly,
+        'monthly_returns': monthly,
+        'yearly_returns': yearly,
+    }
@@ -1,12 +1,40 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from .result_store import ResultSink
 
-@dataclass
+
+class GrowableArray:
+    """Typed append-only buffer that doubles its capacity when full."""
+
+    __slots__ = ('_data', '_size')
+
+    def __init__(self, dtype, capacity: int = 64):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def append(self, value) -> None:
+        if self._size == len(self._data):
+            grown = np.empty(max(1, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size] = value
+        self._size += 1
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+@dataclass(slots=True)
 class TradeRecord:
     date: pd.Timestamp
     ticker: str
@@ -16,16 +44,78 @@ class TradeRecord:
     result: str
 
 
+class TradeLog:
+    """Columnar trade log: one typed buffer per TradeRecord field."""
+
+    COLUMNS = {
+        'date': 'datetime64[ns]',
+        'ticker': object,
+        'buy_price': float,
+        'sell_price': float,
+        'return_pct': float,
+        'result': object,
+    }
+
+    def __init__(self):
+        self.columns = {name: GrowableArray(dtype) for name, dtype in self.COLUMNS.items()}
+
+    def append(self, record: TradeRecord) -> None:
+        self.columns['date'].append(np.datetime64(pd.Timestamp(record.date), 'ns'))
+        self.columns['ticker'].append(record.ticker)
+        self.columns['buy_price'].append(record.buy_price)
+        self.columns['sell_price'].append(record.sell_price)
+        self.columns['return_pct'].append(record.return_pct)
+        self.columns['result'].append(record.result)
+
+    def __len__(self) -> int:
+        return len(self.columns['date'])
+
+    def records(self) -> List[TradeRecord]:
+        cols = [self.columns[name].view() for name in self.COLUMNS]
+        return [TradeRecord(pd.Timestamp(d), *rest) for d, *rest in zip(*cols)]
+
+    def to_frame(self) -> pd.DataFrame:
+        if len(self) == 0:
+            return pd.DataFrame()
+        return pd.DataFrame({name: buf.view().copy() for name, buf in self.columns.items()})
+
+
 @dataclass
 class Portfolio:
     initial_capital: float
-    equity_curve: List[float] = field(default_factory=list)
-    dates: List[pd.Timestamp] = field(default_factory=list)
-    trades: List[TradeRecord] = field(default_factory=list)
+    sink: Optional[ResultSink] = None   # stream trades / equity points to disk instead of keeping them
 
     def __post_init__(self):
         self.cash = self.initial_capital
-        self.equity_curve.append(self.cash)
+        self._equity = GrowableArray(float)
+        self._dates = GrowableArray('datetime64[ns]')
+        self._trades = TradeLog()
+        self._equity.append(self.cash)
+
+        # running accumulators, updated on every update_equity / log_trade
+        self.peak_equity = self.cash
+        self.drawdown = 0.0
+        self.mdd = 0.0
+        # peak / MDD over the days before the current one (drawdown follows end-of-day equity)
+        self._last_date: Optional[pd.Timestamp] = None
+        self._closed_peak = self.cash
+        self._closed_mdd = 0.0
+        self.trade_count = 0
+        self.win_count = 0
+        self.return_sum = 0.0
+        self.return_sq_sum = 0.0
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        return self._equity.view()
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates.view()
+
+    @property
+    def trades(self) -> List[TradeRecord]:
+        return self._trades.records()
 
     def allocate(self, n_positions: int) -> float:
         if n_positions == 0:
@@ -33,12 +123,51 @@ class Portfolio:
         return self.cash / n_positions
 
     def update_equity(self, date: pd.Timestamp, pnl: float):
+        """Book pnl on `date`; updates for one date must be consecutive (one call per trade)."""
+        date = pd.Timestamp(date)
+        if self._last_date is not None and date != self._last_date:
+            self._closed_peak = self.peak_equity
+            self._closed_mdd = self.mdd
+        self._last_date = date
         self.cash += pnl
-        self.dates.append(date)
-        self.equity_curve.append(self.cash)
+        if self.sink is not None:
+            self.sink.write('equity', {'date': date, 'equity': self.cash})
+        else:
+            self._dates.append(np.datetime64(pd.Timestamp(date), 'ns'))
+            self._equity.append(self.cash)
+
+        # the current day's equity so far stands in for its close until the next date starts
+        self.peak_equity = max(self._closed_peak, self.cash)
+        self.drawdown = self.cash / self.peak_equity - 1 if self.peak_equity else 0.0
+        self.mdd = min(self._closed_mdd, self.drawdown)
 
     def log_trade(self, record: TradeRecord):
-        self.trades.append(record)
+        if self.sink is not None:
+            self.sink.write('trades', {name: getattr(record, name) for name in TradeLog.COLUMNS})
+        else:
+            self._trades.append(record)
+        self.trade_count += 1
+        ret = float(record.return_pct)
+        self.win_count += ret > 0
+        self.return_sum += ret
+        self.return_sq_sum += ret * ret
+
+    def metrics(self) -> Dict[str, float]:
+        """Running metrics, available at any point without a post-pass."""
+        n = self.trade_count
+        avg = self.return_sum / n if n else 0.0
+        var = (self.return_sq_sum - n * avg * avg) / (n - 1) if n > 1 else 0.0
+        return {
+            'equity': float(self.cash),
+            'total_return': float(self.cash / self.initial_capital - 1),
+            'peak_equity': float(self.peak_equity),
+            'drawdown': float(self.drawdown),
+            'mdd': float(self.mdd),
+            'trades': n,
+            'win_rate': self.win_count / n if n else 0.0,
+            'avg_return': avg,
+            'return_std': math.sqrt(max(var, 0.0)),
+        }
 
     def to_frame(self) -> pd.DataFrame:
-        return pd.DataFrame([t.__dict__ for t in self.trades])
+        return self._trades.to_frame()
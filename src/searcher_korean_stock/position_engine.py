@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtester import BacktestResult
+from .instrumentation import instruments
+from .portfolio import Portfolio, TradeRecord
+from .strategy import select_candidates
+
+
+@dataclass
+class HoldingRules:
+    max_hold_days: int = 1              # exit at the close of this many trading days after entry
+    target: float = 0.02                # take profit, relative to entry
+    stop: float = -0.015                # fixed stop, relative to entry
+    trailing: Optional[float] = None    # e.g. 0.03: stop 3% below the highest high since entry
+    max_positions: int = 4              # open positions at most; each slot gets equity / max_positions
+    stop_first: bool = False            # a bar spanning both levels exits at the stop (default: target, as simulate)
+    gap_fill: bool = False              # a level gapped through fills at the open (default: at the level, as simulate)
+
+
+def _dense(df: pd.DataFrame, column: str, date_codes: np.ndarray, ticker_codes: np.ndarray,
+           shape: tuple) -> np.ndarray:
+    """(date x ticker) matrix of one price column; NaN where a ticker has no bar."""
+    values = np.full(shape, np.nan)
+    values[date_codes, ticker_codes] = df[column].to_numpy(dtype=float)
+    return values
+
+
+@instruments.traced('simulate_positions')
+def simulate_positions(df: pd.DataFrame, rules: Optional[HoldingRules] = None,
+                       initial_capital: float = 10_000_000,
+                       candidates: Optional[pd.DataFrame] = None) -> BacktestResult:
+    """Event-driven backtest with multi-day holds and overlapping positions.
+
+    Entries at the close of the selection date. Each later day, open positions are marked against the
+    price panel and exit at the target, the stop, or at the close once `max_hold_days` is reached
+    (a priority queue of expiry events). A bar that spans both levels exits at the target and fills are
+    at the level, as in backtester.simulate, unless `rules.stop_first` / `rules.gap_fill` say otherwise.
+    Per-day work is proportional to the number of open positions.
+    """
+    rules = rules or HoldingRules()
+    if candidates is None:
+        candidates = select_candidates(df, limit=rules.max_positions)
+
+    date_codes, dates = pd.factorize(df['date'], sort=True)
+    ticker_codes, tickers = pd.factorize(df['ticker'], sort=True)
+    shape = (len(dates), len(tickers))
+    high = _dense(df, 'high', date_codes, ticker_codes, shape)
+    low = _dense(df, 'low', date_codes, ticker_codes, shape)
+    close = _dense(df, 'close', date_codes, ticker_codes, shape)
+    opens = _dense(df, 'open', date_codes, ticker_codes, shape) if 'open' in df.columns else close
+
+    # candidates grouped by day, in score order
+    cand_day = dates.get_indexer(candidates['date'])
+    cand_col = tickers.get_indexer(candidates['ticker'])
+    cand_score = candidates['total_score'].to_numpy(dtype=float) if 'total_score' in candidates else np.zeros(len(candidates))
+    order = np.argsort(cand_day, kind='stable')
+    cand_day, cand_col, cand_score = cand_day[order], cand_col[order], cand_score[order]
+    bounds = np.searchsorted(cand_day, np.arange(len(dates) + 1))
+
+    # per-position state, at most one position per candidate
+    n_max = len(candidates)
+    col = np.zeros(n_max, dtype=np.int64)
+    entry_day = np.zeros(n_max, dtype=np.int64)
+    entry = np.zeros(n_max)
+    shares = np.zeros(n_max)
+    peak = np.zeros(n_max)
+    mark = np.zeros(n_max)
+    open_ids = np.empty(0, dtype=np.int64)
+    held = set()
+    expiries: List[tuple] = []
+    n_positions = 0
+
+    portfolio = Portfolio(initial_capital=initial_capital)
+    cash = float(initial_capital)
+    equity = float(initial_capital)
+    exit_dates: List[pd.Timestamp] = []
+    hold_days: List[int] = []
+    selection_rows: List[Dict] = []
+
+    def close_position(pid: int, day: int, price: float, result: str) -> None:
+        nonlocal cash
+        cash += shares[pid] * price
+        held.discard(col[pid])
+        ret = price / entry[pid] - 1
+        portfolio.log_trade(TradeRecord(
+            date=dates[entry_day[pid]],
+            ticker=tickers[col[pid]],
+            buy_price=entry[pid],
+            sell_price=price,
+            return_pct=ret,
+            result=result,
+        ))
+        exit_dates.append(dates[day])
+        hold_days.append(day - entry_day[pid])
+
+    for d in range(len(dates)):
+        if open_ids.size:
+            c = col[open_ids]
+            day_high, day_low, day_open = high[d, c], low[d, c], opens[d, c]
+            base = entry[open_ids]
+            stop_level = base * (1 + rules.stop)
+            if rules.trailing is not None:
+                stop_level = np.maximum(stop_level, peak[open_ids] * (1 - rules.trailing))
+            target_level = base * (1 + rules.target)
+
+            hit_stop = day_low <= stop_level
+            hit_target = day_high >= target_level
+            if rules.stop_first:
+                hit_target &= ~hit_stop
+            else:
+                hit_stop &= ~hit_target
+            if rules.gap_fill:
+                gapped = ~np.isnan(day_open)
+                stop_fill = np.where(gapped, np.minimum(stop_level, day_open), stop_level)
+                target_fill = np.where(gapped, np.maximum(target_level, day_open), target_level)
+            else:
+                stop_fill, target_fill = stop_level, target_level
+            trailed = stop_level > base * (1 + rules.stop)
+
+            for k in np.flatnonzero(hit_stop):
+                close_position(open_ids[k], d, stop_fill[k], 'trail' if trailed[k] else 'loss')
+            for k in np.flatnonzero(hit_target):
+                close_position(open_ids[k], d, target_fill[k], 'win')
+
+            survivors = ~(hit_stop | hit_target)
+            open_ids = open_ids[survivors]
+            peak[open_ids] = np.fmax(peak[open_ids], day_high[survivors])
+            day_close = close[d, c[survivors]]
+            mark[open_ids] = np.where(np.isnan(day_close), mark[open_ids], day_close)
+
+        # expiry events due today; a ticker without a bar today is retried the next day
+        expired, retry = [], []
+        while expiries and expiries[0][0] <= d:
+            _, pid = heapq.heappop(expiries)
+            if pid not in open_ids:
+                continue
+            price = close[d, col[pid]]
+            if np.isnan(price):
+                retry.append(pid)
+                continue
+            close_position(pid, d, price, 'hold_exit')
+            expired.append(pid)
+        for pid in retry:
+            heapq.heappush(expiries, (d + 1, pid))
+        if expired:
+            open_ids = open_ids[~np.isin(open_ids, expired)]
+
+        # entries at today's close
+        slots = rules.max_positions - len(open_ids)
+        picks = [i for i in range(bounds[d], bounds[d + 1])
+                 if cand_col[i] >= 0 and cand_col[i] not in held and not np.isnan(close[d, cand_col[i]])][:max(slots, 0)]
+        if picks:
+            allocation = min(equity / rules.max_positions, cash / len(picks))
+            new_ids = []
+            for i in picks:
+                pid = n_positions
+                n_positions += 1
+                price = close[d, cand_col[i]]
+                col[pid], entry_day[pid], entry[pid] = cand_col[i], d, price
+                shares[pid] = allocation / price
+                peak[pid] = mark[pid] = price
+                cash -= allocation
+                held.add(cand_col[i])
+                heapq.heappush(expiries, (d + rules.max_hold_days, pid))
+                new_ids.append(pid)
+                selection_rows.append({
+                    'date': dates[d],
+                    'ticker': tickers[cand_col[i]],
+                    'score': cand_score[i],
+                    'allocation': allocation,
+                    'target': price * (1 + rules.target),
+                    'stop': price * (1 + rules.stop),
+                })
+            open_ids = np.concatenate([open_ids, new_ids]).astype(np.int64)
+
+        new_equity = cash + float(shares[open_ids] @ mark[open_ids])
+        portfolio.update_equity(dates[d], new_equity - equity)
+        equity = new_equity
+
+    trade_log = portfolio.to_frame()
+    if not trade_log.empty:
+        trade_log['exit_date'] = pd.DatetimeIndex(exit_dates)
+        trade_log['hold_days'] = np.asarray(hold_days, dtype=np.int64)
+    return BacktestResult(portfolio=portfolio, trade_log=trade_log, selection_log=pd.DataFrame(selection_rows))
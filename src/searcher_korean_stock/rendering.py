@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+THEMES = {
+    'light': {'bg': '#ffffff', 'fg': '#333333', 'grid': '#dddddd', 'line': '#667eea'},
+    'dark': {'bg': '#0e1117', 'fg': '#c9d1d9', 'grid': '#30363d', 'line': '#1f77b4'},
+}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets downsampling: keeps the visual shape (peaks, troughs) of y."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # bucket edges for the n - 2 interior points; first and last points are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point) is the third triangle vertex
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(area.argmax())
+        keep[i + 1] = prev
+
+    return x[keep], y[keep]
+
+
+def series_id(x: np.ndarray, y: np.ndarray) -> str:
+    """Stable id of an equity series (same values -> same id)."""
+    digest = hashlib.blake2b(digest_size=10)
+    digest.update(np.ascontiguousarray(x).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class EquityRenderer:
+    """Renders equity curves downsampled to a pixel budget, caching PNGs by every render parameter."""
+
+    def __init__(self, max_images: int = 64, max_series: int = 32):
+        self.max_images = max_images
+        self.max_series = max_series
+        self._images: 'OrderedDict[Tuple, str]' = OrderedDict()
+        self._series: 'OrderedDict[str, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _put(cache: OrderedDict, key, value, limit: int) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def register(self, x: np.ndarray, y: np.ndarray) -> str:
+        """Keep a series for later rendering / JSON export and return its id."""
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        if np.issubdtype(x.dtype, np.datetime64):
+            x = x.astype('datetime64[ms]').astype(np.int64)
+        result_id = series_id(x, y)
+        with self._lock:
+            self._put(self._series, result_id, (x.astype(float), y), self.max_series)
+        return result_id
+
+    def series(self, result_id: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        with self._lock:
+            return self._series.get(result_id)
+
+    def downsampled(self, result_id: str, points: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        data = self.series(result_id)
+        if data is None:
+            return None
+        return lttb(data[0], data[1], points)
+
+    def to_json(self, result_id: str, points: int = 500, is_time: bool = True) -> Optional[Dict]:
+        """Compact series for client-side charts: {'t': [...], 'v': [...]} with at most `points` points."""
+        sampled = self.downsampled(result_id, points)
+        if sampled is None:
+            return None
+        x, y = sampled
+        return {
+            'id': result_id,
+            't': x.astype(np.int64).tolist() if is_time else np.round(x, 3).tolist(),
+            'v': np.round(y, 0).tolist(),
+        }
+
+    def render_png(self, result_id: str, size: Tuple[int, int] = (1000, 400), theme: str = 'light',
+                   dpi: int = 100, time_axis: bool = True) -> Optional[str]:
+        """Base64 PNG of the series; one point per horizontal pixel at most."""
+        key = (result_id, tuple(size), theme, dpi, time_axis)
+        with self._lock:
+            cached = self._images.get(key)
+            if cached is not None:
+                self._images.move_to_end(key)
+                return cached
+
+        sampled = self.downsampled(result_id, size[0])
+        if sampled is None:
+            return None
+        x, y = sampled
+        if time_axis:
+            x = x.astype('datetime64[ms]')
+
+        colors = THEMES.get(theme, THEMES['light'])
+        fig, ax = plt.subplots(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+        fig.patch.set_facecolor(colors['bg'])
+        ax.set_facecolor(colors['bg'])
+        ax.plot(x, y, color=colors['line'], linewidth=1.5)
+        ax.fill_between(x, y, y.min(), alpha=0.2, color=colors['line'])
+        ax.grid(True, color=colors['grid'], alpha=0.6)
+        ax.tick_params(colors=colors['fg'])
+        for spine in ax.spines.values():
+            spine.set_color(colors['grid'])
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', facecolor=colors['bg'])
+        plt.close(fig)
+        encoded = base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+        with self._lock:
+            self._put(self._images, key, encoded, self.max_images)
+        return encoded
+
+
+# shared instance
+renderer = EquityRenderer()
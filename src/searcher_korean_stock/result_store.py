@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .column_file import open_column_file, write_column_file
+
+MANIFEST_FILE = 'manifest.json'
+
+# streams written by simulate (column order of each batch file)
+STREAMS = {
+    'trades': ('date', 'ticker', 'buy_price', 'sell_price', 'return_pct', 'result'),
+    'selections': ('date', 'ticker', 'score', 'allocation', 'target', 'stop'),
+    'equity': ('date', 'equity'),
+}
+
+
+class ResultSink:
+    """Buffers backtest rows per stream and writes every `batch_size` rows as one column file.
+
+    Layout: <root>/<stream>-<seq>.bin (see column_file) plus <root>/manifest.json, written by close().
+    At most `batch_size` rows per stream are held in memory.
+    """
+
+    def __init__(self, root: str, batch_size: int = 50_000):
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._buffers: Dict[str, Dict[str, list]] = {
+            stream: {column: [] for column in columns} for stream, columns in STREAMS.items()
+        }
+        self._batches: Dict[str, List[Dict[str, Any]]] = {stream: [] for stream in STREAMS}
+        self.rows: Dict[str, int] = {stream: 0 for stream in STREAMS}
+
+    def write(self, stream: str, row: Dict[str, Any]) -> None:
+        buffer = self._buffers[stream]
+        for column, values in buffer.items():
+            values.append(row[column])
+        self.rows[stream] += 1
+        if len(buffer['date']) >= self.batch_size:
+            self.flush(stream)
+
+    def flush(self, stream: Optional[str] = None) -> None:
+        for name in ([stream] if stream else list(STREAMS)):
+            buffer = self._buffers[name]
+            if not buffer['date']:
+                continue
+            frame = pd.DataFrame(buffer)
+            frame['date'] = pd.to_datetime(frame['date'])
+            file = f'{name}-{len(self._batches[name]):05d}.bin'
+            layout = write_column_file(str(self.root / file), frame)
+            self._batches[name].append(dict(layout, file=file))
+            for values in buffer.values():
+                values.clear()
+
+    def close(self, meta: Optional[Dict[str, Any]] = None) -> 'ResultStore':
+        """Flush every stream, write the manifest (atomically) and return a reader."""
+        self.flush()
+        manifest = {'meta': meta or {}, 'rows': self.rows, 'streams': self._batches}
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, default=str)
+        os.replace(tmp, self.root / MANIFEST_FILE)
+        return ResultStore(self.root)
+
+
+class ResultStore:
+    """Read side of a closed ResultSink directory."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        with open(self.root / MANIFEST_FILE, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.manifest['meta']
+
+    def rows(self, stream: str) -> int:
+        return self.manifest['rows'][stream]
+
+    def iter_batches(self, stream: str) -> Iterator[pd.DataFrame]:
+        """One memory-mapped frame per batch file, in write order."""
+        for layout in self.manifest['streams'][stream]:
+            yield open_column_file(str(self.root / layout['file']), layout)
+
+    def read(self, stream: str) -> pd.DataFrame:
+        """Whole stream as one frame (empty frame when nothing was written)."""
+        batches = list(self.iter_batches(stream))
+        if not batches:
+            return pd.DataFrame()
+        return pd.concat(batches, ignore_index=True)
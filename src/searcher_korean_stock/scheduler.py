@@ -1,11 +1,14 @@
 """
 자동 추적 스케줄러
 """
+import os
 import time
 from datetime import datetime, timedelta
 from typing import Callable, Optional
 import threading
 
+import pandas as pd
+
 try:
     import schedule
 except ImportError as e:
@@ -15,26 +18,60 @@ from .data_loader import loader
 from .engine import DayTradeSearchEngine
 from .config import SearchConfig, DEFAULT_CONFIG
 from .tracker import tracker
+from .instrumentation import instruments
+from .snapshot import snapshots
+from .kernels import warmup
 
 
 class AutoTracker:
     """자동 추적 스케줄러"""
     
-    def __init__(self, config: SearchConfig = None):
+    def __init__(self, config: SearchConfig = None,
+                 metrics_path: str = os.path.join(".tracking", "metrics.jsonl"),
+                 snapshot_days: int = 60):
         """초기화"""
         self.config = config or DEFAULT_CONFIG
         self.engine = DayTradeSearchEngine(self.config)
+        self.metrics_path = metrics_path
+        self.snapshot_days = snapshot_days
         self.running = False
         self.scheduler_thread = None
     
+    def _flush_metrics(self, job: str) -> None:
+        """계측이 켜져 있으면 작업별 단계 기록을 JSON lines로 저장"""
+        if instruments.enabled:
+            instruments.write_jsonl(self.metrics_path, job=job)
+    
+    def build_snapshot(self) -> Optional[str]:
+        """
+        장 마감 스냅샷 빌드 (데이터 로드, 지표, 후보, 백테스트를 한 번만 계산해 화면들과 공유)
+        
+        Returns:
+            새 스냅샷 버전 (데이터가 없으면 None)
+        """
+        # 데이터 로드 (스냅샷은 화면들이 조건을 바꿔 가며 공유하므로 사전 필터 없이 전체 종목)
+        data = loader.prepare_data(days=self.snapshot_days)
+        panel = loader.to_panel(data)
+        if panel.empty:
+            return None
+        version = snapshots.build(panel, self.config, meta={"days": self.snapshot_days})
+        print(f"스냅샷 생성: {version}")
+        return version
+    
     def run_daily_search(self) -> None:
-        """매일 장 종료 후 검색 실행"""
+        """매일 장 종료 후 스냅샷 빌드 및 검색 실행"""
         try:
             today = datetime.now().strftime("%Y-%m-%d")
             print(f"[{today}] 검색 시작...")
             
-            # 데이터 로드
-            candidates_df = loader.get_today_candidates()
+            # 새 분할/병합 이벤트를 먼저 반영 (조정 계수가 오래되면 수정주가가 원시 가격으로 남음)
+            added = loader.update_all_splits()
+            if added:
+                print(f"[{today}] 기업 이벤트 {added}건 반영")
+            
+            # 스냅샷 빌드 후 최신 행으로 검색 (화면들은 같은 스냅샷을 읽음)
+            version = self.build_snapshot()
+            candidates_df = snapshots.current().frame("today") if version else pd.DataFrame()
             
             if candidates_df.empty:
                 print(f"[{today}] 데이터를 불러올 수 없습니다.")
@@ -50,6 +87,8 @@ class AutoTracker:
             
         except Exception as e:
             print(f"검색 중 오류: {e}")
+        finally:
+            self._flush_metrics("daily_search")
     
     def run_daily_tracking(self) -> None:
         """매일 장 종료 후 이전 검색 결과 추적"""
@@ -63,8 +102,12 @@ class AutoTracker:
                 print(f"[{yesterday}] 어제 검색 결과가 없습니다.")
                 return
             
-            # 데이터 로드 (60일)
-            price_data = loader.prepare_data(days=60)
+            # 오늘 스냅샷이 있으면 재사용, 없으면 데이터 로드 (60일)
+            snapshot = snapshots.current()
+            if snapshot is not None and snapshot.created_at[:10] == datetime.now().strftime("%Y-%m-%d"):
+                price_data = snapshot.price_data()
+            else:
+                price_data = loader.prepare_data(days=60)
             
             # 추적 결과 업데이트
             tracker.update_tracking_results(yesterday, price_data)
@@ -81,6 +124,8 @@ class AutoTracker:
             
         except Exception as e:
             print(f"추적 중 오류: {e}")
+        finally:
+            self._flush_metrics("daily_tracking")
     
     def schedule_jobs(self, search_time: str = "15:50", tracking_time: str = "16:00") -> None:
         """
@@ -118,6 +163,7 @@ class AutoTracker:
         
         self.running = True
         self.schedule_jobs(search_time, tracking_time)
+        warmup()  # 계산 커널 JIT 컴파일을 미리 (첫 작업이 컴파일 시간을 떠안지 않도록)
         
         def scheduler_loop():
             print("📅 스케줄러 시작됨")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from typing import Dict, Optional
+
 import pandas as pd
 
+from .instrumentation import instruments
+
 
-def score_candidates(df: pd.DataFrame) -> pd.DataFrame:
+@instruments.traced('score_candidates')
+def score_candidates(df: pd.DataFrame, cross_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Weighted score; `cross_weights` adds {cross-sectional column: weight} terms (e.g. rel_volume)."""
     scored = df.copy()
 
     scored['score_amount'] = (scored['amount'] / scored['amount_avg20']).clip(0, 10)
@@ -14,6 +20,8 @@ def score_candidates(df: pd.DataFrame) -> pd.DataFrame:
     scored['total_score'] = (
         scored['score_amount'] * 0.4 + scored['score_close_to_high'] * 0.25 + scored['score_volatility'] * 0.2 + scored['score_ma'] * 0.15
     )
+    for column, weight in (cross_weights or {}).items():
+        scored['total_score'] += scored[column].fillna(0) * weight
 
     scored.sort_values(['date', 'total_score'], ascending=[True, False], inplace=True)
     return scored
@@ -0,0 +1,287 @@
+"""
+장 마감 스냅샷 - 하루치 준비 결과(패널, 지표, 후보, 백테스트)를 한 번 만들어 모든 화면이 공유
+
+AutoTracker가 장 마감 후 한 번 빌드하고, Streamlit / Flask는 최신 버전을 메모리 맵으로 연다.
+버전 디렉터리는 만든 뒤 다시 쓰지 않고, LATEST 포인터 파일만 원자적으로 교체한다.
+
+디렉터리 구조:
+    .snapshots/
+        LATEST                          최신 버전 이름
+        <YYYYMMDD-HHMMSS>-<해시>/
+            manifest.json               버전, 생성 시각, 프레임별 열 레이아웃, 메타데이터
+            <프레임>.bin                 열 버퍼 파일 (column_file, 읽기 전용 메모리 맵)
+
+프레임은 프로세스마다 복사하지 않고 같은 파일을 메모리 맵으로 열므로, gunicorn 워커를 늘려도
+패널 메모리는 한 벌만 쓴다. 어느 프로세스든 write() / publish()로 LATEST를 원자적으로 바꿀 수 있다.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import SearchConfig, DEFAULT_CONFIG, fingerprint
+from .engine import DayTradeSearchEngine, BacktestEngine, data_version
+from .instrumentation import instruments
+from .strategy import select_candidates
+from .backtester import simulate
+from .column_file import write_column_file, open_column_file
+
+
+# filter_candidates가 요구하는 장중 열 (없는 패널은 후보/시뮬레이션 단계를 건너뜀)
+FILTER_COLUMNS = ('open', 'amount', 'after_13_amount', 'after_13_low', 'market_cap')
+
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "manifest.json"
+
+
+def config_key(config: SearchConfig) -> str:
+    """설정 전체의 지문 (스냅샷 백테스트를 그대로 쓸 수 있는지 비교용)"""
+    return fingerprint(config)
+
+
+class Snapshot:
+    """읽기 전용 스냅샷 한 버전 (프레임은 처음 요청할 때 메모리 맵으로 열고 재사용)"""
+
+    def __init__(self, path: str):
+        """초기화 (manifest만 읽음)"""
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.version: str = self.manifest["version"]
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._price_data: Optional[Dict[str, pd.DataFrame]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.manifest.get("meta", {})
+
+    @property
+    def created_at(self) -> str:
+        return self.manifest["created_at"]
+
+    def has(self, name: str) -> bool:
+        return name in self.manifest["frames"]
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """
+        저장된 프레임 (숫자/날짜 열은 디스크 페이지를 그대로 공유하는 읽기 전용 배열)
+
+        수정이 필요하면 호출하는 쪽에서 복사해서 쓴다.
+        """
+        with self._lock:
+            df = self._frames.get(name)
+            if df is None:
+                layout = self.manifest["frames"].get(name)
+                if layout is None:
+                    raise KeyError(f"스냅샷 {self.version}에 '{name}' 프레임이 없습니다")
+                df = open_column_file(os.path.join(self.path, f"{name}.bin"), layout)
+                self._frames[name] = df
+            return df
+
+    def price_data(self) -> Dict[str, pd.DataFrame]:
+        """
+        패널을 {ticker: 날짜 인덱스 DataFrame}으로 (prepare_data 결과와 같은 형태, 프로세스당 한 번 생성)
+
+        패널은 (ticker, date) 순으로 저장되어 있어 종목별 구간이 연속이므로, 각 DataFrame은
+        메모리 맵의 행 구간을 그대로 가리킨다 (date / ticker / stock_name 열도 남아 있음).
+        """
+        if self._price_data is None:
+            panel = self.frame("panel")
+            tickers = panel['ticker'].to_numpy()
+            dates = pd.DatetimeIndex(panel['date'].to_numpy())
+            starts = np.flatnonzero(np.r_[True, tickers[1:] != tickers[:-1]]) if len(tickers) else np.empty(0, dtype=int)
+            ends = np.r_[starts[1:], len(panel)]
+            data = {}
+            for start, end in zip(starts, ends):
+                df = panel.iloc[start:end]
+                df.index = dates[start:end]
+                data[tickers[start]] = df
+            self._price_data = data
+        return self._price_data
+
+    def replay_backtest(self) -> Optional[Dict[str, Any]]:
+        """저장된 히스토리 재현 백테스트 (BacktestEngine.simulate_replay 형식, 없으면 None)"""
+        summary = self.meta.get("replay_backtest")
+        if summary is None or not self.has("replay_trades"):
+            return None
+        trades = self.frame("replay_trades").copy()
+        trades['date'] = pd.to_datetime(trades['date'])
+        equity = self.frame("replay_equity")
+        result = dict(summary)
+        result['trades'] = trades.to_dict('records')
+        result['daily_equity'] = [summary['initial_capital']] + equity['equity'].tolist()
+        result['dates'] = [None] + list(pd.to_datetime(equity['date']))
+        return result
+
+
+class SnapshotStore:
+    """스냅샷 빌드 (AutoTracker) 및 최신 버전 조회 (Streamlit / Flask)"""
+
+    def __init__(self, root: str = ".snapshots", keep: int = 3):
+        """
+        초기화
+
+        Args:
+            root: 스냅샷 디렉터리
+            keep: 빌드 후 남겨둘 버전 수 (이미 열린 메모리 맵은 삭제되어도 계속 유효)
+        """
+        self.root = root
+        self.keep = keep
+        self._current: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+
+    def latest_version(self) -> Optional[str]:
+        """LATEST 포인터가 가리키는 버전 (없으면 None)"""
+        try:
+            with open(os.path.join(self.root, LATEST_FILE), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current(self) -> Optional[Snapshot]:
+        """
+        최신 스냅샷 (버전이 바뀌었을 때만 새로 열고, 같으면 열어둔 것을 재사용)
+
+        요청마다 불러도 포인터 파일 하나만 읽는다.
+        """
+        version = self.latest_version()
+        if version is None:
+            return None
+        with self._lock:
+            if self._current is None or self._current.version != version:
+                path = os.path.join(self.root, version)
+                if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                    return self._current
+                self._current = Snapshot(path)
+            return self._current
+
+    def publish(self, version: str) -> None:
+        """
+        LATEST 포인터 교체 (임시 파일에 쓴 뒤 교체, 이전 버전으로 되돌릴 때도 사용)
+
+        다른 프로세스들은 다음 current() 호출에서 새 버전을 연다.
+        """
+        if not os.path.isfile(os.path.join(self.root, version, MANIFEST_FILE)):
+            raise FileNotFoundError(f"스냅샷 버전이 없습니다: {version}")
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, LATEST_FILE))
+
+    def _prune(self, latest: str) -> None:
+        """오래된 버전 삭제 (최신 keep개 유지, 실패하면 다음 빌드 때 다시 시도)"""
+        versions = sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith(".") and os.path.isfile(os.path.join(self.root, name, MANIFEST_FILE))
+        )
+        for name in versions[:-self.keep]:
+            if name != latest:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def write(self, frames: Dict[str, pd.DataFrame], meta: Dict[str, Any] = None) -> str:
+        """
+        프레임 묶음을 새 버전으로 저장하고 LATEST로 지정
+
+        임시 디렉터리에 모두 쓴 뒤 이름을 바꾸므로, 읽는 쪽은 완성된 버전만 본다.
+
+        Returns:
+            새 버전 이름
+        """
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha1()
+        for name in sorted(frames):
+            digest.update(name.encode('utf-8'))
+            digest.update(data_version(frames[name]).encode('utf-8'))
+        created_at = datetime.now()
+        version = f"{created_at:%Y%m%d-%H%M%S}-{digest.hexdigest()[:8]}"
+        if os.path.exists(os.path.join(self.root, version, MANIFEST_FILE)):
+            # 같은 시각에 같은 내용으로 이미 빌드됨
+            self.publish(version)
+            return version
+
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix=".build-")
+        try:
+            manifest = {
+                "version": version,
+                "created_at": created_at.isoformat(timespec='seconds'),
+                "frames": {name: write_column_file(os.path.join(tmp_dir, f"{name}.bin"), df) for name, df in frames.items()},
+                "meta": meta or {},
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp_dir, os.path.join(self.root, version))
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.publish(version)
+        self._prune(version)
+        return version
+
+    @instruments.traced('build_snapshot')
+    def build(self, panel: pd.DataFrame, config: SearchConfig = None,
+              meta: Dict[str, Any] = None, top_n: int = 5, min_conditions: int = 3) -> str:
+        """
+        준비된 패널로 하루치 결과를 모두 계산해 새 스냅샷으로 저장
+
+        Args:
+            panel: (날짜, 종목) 행의 지표 포함 패널 (loader.to_panel 결과)
+            config: 검색 설정
+            meta: 함께 저장할 정보 (예: 조회 기간)
+            top_n: 히스토리 재현 시 날짜별 상위 종목 수
+            min_conditions: 히스토리 재현 최소 충족 조건 수
+
+        Returns:
+            새 버전 이름
+        """
+        config = config or DEFAULT_CONFIG
+        meta = dict(meta or {})
+        meta["config_key"] = config_key(config)
+
+        # 검색용 최신 행 (get_today_candidates와 같은 내용)
+        panel = panel.sort_values(['ticker', 'date'], kind='stable').reset_index(drop=True)
+        frames = {
+            "panel": panel,
+            "today": panel.groupby('ticker', sort=False).tail(1).reset_index(drop=True),
+        }
+
+        # 히스토리 재현 백테스트 (app.py의 '히스토리 재현'과 같은 계산, 다음날 고가가 있는 패널만)
+        if 'next_high' in panel.columns:
+            self._add_replay(frames, meta, panel, config, top_n, min_conditions)
+
+        # 장중 열이 있는 패널이면 필터/점수 후보와 시뮬레이션도 저장 (web_app 화면용)
+        if all(c in panel.columns for c in FILTER_COLUMNS):
+            # 날짜별 상위 종목 (web_app 실시간 검색의 select_candidates와 같은 행)
+            frames["candidates"] = select_candidates(panel).reset_index(drop=True)
+            result = simulate(panel)
+            frames["trades"] = result.trade_log.reset_index(drop=True)
+            frames["equity"] = pd.DataFrame({'date': result.portfolio.dates, 'equity': result.portfolio.equity_curve[1:]})
+            meta["backtest"] = {k: v for k, v in result.metrics.items() if not isinstance(v, pd.Series)}
+
+        return self.write(frames, meta)
+
+    @staticmethod
+    def _add_replay(frames: Dict[str, pd.DataFrame], meta: Dict[str, Any], panel: pd.DataFrame,
+                    config: SearchConfig, top_n: int, min_conditions: int) -> None:
+        picks = DayTradeSearchEngine(config).replay(panel, config, top_n=top_n, min_conditions=min_conditions)
+        backtest = BacktestEngine(config).simulate_replay(picks)
+        frames["replay_picks"] = picks
+        frames["replay_trades"] = pd.DataFrame(
+            backtest['trades'], columns=['date', 'ticker', 'buy_price', 'sell_price', 'shares', 'pnl_amount', 'pnl_pct', 'win'])
+        frames["replay_equity"] = pd.DataFrame({'date': backtest['dates'][1:], 'equity': backtest['daily_equity'][1:]})
+        meta["replay_backtest"] = {
+            k: v for k, v in backtest.items() if k not in ('trades', 'daily_equity', 'dates')
+        }
+        meta["replay_backtest"]["initial_capital"] = config.backtest.initial_capital
+
+
+# 전역 인스턴스
+snapshots = SnapshotStore()
@@ -1,10 +1,33 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
-
-def _compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
+from .adjustments import AdjustmentStore
+from .cross_section import CROSS_SECTIONAL_FEATURES, add_cross_sectional
+from .funnel import funnel_report
+from .instrumentation import instruments
+from .kernels import group_starts, rolling_max, rolling_min
+
+
+# 최종 통과 관문: 관문끼리는 AND, 관문 안의 규칙끼리는 OR
+FILTER_GATES = {
+    'cond_amount|cond_candle|cond_trend': ('cond_amount', 'cond_candle', 'cond_trend'),  # AND에서 OR로 변경: 하나라도 만족하면 OK
+    'cond_volatility': ('cond_volatility',),
+    'cond_afternoon': ('cond_afternoon',),
+    'cond_day_change': ('cond_day_change',),
+    'cond_spec': ('cond_spec',),
+    'exclude_limit_up': ('exclude_limit_up',),
+    'exclude_long_wick': ('exclude_long_wick',),
+    'exclude_recent_big_drop': ('exclude_recent_big_drop',),
+    'exclude_volume_decline': ('exclude_volume_decline',),
+}
+
+
+@instruments.traced('_compute_indicators')
+def _compute_indicators(df: pd.DataFrame, features=CROSS_SECTIONAL_FEATURES) -> pd.DataFrame:
     df = df.copy()
     df.sort_values(['ticker', 'date'], inplace=True)
 
@@ -15,7 +38,8 @@ def _compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['amount_avg20'] = grouped['amount'].transform(lambda x: x.rolling(20).mean())
     df['range_pct'] = (df['high'] - df['low']) / df['close']
     df['range_avg10'] = grouped['range_pct'].transform(lambda x: x.rolling(10).mean())
-    df['high_max20'] = grouped['high'].transform(lambda x: x.rolling(20).max())
+    starts = group_starts(df['ticker'].to_numpy())
+    df['high_max20'] = rolling_max(df['high'].to_numpy(dtype=float), 20, starts)
 
     # daily change vs previous close
     prev_close = grouped['close'].shift(1)
@@ -25,8 +49,8 @@ def _compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['vol_ma5'] = grouped['volume'].transform(lambda x: x.rolling(5).mean())
     df['vol_ma5_prev'] = df.groupby('ticker')['vol_ma5'].shift(5)
 
-    # percentile rank of amount per day
-    df['amount_rank_pct'] = df.groupby('date')['amount'].rank(pct=True, method='max')
+    # per-date ranks / z-scores (amount_rank_pct, ...) in one sorted pass
+    add_cross_sectional(df, features)
 
     # wick lengths
     body = (df['close'] - df['open']).abs()
@@ -38,8 +62,18 @@ def _compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def filter_candidates(df: pd.DataFrame) -> pd.DataFrame:
-    df = _compute_indicators(df)
+@instruments.traced('filter_candidates')
+def filter_candidates(df: pd.DataFrame, funnel: bool = False, features=CROSS_SECTIONAL_FEATURES,
+                      adjustments: Optional[AdjustmentStore] = None):
+    """Return candidate rows; with funnel=True return (candidates, FunnelReport).
+
+    `features` are the cross-sectional columns added before filtering (must include amount_rank_pct).
+    A raw CSV panel is unadjusted; pass `adjustments` (e.g. loader.adjustments) to filter on
+    split-adjusted prices. Panels built from prepare_data are adjusted already.
+    """
+    if adjustments is not None:
+        df = adjustments.adjust_panel(df)
+    df = _compute_indicators(df, features)
 
     # 필수 조건: 거래량 (완화됨)
     cond_amount = (df['amount'] >= 2 * df['amount_avg20']) | (df['amount_rank_pct'] >= 0.8)
@@ -87,19 +121,36 @@ def filter_candidates(df: pd.DataFrame) -> pd.DataFrame:
     # 제외 조건 (완화)
     exclude_limit_up = (df['close'] >= df['high'] * 0.999) & (df['prev_change'] > 0.3)  # 0.25 -> 0.3
     exclude_long_wick = (df['upper_wick_ratio'] > 0.5) | (df['lower_wick_ratio'] > 0.5)  # 0.35 -> 0.5
-    exclude_recent_big_drop = df.groupby('ticker')['prev_change'].transform(lambda x: x.rolling(5).min()) <= -0.08  # -0.05 -> -0.08
+    starts = group_starts(df['ticker'].to_numpy())
+    recent_min_change = pd.Series(rolling_min(df['prev_change'].to_numpy(dtype=float), 5, starts), index=df.index)
+    exclude_recent_big_drop = recent_min_change <= -0.08  # -0.05 -> -0.08
     exclude_volume_decline = df['vol_ma5'] < df['vol_ma5_prev'] * 0.5  # 완화: 50% 이상 감소만 제외
 
-    candidates = df[
-        (cond_amount | cond_candle | cond_trend)  # AND에서 OR로 변경: 하나라도 만족하면 OK
-        & cond_volatility
-        & (cond_afternoon | df['after_13_amount'].isna())  # 오후 데이터 없으면 제외 안 함
-        & (cond_day_change | df['prev_change'].isna())  # 이전 데이터 없으면 제외 안 함
-        & (cond_spec | df['market_cap'].isna())  # 시가총액 없으면 제외 안 함
-        & (~exclude_limit_up)
-        & (~exclude_long_wick)
-        & (~exclude_recent_big_drop)
-        & (~exclude_volume_decline | df['vol_ma5_prev'].isna())  # 과거 거래량 없으면 제외 안 함
-    ].copy()
-
+    # 규칙별 통과 마스크 (결측 허용은 원래 조건식 그대로 반영, exclude_*는 제외되지 않은 행)
+    rules = {
+        'cond_amount': cond_amount,
+        'cond_candle': cond_candle,
+        'cond_trend': cond_trend,
+        'cond_volatility': cond_volatility,
+        'cond_afternoon': cond_afternoon | df['after_13_amount'].isna(),  # 오후 데이터 없으면 제외 안 함
+        'cond_day_change': cond_day_change | df['prev_change'].isna(),  # 이전 데이터 없으면 제외 안 함
+        'cond_spec': cond_spec | df['market_cap'].isna(),  # 시가총액 없으면 제외 안 함
+        'exclude_limit_up': ~exclude_limit_up,
+        'exclude_long_wick': ~exclude_long_wick,
+        'exclude_recent_big_drop': ~exclude_recent_big_drop,
+        'exclude_volume_decline': ~exclude_volume_decline | df['vol_ma5_prev'].isna(),  # 과거 거래량 없으면 제외 안 함
+    }
+
+    passed = np.ones(len(df), dtype=bool)
+    for members in FILTER_GATES.values():
+        gate = np.zeros(len(df), dtype=bool)
+        for member in members:
+            gate |= rules[member].to_numpy(dtype=bool)
+        passed &= gate
+
+    candidates = df[passed].copy()
+
+    if funnel:
+        report = funnel_report({k: v.to_numpy(dtype=bool) for k, v in rules.items()}, df['date'], FILTER_GATES)
+        return candidates, report
     return candidates
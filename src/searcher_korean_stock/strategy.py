@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from typing import Dict, Optional
+
 import pandas as pd
 
 from .stock_filter import filter_candidates
 from .scorer import score_candidates
 
 
-def select_candidates(df: pd.DataFrame, limit: int = 4) -> pd.DataFrame:
+def select_candidates(df: pd.DataFrame, limit: int = 4,
+                      cross_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
     filtered = filter_candidates(df)
-    scored = score_candidates(filtered)
+    scored = score_candidates(filtered, cross_weights)
     top = scored.groupby('date').head(limit)
     return top
@@ -0,0 +1,154 @@
+"""
+종목 마스터 - 종목 코드 / 한글 종목명 / 영문 종목명 조회
+
+KRX 상장 종목 목록을 한 번 읽어 정렬된 배열로 들고 있고, 접두어 검색(자동완성)과
+코드 → 종목명 일괄 변환을 모두 이진 탐색(searchsorted)으로 처리한다.
+"""
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .universe import MARKET_SUFFIX
+
+
+# 목록 파일이 없을 때 쓰는 기본 종목 (SAMPLE_TICKERS)
+DEFAULT_LISTING = [
+    ('005930', '삼성전자', 'Samsung Electronics', 'KOSPI'),
+    ('000660', 'SK하이닉스', 'SK Hynix', 'KOSPI'),
+    ('051910', 'LG화학', 'LG Chem', 'KOSPI'),
+    ('207940', '삼성바이오로직스', 'Samsung Biologics', 'KOSPI'),
+    ('006400', '삼성SDI', 'Samsung SDI', 'KOSPI'),
+    ('035720', '카카오', 'Kakao', 'KOSPI'),
+    ('012330', '현대모비스', 'Hyundai Mobis', 'KOSPI'),
+    ('005380', '현대차', 'Hyundai Motor', 'KOSPI'),
+    ('055550', '신한지주', 'Shinhan Financial Group', 'KOSPI'),
+    ('032830', '삼성생명', 'Samsung Life Insurance', 'KOSPI'),
+]
+
+
+def _normalize(values: Iterable[str]) -> np.ndarray:
+    """검색 키 정규화 (소문자, 공백 제거)"""
+    return np.array([str(v).lower().replace(' ', '') for v in values], dtype=str)
+
+
+class SymbolMaster:
+    """
+    종목 마스터 (코드, 종목명, 영문 종목명, 시장)
+
+    목록 CSV 컬럼: code,name,name_en,market (`market`은 KOSPI/KOSDAQ)
+    파일이 없으면 DEFAULT_LISTING을 사용한다.
+    """
+
+    def __init__(self, listing_path: str = os.path.join("data", "krx_listing.csv")):
+        """초기화 (목록은 처음 사용할 때 로드)"""
+        self.listing_path = listing_path
+        self._mtime: Optional[float] = None
+        self._loaded = False
+
+    def _load(self) -> None:
+        """목록 로드 및 색인 생성 (파일이 바뀌었을 때만 다시 읽음)"""
+        mtime = os.path.getmtime(self.listing_path) if os.path.exists(self.listing_path) else None
+        if self._loaded and mtime == self._mtime:
+            return
+
+        if mtime is not None:
+            df = pd.read_csv(self.listing_path, dtype={'code': str})
+        else:
+            df = pd.DataFrame(DEFAULT_LISTING, columns=['code', 'name', 'name_en', 'market'])
+        df['code'] = df['code'].str.zfill(6)
+        df['name_en'] = df['name_en'].fillna('') if 'name_en' in df.columns else ''
+        df['market'] = df['market'].fillna('KOSPI').str.upper()
+        df = df.drop_duplicates('code').sort_values('code').reset_index(drop=True)
+
+        # 코드순 정렬 배열 (일괄 조인용)
+        self.codes = df['code'].to_numpy(dtype=str)
+        self.names = df['name'].to_numpy(dtype=object)
+        self.names_en = df['name_en'].to_numpy(dtype=object)
+        self.tickers = (df['code'] + df['market'].map(MARKET_SUFFIX).fillna('.KS')).to_numpy(dtype=object)
+
+        # 접두어 색인: 정규화 키 정렬 배열 + 원래 행 번호
+        self._index = {}
+        for field, values in (('code', self.codes), ('name', self.names), ('name_en', self.names_en)):
+            keys = _normalize(values)
+            order = np.argsort(keys, kind='stable')
+            self._index[field] = (keys[order], order)
+
+        self._mtime = mtime
+        self._loaded = True
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self.codes)
+
+    def _prefix_rows(self, field: str, prefix: str) -> np.ndarray:
+        keys, order = self._index[field]
+        lo = np.searchsorted(keys, prefix, side='left')
+        hi = np.searchsorted(keys, prefix + '\U0010ffff', side='left')
+        return order[lo:hi]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        접두어 검색 (자동완성) - 코드, 종목명, 영문 종목명 순으로 일치 항목 반환
+
+        Args:
+            query: 검색어 (예: '0059', '삼성', 'hyundai')
+            limit: 최대 결과 수
+
+        Returns:
+            [{'ticker', 'code', 'name', 'name_en'}, ...]
+        """
+        self._load()
+        prefix = _normalize([query])[0]
+        if not prefix:
+            return []
+
+        rows: List[int] = []
+        seen = set()
+        for field in ('code', 'name', 'name_en'):
+            for row in self._prefix_rows(field, prefix):
+                if row not in seen:
+                    seen.add(row)
+                    rows.append(row)
+                if len(rows) >= limit:
+                    break
+            if len(rows) >= limit:
+                break
+
+        return [
+            {'ticker': self.tickers[r], 'code': str(self.codes[r]), 'name': self.names[r], 'name_en': self.names_en[r]}
+            for r in rows
+        ]
+
+    def names_for(self, tickers: Iterable[str], english: bool = False) -> np.ndarray:
+        """
+        코드 → 종목명 일괄 변환 ('005930.KS', '005930' 모두 가능, 모르는 종목은 입력값 그대로)
+
+        Args:
+            tickers: 종목 코드들
+            english: 영문 종목명 사용 여부
+
+        Returns:
+            종목명 배열 (입력 순서)
+        """
+        self._load()
+        tickers = np.asarray(list(tickers), dtype=object)
+        if len(tickers) == 0 or len(self.codes) == 0:
+            return tickers.copy()
+
+        codes = np.char.partition(tickers.astype(str), '.')[:, 0]
+        pos = np.searchsorted(self.codes, codes).clip(max=len(self.codes) - 1)
+        found = self.codes[pos] == codes
+        names = np.where(self.names_en != '', self.names_en, self.names) if english else self.names
+        result = tickers.copy()
+        result[found] = names[pos[found]]
+        return result
+
+    def name(self, ticker: str, english: bool = False) -> str:
+        """단일 종목명 (모르면 입력값 그대로)"""
+        return self.names_for([ticker], english)[0]
+
+
+# 전역 인스턴스
+symbols = SymbolMaster()
@@ -4,10 +4,14 @@
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterable, List, Optional, Union
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass, asdict
 
+from .config import pack_conditions
+from .instrumentation import instruments
+
 @dataclass
 class TrackingResult:
     """추적 결과"""
@@ -21,6 +25,25 @@ class TrackingResult:
     score: float
     achieved: bool  # +1% 달성 여부
     actual_return: float  # 실제 수익률
+    conditions_mask: int = 0  # 충족 조건 비트마스크
+    rank: int = 0  # 검색 순위
+
+
+# 추적 결과 열 → 자료형 (query가 돌려주는 열 순서)
+HISTORY_COLUMNS = {
+    "date": "datetime64[ns]",
+    "ticker": object,
+    "stock_name": object,
+    "rank": np.int64,
+    "buy_price": float,
+    "next_day_high": float,
+    "next_day_close": float,
+    "conditions_met": np.int64,
+    "conditions_mask": np.int64,
+    "score": float,
+    "achieved": bool,
+    "actual_return": float,
+}
 
 
 class SearchTracker:
@@ -31,6 +54,8 @@ class SearchTracker:
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         self.db_file = os.path.join(data_dir, "tracking.json")
+        self._history: Optional[pd.DataFrame] = None
+        self._ticker_rows: Dict[str, np.ndarray] = {}
         self._load_db()
     
     def _load_db(self) -> None:
@@ -43,9 +68,27 @@ class SearchTracker:
                 self.db = {}
         else:
             self.db = {}
+        self._migrate_condition_masks()
+        self._history = None
     
+    def _migrate_condition_masks(self) -> None:
+        """예전 형식(conditions_detail 딕셔너리)을 비트마스크로 변환"""
+        for data in self.db.values():
+            masks, ranks = {}, {}
+            for result in data.get("search_results", []):
+                detail = result.pop("conditions_detail", None)
+                if detail is not None and "conditions_mask" not in result:
+                    result["conditions_mask"] = pack_conditions(detail)
+                masks[result.get("ticker")] = result.get("conditions_mask", 0)
+                ranks[result.get("ticker")] = result.get("rank", 0)
+            for result in data.get("tracking_results", []):
+                result.setdefault("conditions_mask", masks.get(result.get("ticker"), 0))
+                result.setdefault("rank", ranks.get(result.get("ticker"), 0))
+    
+    @instruments.traced('SearchTracker._save_db')
     def _save_db(self) -> None:
-        """데이터베이스 저장"""
+        """데이터베이스 저장 (열 단위 색인은 다음 조회 때 다시 만든다)"""
+        self._history = None
         with open(self.db_file, 'w', encoding='utf-8') as f:
             json.dump(self.db, f, ensure_ascii=False, indent=2)
     
@@ -74,7 +117,7 @@ class SearchTracker:
                 "buy_price": float(candidate.close),
                 "conditions_met": candidate.conditions_met,
                 "score": float(candidate.score),
-                "conditions_detail": candidate.conditions_detail
+                "conditions_mask": int(candidate.conditions_mask)
             })
         
         self.db[search_date]["search_results"] = search_results
@@ -133,6 +176,8 @@ class SearchTracker:
                     "next_day_high": next_day_high,
                     "next_day_close": next_day_close,
                     "conditions_met": result["conditions_met"],
+                    "conditions_mask": result.get("conditions_mask", 0),
+                    "rank": result.get("rank", 0),
                     "score": result["score"],
                     "achieved": achieved,
                     "actual_return": float(actual_return)
@@ -186,32 +231,128 @@ class SearchTracker:
             "last_updated": datetime.now().isoformat()
         }
     
-    def get_history_dataframe(self, limit: int = 50) -> pd.DataFrame:
-        """히스토리를 DataFrame으로 반환"""
-        records = []
+    def _history_frame(self) -> pd.DataFrame:
+        """
+        추적 결과 전체를 열 단위 표로 (날짜, 순위 순 정렬, 변경 전까지 재사용)
+
+        종목별 행 번호 색인(_ticker_rows)도 함께 만든다.
+        """
+        if self._history is not None:
+            return self._history
         
-        # 역순으로 정렬 (최신부터)
-        for date in sorted(self.db.keys(), reverse=True)[:limit]:
-            data = self.db[date]
-            tracking_results = data.get("tracking_results", [])
-            
-            for result in tracking_results:
-                records.append({
-                    "검색날짜": date,
-                    "종목명": result.get("stock_name", ""),
-                    "종목코드": result.get("ticker", ""),
-                    "매수가": result.get("buy_price", 0),
-                    "다음고가": result.get("next_day_high", 0),
-                    "수익률": result.get("actual_return", 0),
-                    "조건충족": result.get("conditions_met", 0),
-                    "점수": result.get("score", 0),
-                    "달성": "✅" if result.get("achieved", False) else "❌"
-                })
+        results = [(date, r) for date in sorted(self.db.keys())
+                   for r in sorted(self.db[date].get("tracking_results", []), key=lambda r: r.get("rank", 0))]
+        defaults = {"ticker": "", "stock_name": "", "achieved": False}
+        data = {}
+        for column, dtype in HISTORY_COLUMNS.items():
+            if column == "date":
+                values = [date for date, _ in results]
+            else:
+                values = [r.get(column, defaults.get(column, 0)) for _, r in results]
+            data[column] = np.array(values, dtype=dtype)
+        history = pd.DataFrame(data)
         
-        if not records:
-            return pd.DataFrame()
+        self._ticker_rows = {ticker: np.asarray(rows) for ticker, rows in history.groupby("ticker").indices.items()}
+        self._history = history
+        return history
+    
+    def query(self, start: Optional[str] = None, end: Optional[str] = None,
+              tickers: Optional[Union[str, Iterable[str]]] = None, min_score: Optional[float] = None,
+              min_conditions: Optional[int] = None, required: int = 0, failed: int = 0,
+              dates: Optional[Iterable[str]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        추적 결과 조회 (분석용 원자료: 날짜는 datetime, 수익률·점수는 비율 그대로)
+        
+        Args:
+            start: 시작 검색 날짜 (포함, 'YYYY-MM-DD')
+            end: 끝 검색 날짜 (포함)
+            tickers: 종목코드 또는 종목코드 목록
+            min_score: 최소 점수
+            min_conditions: 최소 충족 조건 수
+            required: 모두 충족해야 하는 조건 비트 (예: condition_mask('volume', 'trend'))
+            failed: 모두 불충족이어야 하는 조건 비트 (예: condition_mask('size'))
+            dates: 이 검색 날짜들만 (start/end와 함께 쓰면 둘 다 만족하는 날짜)
+            columns: 돌려받을 열 (None이면 HISTORY_COLUMNS 전체)
+        
+        Returns:
+            날짜, 순위 순으로 정렬된 DataFrame (자료형은 HISTORY_COLUMNS)
+        """
+        history = self._history_frame()
+        search_dates = history["date"].to_numpy()
+        lo = 0 if start is None else int(np.searchsorted(search_dates, np.datetime64(pd.Timestamp(start)), side="left"))
+        hi = len(search_dates) if end is None else int(np.searchsorted(search_dates, np.datetime64(pd.Timestamp(end)), side="right"))
+        rows = np.arange(lo, hi)
+        
+        if tickers is not None:
+            tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+            matched = [self._ticker_rows[t] for t in tickers if t in self._ticker_rows]
+            ticker_rows = np.concatenate(matched) if matched else np.empty(0, dtype=np.int64)
+            rows = np.intersect1d(rows, ticker_rows)
+        if min_score is not None:
+            rows = rows[history["score"].to_numpy()[rows] >= min_score]
+        if min_conditions is not None:
+            rows = rows[history["conditions_met"].to_numpy()[rows] >= min_conditions]
+        if required or failed:
+            masks = history["conditions_mask"].to_numpy()[rows]
+            rows = rows[((masks & required) == required) & ((masks & failed) == 0)]
+        if dates is not None:
+            wanted = pd.to_datetime(list(dates)).values.astype("datetime64[ns]")
+            rows = rows[np.isin(search_dates[rows], wanted)]
         
-        return pd.DataFrame(records)
+        result = history.iloc[rows]
+        if columns is not None:
+            result = result[list(columns)]
+        return result.reset_index(drop=True)
+    
+    def to_parquet(self, path: str, **filters) -> str:
+        """
+        추적 결과를 Parquet 파일로 내보내기 (pyarrow 또는 fastparquet 필요, requirements-optional.txt)
+        
+        Args:
+            path: 저장 경로
+            **filters: query와 같은 조건 (start, end, tickers, min_score, min_conditions, required, failed, dates, columns)
+        
+        Returns:
+            저장 경로
+        """
+        history = self.query(**filters)
+        try:
+            history.to_parquet(path, index=False)
+        except ImportError as e:
+            raise ImportError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다. 설치: pip install pyarrow") from e
+        return path
+    
+    def tracking_columns(self, dates: List[str] = None) -> Dict[str, np.ndarray]:
+        """
+        추적 결과를 열 단위 배열로 내보내기 (분석용)
+        
+        Args:
+            dates: 내보낼 검색 날짜 (None이면 전체)
+        
+        Returns:
+            {'date', 'ticker', 'rank', 'score', 'conditions_mask', 'achieved', 'actual_return'}: 배열
+        """
+        columns = ["date", "ticker", "rank", "score", "conditions_mask", "achieved", "actual_return"]
+        history = self.query(dates=dates, columns=columns)
+        return {column: history[column].to_numpy() for column in columns}
+    
+    def tracked_dates(self) -> Dict[str, str]:
+        """추적 완료된 검색 날짜 → 추적 시각"""
+        return {date: data["tracked_at"] for date, data in self.db.items() if "tracked_at" in data}
+    
+    def query_by_conditions(self, required: int = 0, failed: int = 0) -> pd.DataFrame:
+        """
+        조건 비트마스크로 추적 결과 조회 (query(required=..., failed=...)의 열 선택판)
+        
+        Args:
+            required: 모두 충족해야 하는 조건 비트 (예: condition_mask('volume', 'trend'))
+            failed: 모두 불충족이어야 하는 조건 비트 (예: condition_mask('size'))
+        
+        Returns:
+            조건에 맞는 추적 결과 DataFrame (date, ticker, stock_name, conditions_mask, score, achieved, actual_return)
+        """
+        columns = ["date", "ticker", "stock_name", "conditions_mask", "score", "achieved", "actual_return"]
+        return self.query(required=required, failed=failed, columns=columns)
     
     def get_date_summary(self) -> pd.DataFrame:
         """날짜별 요약"""
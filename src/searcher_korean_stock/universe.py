@@ -0,0 +1,119 @@
+"""
+종목 유니버스 마스터 - 로컬 스냅샷 기반 사전 필터
+"""
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import SizeCondition
+
+
+# 시장 구분 → yfinance 종목 코드 접미사
+MARKET_SUFFIX = {
+    'KOSPI': '.KS',
+    'KOSDAQ': '.KQ',
+}
+
+
+class UniverseMaster:
+    """
+    종목 유니버스 마스터 (코드, 종목명, 시장, 상장주식수, 최근 시가총액)
+
+    스냅샷 CSV 컬럼: code,name,market,shares_outstanding,market_cap
+    파일이 없으면 사전 필터를 건너뛰고 모든 종목을 그대로 통과시킨다.
+    """
+
+    # 스냅샷 이후 가격 변동 허용폭 (국내 일일 가격제한폭 30%)
+    PRICE_TOLERANCE = 0.30
+
+    def __init__(self, snapshot_path: str = os.path.join("data", "universe.csv")):
+        """초기화 (스냅샷은 처음 사용할 때 로드)"""
+        self.snapshot_path = snapshot_path
+        self._frame: Optional[pd.DataFrame] = None
+        self._mtime: Optional[float] = None
+
+    def _load(self) -> pd.DataFrame:
+        """스냅샷 로드 (파일이 바뀌었을 때만 다시 읽음)"""
+        if not os.path.exists(self.snapshot_path):
+            self._frame, self._mtime = None, None
+            return pd.DataFrame()
+
+        mtime = os.path.getmtime(self.snapshot_path)
+        if self._frame is not None and mtime == self._mtime:
+            return self._frame
+
+        df = pd.read_csv(self.snapshot_path, dtype={'code': str})
+        df['code'] = df['code'].str.zfill(6)
+        df['market'] = df['market'].str.upper()
+        df['ticker'] = df['code'] + df['market'].map(MARKET_SUFFIX).fillna('.KS')
+        df['shares_outstanding'] = pd.to_numeric(df['shares_outstanding'], errors='coerce')
+        df['market_cap'] = pd.to_numeric(df['market_cap'], errors='coerce')
+        df['last_price'] = df['market_cap'] / df['shares_outstanding']
+
+        self._frame = df.set_index('ticker')
+        self._mtime = mtime
+        return self._frame
+
+    @property
+    def available(self) -> bool:
+        """스냅샷 사용 가능 여부"""
+        return not self._load().empty
+
+    def tickers(self) -> List[str]:
+        """유니버스 전체 종목 코드"""
+        return self._load().index.tolist()
+
+    def shares_outstanding(self, ticker: str) -> Optional[float]:
+        """상장주식수 (모르면 None)"""
+        frame = self._load()
+        if ticker not in frame.index:
+            return None
+        shares = frame.at[ticker, 'shares_outstanding']
+        return None if pd.isna(shares) else float(shares)
+
+    def names(self) -> Dict[str, str]:
+        """종목 코드 → 종목명"""
+        frame = self._load()
+        if frame.empty:
+            return {}
+        return frame['name'].to_dict()
+
+    def prefilter(self, size: SizeCondition, tickers: List[str]) -> List[str]:
+        """
+        규모 조건을 통과할 수 없는 종목을 데이터 로드 전에 제외
+
+        규모 조건은 여러 조건 중 N개만 충족하면 되는 선택 조건이므로, 규모가 필수(size.required)일
+        때만 제외한다. 그 외에는 규모 불통과 종목도 다른 조건으로 결과에 들 수 있어 그대로 둔다.
+
+        Args:
+            size: 종목 규모 조건
+            tickers: 대상 종목 코드 리스트
+
+        Returns:
+            통과 가능성이 있는 종목 코드 리스트 (마스터에 없는 종목은 유지)
+        """
+        frame = self._load()
+        if not (size.enabled and size.required) or frame.empty:
+            return list(tickers)
+
+        # 스냅샷 이후 가격 변동을 고려해 범위를 넓혀서 판단 (통과 가능한 종목은 절대 제외하지 않음)
+        low = 1 - self.PRICE_TOLERANCE
+        high = 1 + self.PRICE_TOLERANCE
+        cap = frame['market_cap'].to_numpy(dtype=float)
+        price = frame['last_price'].to_numpy(dtype=float)
+
+        possible = (
+            (cap * high >= size.market_cap_min) & (cap * low <= size.market_cap_max)
+            & (price * high >= size.price_min) & (price * low <= size.price_max)
+        )
+        # 값이 비어 있으면 판단할 수 없으므로 유지
+        possible |= np.isnan(cap) | np.isnan(price)
+        excluded = set(frame.index[~possible])
+
+        return [t for t in tickers if t not in excluded]
+
+
+# 전역 인스턴스
+universe = UniverseMaster()
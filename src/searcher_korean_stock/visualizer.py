@@ -3,6 +3,8 @@ from __future__ import annotations
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from .performance import compute_metrics, daily_equity, trade_log_equity
+
 
 def equity_curve(portfolio) -> plt.Figure:
     fig, ax = plt.subplots(figsize=(10, 4))
@@ -16,26 +18,13 @@ def equity_curve(portfolio) -> plt.Figure:
     return fig
 
 
-def performance_summary(trade_log: pd.DataFrame) -> dict:
-    if trade_log.empty:
+def performance_summary(trade_log: pd.DataFrame, portfolio=None) -> dict:
+    """Metrics from the portfolio's daily equity, or from the trade log alone (equal weight per day).
+
+    Prefer BacktestResult.metrics, which is cached on the result.
+    """
+    if trade_log.empty and portfolio is None:
         return {'win_rate': 0.0, 'avg_return': 0.0, 'mdd': 0.0}
 
-    win_rate = (trade_log['return_pct'] > 0).mean()
-    avg_return = trade_log['return_pct'].mean()
-
-    equity = trade_log['return_pct'].cumsum()
-    rolling_max = equity.cummax()
-    drawdown = equity - rolling_max
-    mdd = drawdown.min()
-
-    trade_log['date'] = pd.to_datetime(trade_log['date'])
-    monthly = trade_log.groupby(trade_log['date'].dt.to_period('M'))['return_pct'].sum()
-    weekly = trade_log.groupby(trade_log['date'].dt.to_period('W'))['return_pct'].sum()
-
-    return {
-        'win_rate': win_rate,
-        'avg_return': avg_return,
-        'mdd': mdd,
-        'monthly_returns': monthly,
-        'weekly_returns': weekly,
-    }
+    equity = daily_equity(portfolio) if portfolio is not None else trade_log_equity(trade_log)
+    return compute_metrics(equity, trade_log)
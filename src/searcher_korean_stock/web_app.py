@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import base64
-import io
 from pathlib import Path
 
 import pandas as pd
-from flask import Flask, render_template_string, request
+from flask import Flask, Response, jsonify, render_template_string, request
 
 from .data_loader import KoreanStockLoader
 from .strategy import select_candidates
 from .backtester import simulate
-from .visualizer import equity_curve, performance_summary
+from .rendering import renderer
+from .symbols import symbols
+from .instrumentation import instruments
+from .snapshot import snapshots
+from .kernels import warmup
 
 
 TEMPLATE = """
@@ -364,7 +366,9 @@ TEMPLATE = """
     <div class="section chart-container">
       <h2>📈 누적 자산 곡선</h2>
       {% if equity_image %}
-        <img src="data:image/png;base64,{{ equity_image }}" alt="누적 자산 곡선" />
+        <img src="data:image/png;base64,{{ equity_image }}" alt="누적 자산 곡선"
+             data-series-url="{{ url_for('equity_series', result_id=equity_id) }}" />
+        <p style="margin-top: 8px;"><a href="{{ url_for('equity_series', result_id=equity_id) }}">시계열 데이터 (JSON)</a></p>
       {% else %}
         <p style="color: #666;">그래프를 표시할 수 없습니다.</p>
       {% endif %}
@@ -427,40 +431,57 @@ def _load_data(days: int = 60) -> pd.DataFrame:
     return loader.load()
 
 
-# 종목 이름 매핑
-STOCK_NAMES = {
-    '005930': 'Samsung Electronics',
-    '000660': 'SK Hynix',
-    '051910': 'LG Chem',
-    '207940': 'Samsung SDI',
-    '006400': 'Samsung SDI',
-    '035720': 'Kakao',
-    '012330': 'Hyundai Motor',
-    '005380': 'Hyundai Motor',
-    '055550': 'Shinhan Finance',
-    '032830': 'Samsung Life',
-}
-
-
 def _add_stock_names(df: pd.DataFrame) -> pd.DataFrame:
     """데이터프레임에 종목 이름 추가"""
     df = df.copy()
-    df['stock_name'] = df['ticker'].map(STOCK_NAMES).fillna(df['ticker'])
+    df['stock_name'] = symbols.names_for(df['ticker'])
     return df
 
 
-def _plot_equity(portfolio) -> str:
-    """자산 곡선을 이미지로 변환."""
-    fig = equity_curve(portfolio)
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="png", bbox_inches="tight")
-    buffer.seek(0)
-    encoded = base64.b64encode(buffer.read()).decode("utf-8")
-    return encoded
+def _plot_equity(dates, equity) -> tuple:
+    """(결과 id, 자산 곡선 이미지) - 화면 폭에 맞춰 다운샘플링, 같은 결과는 캐시 재사용.
+
+    결과 id로 /api/equity/<id>에서 같은 곡선의 시계열을 받을 수 있다.
+    """
+    result_id = renderer.register(dates, equity)
+    return result_id, renderer.render_png(result_id, size=(1200, 420), theme="light")
+
+
+def _top_volume(latest_df: pd.DataFrame) -> list:
+    """최신 날짜 거래량 상위 10개 종목."""
+    top_volume = latest_df.nlargest(10, 'volume')[['ticker', 'close', 'volume', 'amount']]
+    top_volume = _add_stock_names(top_volume)
+    return top_volume[['stock_name', 'ticker', 'close', 'volume', 'amount']].to_dict('records')
+
+
+def _search(days: int):
+    """(후보, 거래 로그, 지표, 자산 곡선 날짜, 자산 곡선).
+
+    장 마감 스냅샷이 있으면 요청 중에 데이터를 로드하지 않는다: 조회 기간이 스냅샷과 같으면 미리 계산한
+    결과를 그대로 쓰고, 다르면 스냅샷 패널의 최근 기간만 잘라 다시 계산한다.
+    """
+    snapshot = snapshots.current()
+    if snapshot is not None and snapshot.has("candidates"):
+        if days == snapshot.meta.get("days"):
+            equity = snapshot.frame("equity")
+            return (snapshot.frame("candidates"), snapshot.frame("trades"), snapshot.meta["backtest"],
+                    equity['date'].to_numpy(), equity['equity'].to_numpy())
+        panel = snapshot.frame("panel")
+        recent = panel['date'].drop_duplicates().nlargest(days)
+        df = panel[panel['date'].isin(recent)].reset_index(drop=True)
+    else:
+        df = _load_data(days=days)
+
+    backtest_result = simulate(df)
+    portfolio = backtest_result.portfolio
+    return (select_candidates(df), backtest_result.trade_log, backtest_result.metrics,
+            portfolio.dates, portfolio.equity_curve[1:])
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    # 계산 커널 JIT 컴파일을 첫 요청 전에 끝내 둠 (Numba가 없으면 바로 반환)
+    warmup()
 
     @app.route("/")
     def index():
@@ -468,14 +489,17 @@ def create_app() -> Flask:
         days = request.args.get("days", type=int)
         num_stocks = request.args.get("num_stocks", type=int)
         
-        # 항상 거래량 TOP 10을 표시하기 위해 기본 데이터 로드
+        # 항상 거래량 TOP 10을 표시 (스냅샷이 있으면 최신 행을 그대로, 없으면 기본 데이터 로드)
         try:
-            df_for_volume = _load_data(days=60)
-            latest_date = df_for_volume['date'].max()
-            latest_df = df_for_volume[df_for_volume['date'] == latest_date].copy()
-            top_volume = latest_df.nlargest(10, 'volume')[['ticker', 'close', 'volume', 'amount']]
-            top_volume = _add_stock_names(top_volume)
-            top_volume_records = top_volume[['stock_name', 'ticker', 'close', 'volume', 'amount']].to_dict('records')
+            snapshot = snapshots.current()
+            if snapshot is not None:
+                today_df = snapshot.frame("today")
+                latest_df = today_df[today_df['date'] == today_df['date'].max()]
+            else:
+                df_for_volume = _load_data(days=60)
+                latest_date = df_for_volume['date'].max()
+                latest_df = df_for_volume[df_for_volume['date'] == latest_date].copy()
+            top_volume_records = _top_volume(latest_df)
         except:
             top_volume_records = []
         
@@ -495,35 +519,26 @@ def create_app() -> Flask:
             )
         
         try:
-            df = _load_data(days=days)
+            candidates_df, full_trade_log, summary, equity_dates, equity = _search(days)
 
-            candidates_df = select_candidates(df)
             candidates = candidates_df[['date', 'ticker', 'close', 'total_score']].tail(4)
             candidates_records = candidates.assign(date=candidates['date'].dt.strftime('%Y-%m-%d')).to_dict('records')
 
-            backtest_result = simulate(df)
-            trade_log = backtest_result.trade_log.tail(10).copy()
+            trade_log = full_trade_log.tail(10).copy()
             if not trade_log.empty and 'date' in trade_log.columns:
                 trade_log['date'] = pd.to_datetime(trade_log['date']).dt.strftime('%Y-%m-%d')
             trades = trade_log.to_dict('records')
 
-            summary = performance_summary(trade_log)
-            equity_image = _plot_equity(backtest_result.portfolio)
-            
-            # 오늘 거래량 상위 10개 종목
-            latest_date = df['date'].max()
-            latest_df = df[df['date'] == latest_date].copy()
-            top_volume = latest_df.nlargest(10, 'volume')[['ticker', 'close', 'volume', 'amount']]
-            top_volume = _add_stock_names(top_volume)
-            top_volume_records = top_volume[['stock_name', 'ticker', 'close', 'volume', 'amount']].to_dict('records')
+            equity_id, equity_image = _plot_equity(equity_dates, equity)
 
             return render_template_string(
                 TEMPLATE,
                 candidates=candidates_records,
                 trades=trades,
                 summary=summary,
-                num_trades=len(backtest_result.trade_log),
+                num_trades=len(full_trade_log),
                 equity_image=equity_image,
+                equity_id=equity_id,
                 top_volume_stocks=top_volume_records,
                 error=None,
                 loading=False,
@@ -543,6 +558,27 @@ def create_app() -> Flask:
                 has_data=False,
             ), 500
 
+    @app.route("/api/symbols")
+    def symbol_search():
+        # 종목 코드 / 종목명 / 영문명 접두어 자동완성
+        query = request.args.get("q", default="", type=str)
+        limit = min(request.args.get("limit", default=10, type=int), 50)
+        return jsonify(symbols.search(query, limit))
+
+    @app.route("/api/equity/<result_id>")
+    def equity_series(result_id: str):
+        # 클라이언트 차트용 압축 시계열 (points 개 이하로 다운샘플링)
+        points = max(3, min(request.args.get("points", default=500, type=int), 5000))
+        payload = renderer.to_json(result_id, points)
+        if payload is None:
+            return jsonify({"error": "unknown result id"}), 404
+        return jsonify(payload)
+
+    @app.route("/metrics")
+    def metrics():
+        # Prometheus 수집용 단계별 계측 (SEARCHER_METRICS=1 일 때만 값이 쌓임)
+        return Response(instruments.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
     return app
 
 
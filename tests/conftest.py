@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture
+def sample_panel() -> pd.DataFrame:
+    return pd.read_csv(ROOT / "data" / "sample_prices.csv", parse_dates=["date"])
+
+
+def synthetic_panel(n_tickers: int = 60, n_days: int = 80, seed: int = 0) -> pd.DataFrame:
+    """Random-walk panel in the sample_prices.csv layout, busy enough to give several candidates a day."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n_days)
+    frames = []
+    for i in range(n_tickers):
+        close = 5000 * np.exp(np.cumsum(rng.normal(0.002, 0.03, n_days)))
+        open_ = close * (1 + rng.normal(0, 0.01, n_days))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.015, n_days)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.015, n_days)))
+        volume = rng.integers(10_000, 1_000_000, n_days).astype(float)
+        amount = volume * close
+        frames.append(pd.DataFrame({
+            "date": dates, "ticker": f"T{i:03d}", "open": open_, "high": high, "low": low, "close": close,
+            "volume": volume, "amount": amount, "after_13_amount": amount * rng.uniform(0.1, 0.6, n_days),
+            "after_13_low": low * rng.uniform(0.97, 1.01, n_days), "after_13_high": high, "market_cap": 5e11,
+        }))
+    return pd.concat(frames).sort_values(["date", "ticker"]).reset_index(drop=True)
+
+
+@pytest.fixture
+def panel() -> pd.DataFrame:
+    return synthetic_panel()
+
+
+@pytest.fixture
+def web_app(monkeypatch):
+    # web_app imports a live loader class by name; the tests feed data through _load_data instead
+    from searcher_korean_stock import data_loader
+    monkeypatch.setattr(data_loader, "KoreanStockLoader", object, raising=False)
+    from searcher_korean_stock import web_app
+    return web_app
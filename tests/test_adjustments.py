@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from searcher_korean_stock import data_loader
+from searcher_korean_stock.data_loader import KoreanStockDataLoader
+
+TICKER = "005930.KS"
+SPLIT_DAY = pd.Timestamp("2024-02-01")
+
+
+def _raw() -> pd.DataFrame:
+    dates = pd.bdate_range("2024-01-02", periods=40)
+    close = np.where(dates < SPLIT_DAY, 20_000.0, 10_000.0)
+    return pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+                         "volume": 1_000.0}, index=dates)
+
+
+class _Ticker:
+    def __init__(self, ticker, session=None):
+        self.splits = pd.Series([2.0], index=pd.DatetimeIndex([SPLIT_DAY]).tz_localize("Asia/Seoul"))
+
+
+def test_recorded_split_changes_adjusted_panel(tmp_path, monkeypatch):
+    loader = KoreanStockDataLoader(cache_dir=str(tmp_path))
+    monkeypatch.setattr(loader, "_download", lambda ticker, days: _raw())
+    monkeypatch.setattr(data_loader.yf, "Ticker", _Ticker)
+
+    before = loader.to_panel(loader.prepare_data(days=60, tickers=[TICKER]))
+    assert before.loc[before['date'] < SPLIT_DAY, 'close'].eq(20_000).all()
+
+    assert loader.update_all_splits([TICKER]) == 1
+    assert loader.update_all_splits([TICKER]) == 0  # already recorded
+
+    after = loader.to_panel(loader.prepare_data(days=60, tickers=[TICKER]))
+    assert after['close'].eq(10_000).all()
+    assert after.loc[after['date'] < SPLIT_DAY, 'volume'].eq(2_000).all()
+
+
+def test_daily_search_refreshes_splits_before_building_the_snapshot(monkeypatch):
+    from searcher_korean_stock import scheduler
+
+    calls = []
+    monkeypatch.setattr(scheduler.loader, "update_all_splits", lambda tickers=None: calls.append("splits") or 0)
+    monkeypatch.setattr(scheduler.AutoTracker, "build_snapshot", lambda self: calls.append("snapshot"))
+    monkeypatch.setattr(scheduler.AutoTracker, "_flush_metrics", lambda self, job: None)
+
+    scheduler.AutoTracker().run_daily_search()
+    assert calls == ["splits", "snapshot"]
+
+
+def _split_panel():
+    from conftest import synthetic_panel
+    from searcher_korean_stock.adjustments import PANEL_PRICE_COLUMNS
+    from searcher_korean_stock.stock_filter import filter_candidates
+
+    panel = synthetic_panel(n_tickers=30, n_days=120, seed=4)
+    # split on a day T000 is a candidate, so the unadjusted -50% gap visibly drops it
+    picked = filter_candidates(panel).query("ticker == 'T000'")['date']
+    ex_date = picked[picked >= panel['date'].drop_duplicates().iloc[30]].iloc[0]
+    after = (panel['ticker'] == "T000") & (panel['date'] >= ex_date)
+    raw = panel.copy()
+    raw.loc[after, PANEL_PRICE_COLUMNS] /= 2     # 1 → 2 split: prices halve, volume doubles
+    raw.loc[after, 'volume'] *= 2
+    return panel, raw, ex_date
+
+
+def test_adjusted_csv_panel_filters_like_the_unsplit_prices(tmp_path):
+    from searcher_korean_stock.adjustments import AdjustmentStore, split_ratio
+    from searcher_korean_stock.backtester import simulate
+    from searcher_korean_stock.stock_filter import filter_candidates
+
+    panel, raw, ex_date = _split_panel()
+    store = AdjustmentStore(str(tmp_path / "adjustments.json"))
+    store.add_action("T000", ex_date, split_ratio(1, 2))
+
+    def keys(frame):
+        return frame[['date', 'ticker']].sort_values(['date', 'ticker']).reset_index(drop=True)
+
+    expected = keys(filter_candidates(panel))
+    assert not keys(filter_candidates(raw)).equals(expected)
+    pd.testing.assert_frame_equal(keys(filter_candidates(raw, adjustments=store)), expected)
+
+    returns = simulate(raw, adjustments=store).trade_log['return_pct'].to_numpy()
+    np.testing.assert_allclose(returns, simulate(panel).trade_log['return_pct'].to_numpy())
+
+
+def test_chunked_screen_applies_the_same_adjustments(tmp_path):
+    from searcher_korean_stock.adjustments import AdjustmentStore, split_ratio
+    from searcher_korean_stock.chunked import PartitionedPanel, filter_candidates_chunked
+    from searcher_korean_stock.stock_filter import filter_candidates
+
+    panel, raw, ex_date = _split_panel()
+    store = AdjustmentStore(str(tmp_path / "adjustments.json"))
+    store.add_action("T000", ex_date, split_ratio(1, 2))
+    raw.to_csv(tmp_path / "prices.csv", index=False)
+    partitioned = PartitionedPanel.from_csv(str(tmp_path / "prices.csv"), str(tmp_path / "panel"))
+
+    out = tmp_path / "candidates.csv"
+    filter_candidates_chunked(partitioned, str(out), tickers_per_chunk=7, days_per_chunk=40, adjustments=store)
+    chunked = pd.read_csv(out, parse_dates=['date'])
+    expected = filter_candidates(raw, adjustments=store)
+
+    def keys(frame):
+        return sorted(zip(frame['date'], frame['ticker']))
+    assert keys(chunked) == keys(expected)
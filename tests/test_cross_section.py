@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from searcher_korean_stock.cross_section import CrossSectionalFeature, add_cross_sectional
+
+
+def _frame(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = 400
+    values = rng.integers(0, 20, n).astype(float)   # many ties
+    values[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({'date': rng.choice(pd.bdate_range("2024-01-01", periods=6), n), 'x': values})
+
+
+def test_features_match_pandas_groupby():
+    df = _frame()
+    features = [CrossSectionalFeature(f'pct_{m}', 'x', 'pct', m) for m in ('average', 'min', 'max')]
+    features += [
+        CrossSectionalFeature('rank', 'x', 'rank'),
+        CrossSectionalFeature('z', 'x', 'zscore'),
+        CrossSectionalFeature('rel', 'x', 'rel_median'),
+    ]
+    add_cross_sectional(df, features)
+
+    grouped = df.groupby('date')['x']
+    for method in ('average', 'min', 'max'):
+        np.testing.assert_allclose(df[f'pct_{method}'], grouped.rank(pct=True, method=method))
+    np.testing.assert_allclose(df['rank'], grouped.rank())
+    np.testing.assert_allclose(df['z'], (df['x'] - grouped.transform('mean')) / grouped.transform('std'))
+    np.testing.assert_allclose(df['rel'], df['x'] / grouped.transform('median'))
@@ -0,0 +1,16 @@
+import os
+
+import pandas as pd
+
+from searcher_korean_stock.data_loader import KoreanStockDataLoader
+
+
+def test_cache_locks_live_in_their_own_directory(tmp_path, monkeypatch):
+    loader = KoreanStockDataLoader(cache_dir=str(tmp_path))
+    raw = pd.DataFrame({"open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0], "volume": [1.0]},
+                       index=pd.DatetimeIndex(["2024-01-02"]))
+    monkeypatch.setattr(loader, "_download", lambda ticker, days: raw)
+
+    assert loader.load_stock_data("005930.KS", 60) is not None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".lock")]
+    assert os.listdir(tmp_path / "locks")
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from searcher_korean_stock import engine
+from searcher_korean_stock.config import SearchConfig
+from searcher_korean_stock.engine import DayTradeSearchEngine
+
+
+def _rows(n: int = 50, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = rng.uniform(5_000, 50_000, n)
+    return pd.DataFrame({
+        "ticker": [f"T{i:03d}" for i in range(n)], "stock_name": "", "close": close,
+        "open": close * rng.uniform(0.95, 1.0, n), "high": close * rng.uniform(1.0, 1.05, n),
+        "volume_ratio": rng.uniform(0.5, 4.0, n), "volatility": rng.uniform(0.0, 0.1, n),
+        "market_cap": rng.uniform(1e11, 5e12, n),
+    })
+
+
+def _count_mask_calls(monkeypatch) -> dict:
+    calls = {key: 0 for key in engine.CONDITION_CLASSES}
+
+    def counting(key, mask):
+        def wrapped(df, condition):
+            calls[key] += 1
+            return mask(df, condition)
+        return staticmethod(wrapped)
+
+    classes = {key: type(cls.__name__, (cls,), {"mask": counting(key, cls.mask)})
+               for key, cls in engine.CONDITION_CLASSES.items()}
+    monkeypatch.setattr(engine, "CONDITION_CLASSES", classes)
+    return calls
+
+
+def test_changing_one_condition_recomputes_only_its_mask(monkeypatch):
+    calls = _count_mask_calls(monkeypatch)
+    rows = _rows()
+    search = DayTradeSearchEngine()
+    config = SearchConfig()
+
+    first = search.condition_masks(rows, config)
+    assert all(n == 1 for n in calls.values())
+
+    config.volume.multiplier = 3.0
+    second = search.condition_masks(rows, config)
+
+    assert calls == {key: 2 if key == "volume" else 1 for key in calls}
+    assert all(second[key] is first[key] for key in first if key != "volume")
+    np.testing.assert_array_equal(second["volume"], rows["volume_ratio"].to_numpy() >= 3.0)
+
+
+def test_joint_count_cache_is_bounded():
+    rows = _rows()
+    search = DayTradeSearchEngine()
+    config = SearchConfig()
+    for multiplier in np.linspace(1.0, 3.0, 3 * engine.ThresholdIndex.JOINT_CACHE_SIZE):
+        config.volume.multiplier = float(multiplier)
+        counts = search.pass_counts(rows, config)
+
+    index = search._threshold_index
+    assert len(index._joint_sorted) <= engine.ThresholdIndex.JOINT_CACHE_SIZE
+    masks = search.condition_masks(rows, config)
+    others = np.logical_and.reduce([m for k, m in masks.items() if k != "close"])
+    close_ratio = rows["close"] / rows["high"]
+    assert counts["close_ratio"]["joint"] == int((others & (close_ratio >= config.close.close_pct)).sum())
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from searcher_korean_stock.funnel import funnel_report
+from searcher_korean_stock.stock_filter import filter_candidates
+
+
+def test_funnel_passed_matches_filter_candidates(panel):
+    candidates, report = filter_candidates(panel, funnel=True)
+
+    per_date = candidates.groupby('date').size().reindex(report.passed.index, fill_value=0)
+    assert (report.passed == per_date).all()
+    assert (report.rows == panel.groupby('date').size().reindex(report.rows.index)).all()
+
+
+def test_gate_counts_match_sequential_filtering():
+    rng = np.random.default_rng(0)
+    n = 500
+    dates = rng.choice(pd.bdate_range("2024-01-01", periods=4), n)
+    rules = {name: rng.random(n) < p for name, p in [('a', 0.6), ('b', 0.5), ('c', 0.7), ('d', 0.8)]}
+    gates = {'a|b': ('a', 'b'), 'c': ('c',), 'd': ('d',)}
+
+    report = funnel_report(rules, dates, gates)
+
+    frame = pd.DataFrame(rules).assign(date=dates)
+    gate_pass = pd.DataFrame({gate: np.logical_or.reduce([frame[m] for m in members])
+                              for gate, members in gates.items()}).assign(date=dates)
+    survivors = gate_pass
+    for gate in gates:
+        survivors = survivors[survivors[gate]]
+    assert (report.passed == survivors.groupby('date').size().reindex(report.passed.index, fill_value=0)).all()
+
+    for name in rules:
+        assert (report.pass_counts[name] == frame.groupby('date')[name].sum()).all()
+    for gate in gates:
+        others = gate_pass[[g for g in gates if g != gate]].all(axis=1)
+        expected = (~gate_pass[gate] & others).groupby(dates).sum()
+        assert (report.marginal_rejects[gate] == expected.reindex(report.marginal_rejects.index)).all()
+    both = (frame['a'] & frame['c']).groupby(dates).sum()
+    assert (report.overlaps.xs('a', level='rule')['c'] == both).all()
@@ -0,0 +1,92 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from searcher_korean_stock.http_session import CachedSession
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        headers = {"Cache-Control": "max-age=60"}
+        if self.path == "/cookie":
+            headers["Set-Cookie"] = "B=abc; Path=/"
+        elif self.path == "/vary":
+            headers["Vary"] = "Cookie"
+        body = self.path.encode()
+        self.send_response(200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.connections = 0
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reuses_connection_and_serves_hits_from_cache(server, tmp_path):
+    httpd, base = server
+    session = CachedSession(cache_dir=str(tmp_path))
+
+    first = session.get(f"{base}/a")
+    second = session.get(f"{base}/a")
+    third = session.get(f"{base}/b")
+
+    assert (first.from_cache, second.from_cache, third.from_cache) == (False, True, False)
+    assert second.text == "/a"
+    assert httpd.requests == ["/a", "/b"]
+    assert httpd.connections == 1
+
+
+def test_cookie_responses_are_not_cached(server, tmp_path):
+    httpd, base = server
+    session = CachedSession(cache_dir=str(tmp_path))
+    session.get(f"{base}/cookie")
+
+    fresh = CachedSession(cache_dir=str(tmp_path))
+    response = fresh.get(f"{base}/cookie")
+
+    assert response.from_cache is False
+    assert fresh.cookies.get("B") == "abc"
+    assert httpd.requests == ["/cookie", "/cookie"]
+
+
+def test_crumb_endpoint_bypasses_cache(server, tmp_path):
+    httpd, base = server
+    session = CachedSession(cache_dir=str(tmp_path))
+    session.get(f"{base}/v1/test/getcrumb")
+    session.get(f"{base}/v1/test/getcrumb")
+
+    assert httpd.requests == ["/v1/test/getcrumb"] * 2
+
+
+def test_vary_cookie_is_part_of_the_match(server, tmp_path):
+    httpd, base = server
+    session = CachedSession(cache_dir=str(tmp_path))
+    session.cookies.set("B", "one")
+    assert session.get(f"{base}/vary").from_cache is False
+    assert session.get(f"{base}/vary").from_cache is True
+
+    session.cookies.set("B", "two")
+    assert session.get(f"{base}/vary").from_cache is False
+    assert httpd.requests == ["/vary", "/vary"]
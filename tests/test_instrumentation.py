@@ -0,0 +1,25 @@
+import pytest
+
+from searcher_korean_stock.instrumentation import instruments
+from searcher_korean_stock.stock_filter import filter_candidates
+
+
+@pytest.fixture
+def metrics():
+    instruments.reset()
+    instruments.enable()
+    yield instruments
+    instruments.disable()
+    instruments.reset()
+
+
+def test_rows_out_counts_candidates_with_or_without_funnel(metrics, panel):
+    candidates = filter_candidates(panel)
+    assert len(candidates) > 2
+    assert metrics.snapshot()['stages']['filter_candidates']['rows_out'] == len(candidates)
+
+    metrics.reset()
+    with_funnel, _ = filter_candidates(panel, funnel=True)
+    stage = metrics.snapshot()['stages']['filter_candidates']
+    assert stage['rows_in'] == len(panel)
+    assert stage['rows_out'] == len(with_funnel) == len(candidates)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from searcher_korean_stock import kernels
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def backend(request, monkeypatch):
+    # without Numba installed the 'numba' dispatch runs the same loops as plain Python
+    monkeypatch.setattr(kernels, 'BACKEND', request.param)
+    return request.param
+
+
+def _grouped(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    sizes = [1, 3, 25, 40, 7]
+    tickers = np.repeat([f"T{i}" for i in range(len(sizes))], sizes)
+    values = rng.normal(100, 5, len(tickers)).round(1)   # rounding gives ties
+    values[rng.random(len(values)) < 0.1] = np.nan
+    return tickers, values
+
+
+@pytest.mark.parametrize('window', [1, 5, 20])
+def test_rolling_extremes_match_pandas_groupby(backend, window):
+    tickers, values = _grouped()
+    starts = kernels.group_starts(tickers)
+    grouped = pd.Series(values).groupby(tickers)
+
+    expected_max = grouped.transform(lambda x: x.rolling(window).max()).to_numpy()
+    expected_min = grouped.transform(lambda x: x.rolling(window).min()).to_numpy()
+    np.testing.assert_array_equal(kernels.rolling_max(values, window, starts), expected_max)
+    np.testing.assert_array_equal(kernels.rolling_min(values, window, starts), expected_min)
+
+
+def _old_exits(buy, high, low, close, stopped_first, target_mult, stop_mult):
+    sells, results = [], []
+    for b, h, lo, c, first in zip(buy, high, low, close, stopped_first):
+        target, stop = b * target_mult, b * stop_mult
+        if first:
+            sells.append(stop); results.append('loss')
+        elif h >= target:
+            sells.append(target); results.append('win')
+        elif lo <= stop:
+            sells.append(stop); results.append('loss')
+        else:
+            sells.append(c); results.append('hold_exit')
+    return np.array(sells), results
+
+
+def test_resolve_exits_matches_per_row_logic(backend):
+    rng = np.random.default_rng(1)
+    n = 500
+    buy = rng.uniform(1_000, 50_000, n)
+    high = buy * rng.uniform(0.99, 1.05, n)
+    low = np.minimum(buy * rng.uniform(0.95, 1.0, n), high)
+    close = rng.uniform(low, high)
+    stopped_first = rng.random(n) < 0.1
+
+    sell, code = kernels.resolve_exits(buy, high, low, close, stopped_first, 1.02, 0.985)
+    expected_sell, expected_result = _old_exits(buy, high, low, close, stopped_first, 1.02, 0.985)
+
+    np.testing.assert_array_equal(sell, expected_sell)
+    assert kernels.EXIT_RESULTS[code].tolist() == expected_result
+    assert set(expected_result) == {'win', 'loss', 'hold_exit'}
+
+
+def _old_compound(buy, sell, capital, n_slots, equal_weight):
+    shares, pnl, equity = [], [], [capital]
+    for b, s in zip(buy, sell):
+        size = capital / n_slots if equal_weight else capital
+        count = int(size / b)
+        shares.append(count)
+        pnl.append(count * (s - b) if count else 0.0)
+        if count == 0:
+            continue
+        capital += count * (s - b)
+        equity.append(capital)
+    return np.array(shares), np.array(pnl), np.array(equity)
+
+
+@pytest.mark.parametrize('equal_weight', [True, False])
+def test_compound_matches_old_loop(backend, equal_weight):
+    rng = np.random.default_rng(2)
+    buy = np.r_[rng.uniform(1_000, 50_000, 60), 5e9]   # the last pick is too expensive for one share
+    sell = buy * rng.uniform(0.98, 1.03, len(buy))
+
+    shares, pnl, equity = kernels.compound(buy, sell, 10_000_000, 5, equal_weight)
+    expected = _old_compound(buy, sell, 10_000_000.0, 5, equal_weight)
+
+    np.testing.assert_array_equal(shares, expected[0])
+    np.testing.assert_allclose(pnl, expected[1])
+    np.testing.assert_allclose(equity, expected[2])
+    assert shares[-1] == 0
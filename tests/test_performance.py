@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from searcher_korean_stock.performance import TRADING_DAYS, compute_metrics
+
+
+def test_known_equity_series():
+    index = pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05", "2024-01-08"])
+    equity = pd.Series([100.0, 110.0, 121.0, 96.8, 104.0, 130.0], index=index)
+
+    metrics = compute_metrics(equity)
+
+    assert metrics['mdd'] == pytest.approx(96.8 / 121.0 - 1)   # -20%
+    assert metrics['mdd_peak_date'] == pd.Timestamp("2024-01-03")
+    assert metrics['mdd_trough_date'] == pd.Timestamp("2024-01-04")
+    assert metrics['total_return'] == pytest.approx(0.30)
+
+    returns = np.array([0.1, 0.1, -0.2, 104.0 / 96.8 - 1, 130.0 / 104.0 - 1])
+    expected_sharpe = returns.mean() / returns.std(ddof=1) * np.sqrt(TRADING_DAYS)
+    assert metrics['sharpe'] == pytest.approx(expected_sharpe)
+    assert metrics['weekly_returns'].round(10).tolist() == [round(104.0 / 100.0 - 1, 10), 0.25]
+
+
+def test_flat_equity_has_no_drawdown():
+    index = pd.bdate_range("2024-01-01", periods=4)
+    metrics = compute_metrics(pd.Series(100.0, index=index))
+    assert metrics['mdd'] == 0.0
+    assert metrics['sharpe'] == 0.0
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from conftest import synthetic_panel
+from searcher_korean_stock.backtester import simulate
+from searcher_korean_stock.portfolio import Portfolio
+
+
+def test_running_mdd_matches_backtest_metrics():
+    result = simulate(synthetic_panel(n_tickers=60, n_days=300, seed=1))
+    running = result.portfolio.metrics()
+
+    assert running['mdd'] < 0
+    assert running['mdd'] == pytest.approx(result.metrics['mdd'])
+    assert running['peak_equity'] == pytest.approx(result.equity().max())
+
+
+def test_drawdown_follows_end_of_day_equity():
+    portfolio = Portfolio(initial_capital=100.0)
+    day1, day2 = pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")
+    portfolio.update_equity(day1, -30.0)   # intraday partial sum: 70
+    portfolio.update_equity(day1, 35.0)    # day 1 closes at 105
+    portfolio.update_equity(day2, -21.0)   # day 2 closes at 84
+
+    assert portfolio.peak_equity == 105.0
+    assert portfolio.mdd == pytest.approx(84 / 105 - 1)
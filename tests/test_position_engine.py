@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from conftest import synthetic_panel
+from searcher_korean_stock.backtester import simulate
+from searcher_korean_stock.position_engine import HoldingRules, simulate_positions
+
+COLUMNS = ['date', 'ticker', 'buy_price', 'sell_price', 'return_pct', 'result']
+
+
+def _trades(result) -> pd.DataFrame:
+    return result.trade_log[COLUMNS].sort_values(['date', 'ticker']).reset_index(drop=True)
+
+
+def test_default_rules_match_simulate():
+    panel = synthetic_panel(n_tickers=60, n_days=250, seed=3)
+    expected = _trades(simulate(panel))
+    actual = _trades(simulate_positions(panel))
+
+    assert len(expected) > 100
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_stop_first_books_spanning_bars_as_losses():
+    panel = synthetic_panel(n_tickers=60, n_days=250, seed=3)
+    default = _trades(simulate_positions(panel))
+    stop_first = _trades(simulate_positions(panel, HoldingRules(stop_first=True)))
+
+    spans = (default['result'] == 'win') & (stop_first['result'] == 'loss')
+    assert spans.any()
+    assert np.allclose(stop_first.loc[spans, 'return_pct'], -0.015)
@@ -0,0 +1,19 @@
+import numpy as np
+
+from searcher_korean_stock.rendering import EquityRenderer
+
+
+def test_render_cache_keys_on_every_parameter():
+    renderer = EquityRenderer()
+    dates = np.arange('2024-01-01', '2024-03-01', dtype='datetime64[D]')
+    result_id = renderer.register(dates, np.linspace(100, 120, len(dates)))
+
+    base = renderer.render_png(result_id, size=(300, 200))
+    assert renderer.render_png(result_id, size=(300, 200)) is base
+    variants = [
+        renderer.render_png(result_id, size=(300, 200), dpi=50),
+        renderer.render_png(result_id, size=(300, 200), time_axis=False),
+        renderer.render_png(result_id, size=(300, 200), theme='dark'),
+        renderer.render_png(result_id, size=(400, 200)),
+    ]
+    assert len({base, *variants}) == 5
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from conftest import synthetic_panel
+from searcher_korean_stock.backtester import StoredBacktestResult, simulate
+from searcher_korean_stock.result_store import ResultSink, ResultStore
+
+
+def test_stored_result_reads_back_the_in_memory_result(tmp_path):
+    panel = synthetic_panel(n_tickers=60, n_days=200, seed=5)
+    memory = simulate(panel)
+    stored = simulate(panel, sink=ResultSink(str(tmp_path / "run"), batch_size=64))
+
+    assert isinstance(stored, StoredBacktestResult)
+    assert len(list(stored.store.iter_batches('trades'))) > 1
+    pd.testing.assert_frame_equal(stored.trade_log, memory.trade_log, check_dtype=False)
+    pd.testing.assert_frame_equal(stored.selection_log, memory.selection_log, check_dtype=False)
+    pd.testing.assert_series_equal(stored.equity(), memory.equity())
+    for key in ('total_return', 'mdd', 'sharpe', 'win_rate', 'turnover'):
+        assert stored.metrics[key] == pytest.approx(memory.metrics[key])
+
+    reopened = ResultStore(str(tmp_path / "run"))
+    assert reopened.rows('trades') == len(memory.trade_log)
+    assert reopened.meta['mdd'] == pytest.approx(memory.metrics['mdd'])
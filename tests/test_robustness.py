@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from searcher_korean_stock.robustness import METRICS, resample_metrics, robustness_report
+
+
+def _trade_log(n_days: int = 120, per_day: int = 3, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = np.repeat(pd.bdate_range("2024-01-01", periods=n_days), per_day)
+    return pd.DataFrame({'date': dates, 'return_pct': rng.normal(0.002, 0.015, len(dates))})
+
+
+def test_resample_shape_and_fixed_seed():
+    log = _trade_log()
+    first = resample_metrics(log, n_resamples=300, seed=7, workers=1)
+    again = resample_metrics(log, n_resamples=300, seed=7, workers=4)
+    other = resample_metrics(log, n_resamples=300, seed=8, workers=1)
+
+    assert first.shape == (300, len(METRICS))
+    assert list(first.columns) == METRICS
+    pd.testing.assert_frame_equal(first, again)
+    assert not first.equals(other)
+    assert (first['mdd'] <= 0).all()
+
+
+def test_shuffle_keeps_final_equity_and_report_brackets_the_median():
+    log = _trade_log()
+    shuffled = resample_metrics(log, n_resamples=100, method='shuffle', seed=1)
+    np.testing.assert_allclose(shuffled['final_equity'], shuffled['final_equity'].iloc[0])
+
+    report = robustness_report(log, n_resamples=500, seed=3)
+    for table in report.values():
+        assert list(table.index) == METRICS
+        assert list(table.columns) == ['estimate', 'lower', 'median', 'upper']
+        assert (table['lower'] <= table['median']).all() and (table['median'] <= table['upper']).all()
+    assert report['shuffle'].loc['final_equity', 'estimate'] == report['block'].loc['final_equity', 'estimate']
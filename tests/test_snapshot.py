@@ -0,0 +1,27 @@
+import pandas as pd
+
+from searcher_korean_stock.snapshot import SnapshotStore
+
+
+def _shown(candidates: pd.DataFrame) -> pd.DataFrame:
+    # the rows the index page renders
+    return candidates[['date', 'ticker', 'close', 'total_score']].tail(4).reset_index(drop=True)
+
+
+def test_snapshot_search_matches_live_search(tmp_path, monkeypatch, web_app, panel):
+    days = panel['date'].nunique()
+
+    monkeypatch.setattr(web_app, "snapshots", SnapshotStore(str(tmp_path / "empty")))
+    monkeypatch.setattr(web_app, "_load_data", lambda days=60: panel.copy())
+    live, live_trades, _, _, _ = web_app._search(days)
+
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    store.build(panel, meta={"days": days})
+    monkeypatch.setattr(web_app, "snapshots", store)
+    cached, cached_trades, _, _, _ = web_app._search(days)
+
+    assert live.groupby('date').size().max() == 4
+    pd.testing.assert_frame_equal(_shown(cached), _shown(live), check_dtype=False)
+    pd.testing.assert_frame_equal(cached[['date', 'ticker', 'total_score']],
+                                  live[['date', 'ticker', 'total_score']].reset_index(drop=True), check_dtype=False)
+    assert len(cached_trades) == len(live_trades)
@@ -0,0 +1,79 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from searcher_korean_stock.config import condition_mask
+from searcher_korean_stock.tracker import HISTORY_COLUMNS, SearchTracker
+
+
+@pytest.fixture
+def tracker(tmp_path) -> SearchTracker:
+    rng = np.random.default_rng(1)
+    tracker = SearchTracker(str(tmp_path))
+    for date in pd.bdate_range("2024-01-01", periods=40).strftime("%Y-%m-%d"):
+        results = [{
+            "ticker": ticker, "stock_name": f"n{ticker}", "buy_price": float(rng.integers(1_000, 90_000)),
+            "next_day_high": 1.0, "next_day_close": 1.0, "conditions_met": int(rng.integers(2, 7)),
+            "conditions_mask": int(rng.integers(0, 64)), "rank": rank, "score": float(rng.random()),
+            "achieved": bool(rng.random() < 0.4), "actual_return": float(rng.normal(0, 0.02)),
+        } for rank, ticker in enumerate(rng.choice(["A", "B", "C", "D", "E", "F"], 5, replace=False), start=1)]
+        tracker.db[date] = {"search_results": results, "tracking_results": results, "tracked_at": date}
+    tracker._save_db()
+    return tracker
+
+
+def _dict_rows(tracker) -> pd.DataFrame:
+    rows = [{"date": pd.Timestamp(date), **r} for date, data in sorted(tracker.db.items())
+            for r in data["tracking_results"]]
+    return pd.DataFrame(rows)[list(HISTORY_COLUMNS)]
+
+
+def test_query_filters_and_types(tracker):
+    everything = _dict_rows(tracker)
+    result = tracker.query(start="2024-01-10", end="2024-02-05", tickers=["A", "C"], min_score=0.3,
+                           min_conditions=4, columns=["date", "ticker", "score", "conditions_met"])
+    mask = (everything["date"].between("2024-01-10", "2024-02-05") & everything["ticker"].isin(["A", "C"])
+            & (everything["score"] >= 0.3) & (everything["conditions_met"] >= 4))
+
+    expected = everything.loc[mask, result.columns].reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result["date"].dtype == "datetime64[ns]"
+    assert tracker.query(tickers="Z").empty
+
+
+def test_condition_queries_use_the_history_frame(tracker):
+    everything = _dict_rows(tracker)
+    required, failed = condition_mask("volume"), condition_mask("size")
+    masks = everything["conditions_mask"]
+
+    result = tracker.query_by_conditions(required=required, failed=failed)
+    expected = everything[((masks & required) == required) & ((masks & failed) == 0)]
+    assert list(result["ticker"]) == list(expected["ticker"])
+    assert len(tracker.query_by_conditions(failed=failed)) == int(((masks & failed) == 0).sum())
+
+    dates = ["2024-01-03", "2024-01-17"]
+    columns = tracker.tracking_columns(dates)
+    assert len(columns["rank"]) == 10
+    assert set(pd.to_datetime(columns["date"]).strftime("%Y-%m-%d")) == set(dates)
+
+
+def test_history_frame_refreshes_after_writes(tracker):
+    before = len(tracker.query())
+    tracker.db["2024-03-01"] = {"search_results": [], "tracking_results": [{
+        "ticker": "A", "stock_name": "nA", "buy_price": 1.0, "next_day_high": 1.0, "next_day_close": 1.0,
+        "conditions_met": 3, "conditions_mask": 1, "rank": 1, "score": 0.5, "achieved": True,
+        "actual_return": 0.02}]}
+    tracker._save_db()
+    assert len(tracker.query()) == before + 1
+
+
+def test_to_parquet_round_trip_or_clear_import_error(tracker, tmp_path):
+    path = str(tmp_path / "history.parquet")
+    if not any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet")):
+        with pytest.raises(ImportError, match="pip install pyarrow"):
+            tracker.to_parquet(path, tickers=["A"])
+        return
+    tracker.to_parquet(path, tickers=["A"])
+    pd.testing.assert_frame_equal(pd.read_parquet(path), tracker.query(tickers=["A"]), check_dtype=False)
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from searcher_korean_stock.config import SearchConfig, SizeCondition
+from searcher_korean_stock.engine import DayTradeSearchEngine
+from searcher_korean_stock.universe import UniverseMaster
+
+
+def _universe(tmp_path) -> UniverseMaster:
+    path = tmp_path / "universe.csv"
+    pd.DataFrame({
+        "code": ["000001", "000002"],
+        "name": ["big", "fits"],
+        "market": ["KOSPI", "KOSPI"],
+        "shares_outstanding": [1e9, 1e7],
+        "market_cap": [5e13, 2e11],   # 000001: far above the 1조 cap
+    }).to_csv(path, index=False)
+    return UniverseMaster(str(path))
+
+
+def test_prefilter_keeps_every_ticker_unless_size_is_required(tmp_path):
+    universe = _universe(tmp_path)
+    tickers = ["000001.KS", "000002.KS"]
+
+    assert universe.prefilter(SizeCondition(), tickers) == tickers
+    assert universe.prefilter(SizeCondition(required=True), tickers) == ["000002.KS"]
+    assert universe.prefilter(SizeCondition(enabled=False, required=True), tickers) == tickers
+
+
+def test_required_size_excludes_results_that_fail_it():
+    rows = pd.DataFrame({
+        "ticker": ["A", "B"], "stock_name": ["a", "b"], "close": [10_000.0, 10_000.0],
+        "market_cap": [5e13, 2e11], "volume_ratio": [3.0, 3.0],
+    })
+    soft = DayTradeSearchEngine().search(rows, SearchConfig())
+    assert {r.ticker for r in soft} == {"A", "B"}
+
+    config = SearchConfig()
+    config.size.required = True
+    hard = DayTradeSearchEngine().search(rows, config)
+    assert [r.ticker for r in hard] == ["B"]
@@ -0,0 +1,21 @@
+import re
+
+from searcher_korean_stock.snapshot import SnapshotStore
+
+
+def test_equity_series_endpoint_is_linked_and_clamped(tmp_path, monkeypatch, web_app, panel):
+    days = panel['date'].nunique()
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    store.build(panel, meta={"days": days})
+    monkeypatch.setattr(web_app, "snapshots", store)
+    client = web_app.create_app().test_client()
+
+    page = client.get(f"/?days={days}&num_stocks=4").get_data(as_text=True)
+    match = re.search(r'data-series-url="(/api/equity/[0-9a-f]+)"', page)
+    assert match
+
+    full = client.get(match.group(1) + "?points=5000").get_json()
+    assert len(full["v"]) > 10
+    for points in (0, 1, 2, -5):
+        assert len(client.get(f"{match.group(1)}?points={points}").get_json()["v"]) == 3
+    assert client.get("/api/equity/unknown").status_code == 404